@@ -0,0 +1,173 @@
+"""
+Container Poller for LinkedIn Enricher
+Background polling of PhantomBuster container status, shared by every session.
+
+While a phantom runs, the Upload tab used to call fetch_container_status and then
+sleep 10s and rerun the whole dashboard script, once per waiting session. Here one
+daemon thread per container does the polling and keeps the latest result; the UI
+only reads it, so waiting costs nothing beyond a cheap fragment rerun.
+
+Polling backs off while nothing changes: the interval starts at MIN_POLL_INTERVAL
+and grows by BACKOFF_FACTOR up to MAX_POLL_INTERVAL, and drops back to the minimum
+as soon as the container reports progress. Failed requests (network/API errors)
+are retried with the same backoff; only after MAX_FAILURES in a row is the error
+published. A poller stops when the container finishes or errors, or when no
+session has read it for ABANDON_AFTER seconds.
+
+Usage:
+    pollers = ContainerPollers()
+    poller = pollers.get(container_id, lambda cid: fetch_container_status(api_key, cid))
+    snapshot = poller.snapshot()  # {'status': 'running', 'result': {...}, ...}
+"""
+
+import threading
+import time
+
+
+# Seconds between status requests: first poll, growth per unchanged poll, ceiling
+MIN_POLL_INTERVAL = 5
+BACKOFF_FACTOR = 1.5
+MAX_POLL_INTERVAL = 60
+
+# Consecutive failed requests before the error is published as the status
+MAX_FAILURES = 5
+
+# Stop polling a container nobody has looked at for this long (seconds)
+ABANDON_AFTER = 600
+
+# Container statuses that end polling
+TERMINAL_STATUSES = ('finished', 'error')
+
+# Result fields compared between polls to decide whether the container progressed
+_PROGRESS_FIELDS = ('status', 'progress', 'progress_pct', 'profiles_count')
+
+
+class ContainerPoller:
+    """Polls one container in a daemon thread; snapshot() returns the latest result."""
+
+    def __init__(self, container_id: str, fetch):
+        """
+        Args:
+            container_id: PhantomBuster container ID
+            fetch: fetch(container_id) -> status dict (as fetch_container_status).
+                Failed requests return {'status': 'error', 'error': ...}.
+        """
+        self.container_id = container_id
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._result = None
+        self._checked_at = None
+        self._next_poll_at = time.time()
+        self._polls = 0
+        self._failures = 0
+        self._last_read = time.time()
+        self._thread = threading.Thread(target=self._run, name=f'pb-poll-{container_id}', daemon=True)
+        self._thread.start()
+
+    @property
+    def alive(self) -> bool:
+        return self._thread.is_alive()
+
+    @property
+    def done(self) -> bool:
+        """True once the container reached a terminal status (or polling gave up)."""
+        with self._lock:
+            return bool(self._result) and self._result.get('status') in TERMINAL_STATUSES
+
+    def snapshot(self) -> dict:
+        """Latest status: {'status', 'result', 'checked_at', 'next_poll_at', 'polls'}.
+
+        status is 'pending' until the first request completes.
+        """
+        with self._lock:
+            self._last_read = time.time()
+            result = dict(self._result) if self._result else {}
+            return {
+                'status': result.get('status', 'pending'),
+                'result': result,
+                'checked_at': self._checked_at,
+                'next_poll_at': self._next_poll_at if self.alive else None,
+                'polls': self._polls,
+            }
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        interval = MIN_POLL_INTERVAL
+        last_progress = None
+        while not self._stop.is_set():
+            try:
+                result = self._fetch(self.container_id) or {}
+            except Exception as e:
+                result = {'status': 'error', 'error': str(e)}
+
+            with self._lock:
+                self._polls += 1
+                failed = 'error' in result
+                if failed:
+                    self._failures += 1
+                    if self._failures >= MAX_FAILURES:
+                        print(f"[Poller] Container {self.container_id}: giving up after "
+                              f"{self._failures} failed requests: {result.get('error')}")
+                        self._publish(result)
+                        return
+                else:
+                    self._failures = 0
+                    self._publish(result)
+                    if result.get('status') in TERMINAL_STATUSES:
+                        return
+
+                progress = None if failed else tuple(result.get(f) for f in _PROGRESS_FIELDS)
+                if progress is not None and progress != last_progress:
+                    interval = MIN_POLL_INTERVAL
+                    last_progress = progress
+                else:
+                    interval = min(interval * BACKOFF_FACTOR, MAX_POLL_INTERVAL)
+                self._next_poll_at = time.time() + interval
+
+                if time.time() - self._last_read > ABANDON_AFTER:
+                    return
+            self._stop.wait(interval)
+
+    def _publish(self, result: dict):
+        # Caller holds self._lock
+        self._result = result
+        self._checked_at = time.time()
+
+
+class ContainerPollers:
+    """Registry with at most one live poller per container (share one instance per process)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pollers = {}
+
+    def get(self, container_id: str, fetch) -> ContainerPoller:
+        """The container's poller, started with fetch if there is none yet.
+
+        A poller that ended with a terminal status is kept, so late readers still see
+        how the container ended; one that stopped because nobody read it is restarted.
+        """
+        with self._lock:
+            poller = self._pollers.get(container_id)
+            if poller is None or not (poller.alive or poller.done):
+                poller = ContainerPoller(container_id, fetch)
+                self._pollers[container_id] = poller
+            self._prune()
+            return poller
+
+    def discard(self, container_id: str):
+        """Stop and forget a container's poller."""
+        with self._lock:
+            poller = self._pollers.pop(container_id, None)
+        if poller:
+            poller.stop()
+
+    def _prune(self):
+        # Caller holds self._lock; forget finished pollers nobody has read recently
+        now = time.time()
+        for container_id, poller in list(self._pollers.items()):
+            if not poller.alive and now - poller._last_read > ABANDON_AFTER:
+                del self._pollers[container_id]
@@ -34,9 +34,10 @@ except ImportError:
 # Unified normalizers (single source of truth for field mappings)
 from normalizers import (
     normalize_linkedin_url,
-    normalize_phantombuster_profile,
+    normalize_linkedin_urls,
     normalize_crustdata_profile as normalize_crustdata_record,
     normalize_phantombuster_batch,
+    phantombuster_display_df,
     normalize_crustdata_batch,
     profile_to_display_dict,
     profiles_to_display_df,
@@ -44,6 +45,13 @@ from normalizers import (
     clean_dict,
 )
 from helpers import format_past_positions, format_education
+from matchers import CompanyMatcher, SchoolMatcher
+from filter_engine import FilterPlan, FilteredOut
+from metrics import registry as metrics_registry, record_call, timed_call
+from session_store import SessionStore, fingerprint
+from search_index import ProfileSearchIndex
+from profile_record import records_from_df
+from container_poller import ContainerPollers
 
 # Database module (Supabase integration)
 # Note: PhantomBuster data is NOT stored in DB - only Crustdata enriched profiles
@@ -58,7 +66,8 @@ try:
         get_search_history, save_search_history_entry, delete_search_history_entry,
         get_screening_prompts, get_screening_prompt_by_role, get_default_screening_prompt,
         save_screening_prompt, delete_screening_prompt, match_prompt_by_keywords,
-        ENRICHMENT_REFRESH_MONTHS,
+        ProfileQuery, get_profiles_filtered, count_profiles_filtered, NOT_SCREENED,
+        ENRICHMENT_REFRESH_MONTHS, PROFILE_SCREENING_COLUMNS, get_profiles_by_urls,
     )
     from pb_dedup import filter_results_against_database, update_phantombuster_with_skip_list, get_skip_list_from_database
     HAS_DATABASE = True
@@ -72,6 +81,13 @@ try:
 except ImportError:
     HAS_USAGE_TRACKER = False
 
+# Local Parquet mirror of Supabase tables (opt-in via "local_mirror" in config.json)
+try:
+    from local_mirror import LocalMirror, HAS_DUCKDB
+    HAS_LOCAL_MIRROR = True
+except ImportError:
+    HAS_LOCAL_MIRROR = False
+
 # Plotly for charts
 try:
     import plotly.express as px
@@ -277,36 +293,38 @@ SESSION_DIR.mkdir(exist_ok=True)
 # Legacy shared file (for migration)
 _LEGACY_SESSION_FILE = Path(__file__).parent / '.last_session.json'
 
+SESSION_KEYS = [
+    'results', 'results_df', 'enriched_results', 'enriched_df',
+    'screening_results', 'filtered_results', 'passed_candidates_df',
+    'filter_stats', 'f2_filter_stats', 'last_load_count', 'last_load_file',
+    'user_sheet_url', 'original_results_df',
+    'active_screening_prompt', 'active_screening_role',
+    'jd_screening', 'extra_requirements'
+]
 
-def _get_session_file():
-    """Get per-user session file path."""
+# Keys restored lazily: {key: manifest entry}, materialized on first _session_get()
+_PENDING_SESSION_KEYS = '_session_pending'
+
+
+def _get_safe_username():
     username = st.session_state.get('username', 'default')
-    safe_name = "".join(c if c.isalnum() or c in ('-', '_') else '_' for c in username)
-    return SESSION_DIR / f'.session_{safe_name}.json'
-
-def _clean_for_json(obj):
-    """Recursively clean data for JSON serialization (handle NaN, numpy types, etc.)."""
-    import math
-    import numpy as np
-    if isinstance(obj, dict):
-        return {str(k): _clean_for_json(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [_clean_for_json(v) for v in obj]
-    elif isinstance(obj, (np.integer,)):
-        return int(obj)
-    elif isinstance(obj, (np.floating,)):
-        if np.isnan(obj) or np.isinf(obj):
-            return None
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return _clean_for_json(obj.tolist())
-    elif isinstance(obj, float):
-        if math.isnan(obj) or math.isinf(obj):
-            return None
-        return obj
-    elif pd.isna(obj):
-        return None
-    return obj
+    return "".join(c if c.isalnum() or c in ('-', '_') else '_' for c in username)
+
+
+def _get_session_file():
+    """Get per-user legacy JSON session file path (pre-Parquet sessions)."""
+    return SESSION_DIR / f'.session_{_get_safe_username()}.json'
+
+
+def _get_session_store():
+    """Get per-user session store (Parquet/JSON files in .sessions/<user>/)."""
+    return SessionStore(SESSION_DIR / _get_safe_username())
+
+
+def _has_saved_session():
+    """True if there's a saved session (new store or legacy JSON) for the current user."""
+    return _get_session_store().exists() or _get_session_file().exists() or _LEGACY_SESSION_FILE.exists()
+
 
 def _get_session_key():
     """Get the session storage key based on current user."""
@@ -315,110 +333,132 @@ def _get_session_key():
 
 
 def _build_session_data():
-    """Build session data dict from current session state."""
-    session_data = {}
-    keys_to_save = [
-        'results', 'results_df', 'enriched_results', 'enriched_df',
-        'screening_results', 'filtered_results', 'passed_candidates_df',
-        'filter_stats', 'f2_filter_stats', 'last_load_count', 'last_load_file',
-        'user_sheet_url', 'original_results_df',
-        'active_screening_prompt', 'active_screening_role',
-        'jd_screening', 'extra_requirements'
-    ]
-    for key in keys_to_save:
-        if key in st.session_state and st.session_state[key] is not None:
-            value = st.session_state[key]
-            # Convert DataFrames to dict for JSON serialization
-            if isinstance(value, pd.DataFrame):
-                # Replace NaN with None for JSON compatibility
-                clean_df = value.where(pd.notnull(value), None)
-                data = _clean_for_json(clean_df.to_dict('records'))
-                session_data[key] = {'_type': 'dataframe', 'data': data}
-            elif isinstance(value, list):
-                session_data[key] = {'_type': 'list', 'data': _clean_for_json(value)}
-            elif isinstance(value, dict):
-                session_data[key] = {'_type': 'dict', 'data': _clean_for_json(value)}
-            else:
-                session_data[key] = {'_type': 'value', 'data': _clean_for_json(value)}
-    return session_data
+    """Build {key: value} of session state entries worth persisting."""
+    return {
+        key: st.session_state[key]
+        for key in SESSION_KEYS
+        if key in st.session_state and st.session_state[key] is not None
+    }
 
 
-def _restore_session_data(session_data: dict):
-    """Restore session state from session data dict."""
+def _pending_session_keys() -> dict:
+    return st.session_state.get(_PENDING_SESSION_KEYS) or {}
+
+
+def _session_get(key: str, default=None):
+    """Read a session value, loading it from the session store first if it was restored lazily."""
+    pending = _pending_session_keys()
+    if key in pending:
+        entry = pending.pop(key)
+        if key not in st.session_state:
+            try:
+                st.session_state[key] = _get_session_store().load_key(entry)
+            except Exception as e:
+                print(f"[Session] Lazy load of '{key}' failed: {e}")
+    return st.session_state.get(key, default)
+
+
+def _session_has(key: str) -> bool:
+    """Like `key in st.session_state`, but also true for lazily restored keys not read yet."""
+    return key in st.session_state or key in _pending_session_keys()
+
+
+def _session_pop(key: str):
+    """Delete a session value; a lazily restored key is dropped without loading it."""
+    _pending_session_keys().pop(key, None)
+    st.session_state.pop(key, None)
+
+
+def _session_len(key: str) -> int:
+    """Length of a list/DataFrame session value without materializing a lazily restored key."""
+    entry = _pending_session_keys().get(key)
+    if entry is not None and key not in st.session_state:
+        return entry.get('rows', 0)
+    value = st.session_state.get(key)
+    return len(value) if value is not None else 0
+
+
+def _restore_legacy_session_data(session_data: dict):
+    """Restore session state from a legacy JSON session dict ({key: {'_type', 'data'}})."""
     for key, item in session_data.items():
         if item['_type'] == 'dataframe':
             st.session_state[key] = pd.DataFrame(item['data'])
-        elif item['_type'] == 'list':
-            st.session_state[key] = item['data']
-        elif item['_type'] == 'dict':
-            st.session_state[key] = item['data']
         else:
             st.session_state[key] = item['data']
 
 
-def save_session_state():
-    """Save current session state to local per-user file only.
+def save_session_state(force: bool = False):
+    """Save current session state to local per-user session store only.
 
     NOTE: Session state is saved locally only (not to Supabase) to avoid
-    excessive disk IO. DataFrames can be 8MB+ and saves happen frequently.
+    excessive disk IO. Only keys that changed since the last save are rewritten,
+    so frequent autosaves during screening/enrichment are cheap.
     Profile data is already persisted in Supabase via save_enriched_profile().
+
+    Args:
+        force: Rewrite every key, even unchanged ones
     """
     try:
-        session_data = _build_session_data()
-        if not session_data:
-            return False
-
-        # Save to local per-user file only (no Supabase - too much IO)
-        session_file = _get_session_file()
-        with open(session_file, 'w') as f:
-            json.dump(session_data, f)
-        return True
+        # Lazily restored keys that were never read are carried over as-is. A key
+        # assigned since the restore (even to None) replaces its saved value.
+        pending = _pending_session_keys()
+        for key in [k for k in pending if k in st.session_state]:
+            del pending[key]
+        return _get_session_store().save(_build_session_data(), force=force, keep=list(pending))
     except Exception as e:
         print(f"[Session] Save failed: {e}")
     return False
 
 
 def load_session_state():
-    """Load session state from local per-user file."""
-    try:
+    """Load session state from local per-user session store.
 
-        # Fallback to local file (per-user)
-        session_file = _get_session_file()
-        if session_file.exists():
-            with open(session_file, 'r') as f:
-                session_data = json.load(f)
-            _restore_session_data(session_data)
+    Only the manifest is read here. Small dict/value keys are restored right away;
+    DataFrames and lists are materialized the first time _session_get() reads them.
+    """
+    try:
+        store = _get_session_store()
+        if store.exists():
+            pending = {}
+            for key, entry in store.load_manifest().get('keys', {}).items():
+                if entry['type'] in ('dict', 'value'):
+                    st.session_state[key] = store.load_key(entry)
+                else:
+                    st.session_state.pop(key, None)
+                    pending[key] = entry
+            st.session_state[_PENDING_SESSION_KEYS] = pending
             return True
 
-        # Try legacy shared file as last resort (one-time migration)
-        if _LEGACY_SESSION_FILE.exists():
-            with open(_LEGACY_SESSION_FILE, 'r') as f:
-                session_data = json.load(f)
-            _restore_session_data(session_data)
-            # Migrate: save to per-user file and delete legacy
-            with open(session_file, 'w') as f:
-                json.dump(session_data, f)
-            _LEGACY_SESSION_FILE.unlink(missing_ok=True)
-            return True
+        # Migrate legacy JSON sessions (per-user file, then old shared file)
+        for legacy_file in (_get_session_file(), _LEGACY_SESSION_FILE):
+            if legacy_file.exists():
+                with open(legacy_file, 'r') as f:
+                    session_data = json.load(f)
+                _restore_legacy_session_data(session_data)
+                store.save(_build_session_data())
+                legacy_file.unlink(missing_ok=True)
+                return True
     except Exception as e:
         print(f"[Session] Load failed: {e}")
     return False
 
 
 def clear_session_file():
-    """Delete session data from local file."""
+    """Delete saved session data (store directory and any legacy JSON files)."""
     cleared = False
 
-    # Clear per-user local file
+    # Keep the in-memory session intact: load lazily restored keys before their files go away
+    for key in list(_pending_session_keys()):
+        _session_get(key)
+
     try:
-        session_file = _get_session_file()
-        if session_file.exists():
-            session_file.unlink()
-            cleared = True
-        # Also clean up legacy shared file if it exists
-        if _LEGACY_SESSION_FILE.exists():
-            _LEGACY_SESSION_FILE.unlink()
+        if _get_session_store().clear():
             cleared = True
+        # Also clean up legacy JSON files if they exist
+        for legacy_file in (_get_session_file(), _LEGACY_SESSION_FILE):
+            if legacy_file.exists():
+                legacy_file.unlink()
+                cleared = True
     except Exception:
         pass
 
@@ -431,18 +471,18 @@ with st.sidebar:
     col_save, col_clear = st.columns(2)
     with col_save:
         if st.button("Save", key="sidebar_save_session", help="Save session to restore after refresh"):
-            if save_session_state():
+            if save_session_state(force=True):
                 st.success("Saved!")
             else:
                 st.error("Failed to save")
     with col_clear:
         if st.button("Clear", key="sidebar_clear_session", help="Clear saved session"):
-            clear_session_file()
+            # Drop the keys first so clear_session_file doesn't load them from disk
             for key in ['results', 'results_df', 'enriched_results', 'enriched_df', 'screening_results',
                         'passed_candidates_df', 'filter_stats', 'f2_filter_stats', 'original_results_df',
                         'active_screening_prompt', 'active_screening_role', 'jd_screening', 'extra_requirements']:
-                if key in st.session_state:
-                    del st.session_state[key]
+                _session_pop(key)
+            clear_session_file()
             st.success("Cleared!")
             st.rerun()
     st.divider()
@@ -462,6 +502,14 @@ def _get_db_client():
     return None
 
 
+@st.cache_resource
+def _get_local_mirror():
+    """Shared local mirror, or None unless "local_mirror" is enabled in config.json."""
+    if not (HAS_DATABASE and HAS_LOCAL_MIRROR and load_config().get('local_mirror')):
+        return None
+    return LocalMirror()
+
+
 def get_usage_tracker():
     """Get a UsageTracker instance with database connection."""
     if not HAS_USAGE_TRACKER:
@@ -551,16 +599,19 @@ def enrich_with_salesql(linkedin_url: str, api_key: str, personal_only: bool = T
         if personal_only:
             params['match_if_direct_email'] = 'true'
 
-        response = requests.get(
-            'https://api-public.salesql.com/v1/persons/enrich/',
-            params=params,
-            headers={'Authorization': f'Bearer {api_key}'},
-            timeout=30
-        )
-        elapsed_ms = int((time.time() - start_time) * 1000)
+        with timed_call('salesql', 'email_lookup') as call:
+            response = requests.get(
+                'https://api-public.salesql.com/v1/persons/enrich/',
+                params=params,
+                headers={'Authorization': f'Bearer {api_key}'},
+                timeout=30
+            )
+            elapsed_ms = int((time.time() - start_time) * 1000)
+            call['status'] = 'success' if response.status_code in (200, 404) else 'error'
+            call['bytes_in'] = len(response.content)
+            data = response.json() if response.status_code == 200 else None
 
         if response.status_code == 200:
-            data = response.json()
             # Filter to only Direct (personal) emails
             emails = data.get('emails', [])
             if personal_only:
@@ -903,13 +954,149 @@ def fetch_phantombuster_results(api_key: str, agent_id: str) -> list[dict]:
         return []
 
 
-def fetch_phantombuster_result_csv(api_key: str, agent_id: str, debug: bool = False, filename: str = None) -> pd.DataFrame:
+def fetch_phantombuster_result_csv(api_key: str, agent_id: str, debug: bool = False, filename: str = None,
+                                   normalize: bool = False) -> pd.DataFrame:
+    """Fetch results from PhantomBuster agent (timed on the metrics registry).
+
+    See _fetch_phantombuster_result_csv for the lookup order.
+
+    Args:
+        normalize: Return display columns (normalize_phantombuster_columns). Result
+            CSVs from the cache are normalized chunk by chunk while streaming.
+    """
+    start_time = time.time()
+    df = _fetch_phantombuster_result_csv(api_key, agent_id, debug=debug, filename=filename, normalize=normalize)
+    record_call('phantombuster', 'fetch_result', (time.time() - start_time) * 1000,
+                status='success' if not df.empty else 'error')
+    if normalize and not df.empty:
+        if df.attrs.get('pb_raw_columns') is not None:
+            _record_phantombuster_debug(df.attrs['pb_raw_columns'], df)
+        else:
+            df = normalize_phantombuster_columns(df)
+    return df
+
+
+# PhantomBuster cache probes: (connect, read) timeouts in seconds. Missing files are
+# answered straight away, so a short connect timeout only cuts off unreachable hosts.
+PB_CACHE_TIMEOUT = (5, 60)
+
+# Rows parsed (and normalized) at a time when streaming a result CSV
+PB_CSV_CHUNK_ROWS = 2000
+
+
+def _read_phantombuster_csv_stream(response, normalize: bool = False, on_progress=None) -> pd.DataFrame:
+    """Parse a streamed result CSV chunk by chunk, straight from the socket.
+
+    The body is never held as one bytes/str copy, and with normalize=True each chunk
+    is reduced to display columns as it arrives. Every column is read as text, so
+    type inference can't differ between chunks. The raw column names are kept in
+    df.attrs['pb_raw_columns'] when normalized.
+
+    Args:
+        response: requests response opened with stream=True
+        normalize: Apply phantombuster_display_df to each chunk
+        on_progress: Called with the number of rows parsed so far
+    """
+    response.raw.decode_content = True  # gzip/deflate handled by urllib3
+    # PhantomBuster serves UTF-8; only trust an explicit charset (requests guesses latin-1)
+    content_type = response.headers.get('content-type', '')
+    encoding = response.encoding if 'charset=' in content_type.lower() else 'utf-8'
+
+    chunks = []
+    raw_columns = None
+    rows = 0
+    with pd.read_csv(response.raw, dtype=str, chunksize=PB_CSV_CHUNK_ROWS,
+                     encoding=encoding, encoding_errors='replace') as reader:
+        for chunk in reader:
+            if raw_columns is None:
+                raw_columns = list(chunk.columns)
+            rows += len(chunk)
+            chunks.append(phantombuster_display_df(chunk) if normalize else chunk)
+            if on_progress:
+                on_progress(rows)
+
+    if not chunks:
+        return pd.DataFrame()
+    df = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+    if normalize:
+        df.attrs['pb_raw_columns'] = raw_columns
+    return df
+
+
+def _close_probe_response(future):
+    """Done-callback closing the response of a cache probe nobody will read."""
+    if not future.cancelled() and future.exception() is None:
+        future.result()[0].close()
+
+
+def _probe_phantombuster_cache(org_s3_folder: str, s3_folder: str, files_to_try: list, debug: bool = False,
+                               normalize: bool = False):
+    """First non-empty result file in the agent's cache folder, in files_to_try order.
+
+    All locations are requested at once (headers only); bodies are then read in
+    priority order, so a hit costs one round trip and the remaining probes are
+    cancelled or closed without downloading. CSV hits are streamed in chunks
+    (see _read_phantombuster_csv_stream). Returns None if no file has rows.
+    """
+    def probe(fname):
+        cache_url = f'https://cache1.phantombooster.com/{org_s3_folder}/{s3_folder}/{fname}'
+        probe_start = time.time()
+        return requests.get(cache_url, timeout=PB_CACHE_TIMEOUT, stream=True), probe_start
+
+    executor = ThreadPoolExecutor(max_workers=len(files_to_try))
+    futures = [executor.submit(probe, fname) for fname in files_to_try]
+    try:
+        for fname, future in zip(files_to_try, futures):
+            try:
+                cache_response, probe_start = future.result()
+                with cache_response:
+                    found = cache_response.status_code == 200
+                    if debug:
+                        st.info(f"Cache URL {fname}: {cache_response.status_code}")
+                    if not found:
+                        record_call('phantombuster', 'cache_probe', (time.time() - probe_start) * 1000,
+                                    status='error')
+                        continue
+                    df = None
+                    if fname.endswith('.csv'):
+                        progress = st.empty()
+                        try:
+                            df = _read_phantombuster_csv_stream(
+                                cache_response, normalize=normalize,
+                                on_progress=lambda rows: progress.caption(f"Loaded {rows:,} rows from {fname}..."))
+                        finally:
+                            progress.empty()
+                    elif fname.endswith('.json'):
+                        profiles = cache_response.json()
+                        if isinstance(profiles, list) and profiles:
+                            df = pd.DataFrame(profiles)
+                    record_call('phantombuster', 'cache_probe', (time.time() - probe_start) * 1000,
+                                status='success', bytes_in=cache_response.raw.tell())
+                    if df is not None and not df.empty:
+                        if debug:
+                            st.success(f"Loaded from cache URL: {fname}")
+                        return df
+            except Exception as e:
+                if debug:
+                    st.warning(f"Cache URL error ({fname}): {e}")
+    finally:
+        for future in futures:
+            if not future.cancel():
+                future.add_done_callback(_close_probe_response)
+        executor.shutdown(wait=False)
+    return None
+
+
+def _fetch_phantombuster_result_csv(api_key: str, agent_id: str, debug: bool = False, filename: str = None,
+                                    normalize: bool = False) -> pd.DataFrame:
     """Fetch results from PhantomBuster agent. Tries multiple methods:
     1. Authenticated API to get output files
     2. Result object from container
 
     Args:
         filename: Optional specific filename to fetch (without .csv extension)
+        normalize: Normalize cache CSVs while streaming them (other sources are
+            normalized by fetch_phantombuster_result_csv)
     """
     from io import StringIO
 
@@ -953,28 +1140,9 @@ def fetch_phantombuster_result_csv(api_key: str, agent_id: str, debug: bool = Fa
             else:
                 files_to_try = ['result.csv', 'result.json']
 
-            for fname in files_to_try:
-                try:
-                    cache_url = f'https://cache1.phantombooster.com/{org_s3_folder}/{s3_folder}/{fname}'
-                    if debug:
-                        st.info(f"Trying cache URL: {cache_url}")
-                    cache_response = requests.get(cache_url, timeout=60)
-                    if cache_response.status_code == 200:
-                        if fname.endswith('.csv'):
-                            df = pd.read_csv(StringIO(cache_response.text))
-                            if not df.empty:
-                                if debug:
-                                    st.success(f"Loaded from cache URL: {fname}")
-                                return df
-                        elif fname.endswith('.json'):
-                            profiles = cache_response.json()
-                            if isinstance(profiles, list) and profiles:
-                                if debug:
-                                    st.success(f"Loaded from cache URL: {fname}")
-                                return pd.DataFrame(profiles)
-                except Exception as e:
-                    if debug:
-                        st.warning(f"Cache URL error: {e}")
+            df = _probe_phantombuster_cache(org_s3_folder, s3_folder, files_to_try, debug=debug, normalize=normalize)
+            if df is not None:
+                return df
 
         # Method 1: Try fetch-output endpoint (gets last run output/logs)
         try:
@@ -1643,6 +1811,12 @@ def _get_pb_agent_locks():
     return {'lock': threading.Lock(), 'running': {}}  # {agent_id: {'user': username, 'started': timestamp, 'container_id': str}}
 
 
+@st.cache_resource
+def _get_container_pollers():
+    """Background PhantomBuster container pollers, one per container, shared by all sessions."""
+    return ContainerPollers()
+
+
 def pb_agent_is_busy(agent_id: str) -> dict:
     """Check if a PhantomBuster agent is currently locked by another user.
     Returns the lock info dict if busy, or None if free.
@@ -1689,7 +1863,6 @@ def launch_phantombuster_agent(api_key: str, agent_id: str, argument: dict = Non
     if busy:
         return {'error': f"Agent is already running (launched by {busy['user']} {int((time.time() - busy['started']) / 60)}m ago). Please wait or use a different agent."}
 
-    start_time = time.time()
     try:
         # Delete existing results AND database for a fresh start
         if clear_results:
@@ -1715,18 +1888,21 @@ def launch_phantombuster_agent(api_key: str, agent_id: str, argument: dict = Non
             # Pass argument as JSON string to merge with saved config rather than replace
             payload['argument'] = json.dumps(argument)
 
-        response = requests.post(
-            'https://api.phantombuster.com/api/v2/agents/launch',
-            headers={
-                'X-Phantombuster-Key': api_key,
-                'Content-Type': 'application/json'
-            },
-            json=payload,
-            timeout=30
-        )
+        with timed_call('phantombuster', 'launch') as call:
+            response = requests.post(
+                'https://api.phantombuster.com/api/v2/agents/launch',
+                headers={
+                    'X-Phantombuster-Key': api_key,
+                    'Content-Type': 'application/json'
+                },
+                json=payload,
+                timeout=30
+            )
+            call['status'] = 'success' if response.status_code == 200 else 'error'
+            call['bytes_in'] = len(response.content)
+            data = response.json() if response.status_code == 200 else None
 
         if response.status_code == 200:
-            data = response.json()
             container_id = data.get('containerId')
 
             # Lock the agent so other users see it's running
@@ -1768,44 +1944,172 @@ def fetch_container_status(api_key: str, container_id: str) -> dict:
 
     Returns dict with 'status' (running, finished, error) and other details.
     """
-    try:
-        response = requests.get(
-            'https://api.phantombuster.com/api/v2/containers/fetch',
-            params={'id': container_id},
-            headers={'X-Phantombuster-Key': api_key},
-            timeout=30
-        )
+    with timed_call('phantombuster', 'container_status') as call:
+        try:
+            response = requests.get(
+                'https://api.phantombuster.com/api/v2/containers/fetch',
+                params={'id': container_id},
+                headers={'X-Phantombuster-Key': api_key},
+                timeout=30
+            )
+            call['status'] = 'success' if response.status_code == 200 else 'error'
+            call['bytes_in'] = len(response.content)
+
+            if response.status_code == 200:
+                data = response.json()
+                result = {
+                    'status': data.get('status', 'unknown'),
+                    'exitCode': data.get('exitCode'),
+                    'exitMessage': data.get('exitMessage'),
+                    'progress': data.get('progress'),
+                    'executionTime': data.get('executionTime'),
+                    'output': data.get('output', ''),
+                }
 
-        if response.status_code == 200:
-            data = response.json()
-            result = {
-                'status': data.get('status', 'unknown'),
-                'exitCode': data.get('exitCode'),
-                'exitMessage': data.get('exitMessage'),
-                'progress': data.get('progress'),
-                'executionTime': data.get('executionTime'),
-                'output': data.get('output', ''),
+                # Try to extract profile count from output (PhantomBuster logs progress)
+                output = data.get('output', '')
+                if output:
+                    # Look for patterns like "Scraped 50 profiles" or "50 profiles saved"
+                    import re
+                    matches = re.findall(r'(\d+)\s*(?:profiles?|leads?|results?)', output.lower())
+                    if matches:
+                        result['profiles_count'] = int(matches[-1])  # Get last match
+
+                    # Look for progress percentage
+                    pct_matches = re.findall(r'(\d+)%', output)
+                    if pct_matches:
+                        result['progress_pct'] = int(pct_matches[-1])
+
+                return result
+            else:
+                return {'status': 'error', 'error': f"API error {response.status_code}"}
+        except Exception as e:
+            call['status'] = 'error'
+            return {'status': 'error', 'error': str(e)}
+
+
+# How often the running-phantom view re-reads the poller (fragment rerun, not a full script run)
+PB_STATUS_REFRESH_SECONDS = 5
+
+
+@st.fragment(run_every=PB_STATUS_REFRESH_SECONDS)
+def _render_pb_launch_progress(pb_key: str):
+    """Progress of the launched phantom, read from its background poller.
+
+    Only this fragment reruns while the phantom works; the container is polled by
+    container_poller with backoff, once per container however many sessions watch.
+    Switches the launch to finished/error (full rerun) when the poller reports it.
+    """
+    container_id = st.session_state.get('pb_launch_container_id')
+    if container_id:
+        poller = _get_container_pollers().get(container_id, lambda cid: fetch_container_status(pb_key, cid))
+        snapshot = poller.snapshot()
+        status_result = snapshot['result']
+        container_status = snapshot['status']
+
+        # Store progress info
+        if status_result:
+            st.session_state['pb_progress_info'] = {
+                'profiles_count': status_result.get('profiles_count', 0),
+                'progress_pct': status_result.get('progress_pct', 0),
+                'progress': status_result.get('progress'),
             }
 
-            # Try to extract profile count from output (PhantomBuster logs progress)
-            output = data.get('output', '')
-            if output:
-                # Look for patterns like "Scraped 50 profiles" or "50 profiles saved"
-                import re
-                matches = re.findall(r'(\d+)\s*(?:profiles?|leads?|results?)', output.lower())
-                if matches:
-                    result['profiles_count'] = int(matches[-1])  # Get last match
+        # Check if finished or error
+        if container_status == 'finished':
+            st.session_state['pb_launch_status'] = 'finished'
+            # Release agent lock so other users can launch
+            if st.session_state.get('pb_launch_agent_id'):
+                pb_agent_unlock(st.session_state['pb_launch_agent_id'])
+            # Desktop notification
+            try:
+                profiles = status_result.get('profiles_count', 0)
+                msg = f"Extracted {profiles} profiles" if profiles else "Ready to load results"
+                if HAS_PLYER:
+                    notification.notify(
+                        title="PhantomBuster Finished",
+                        message=msg,
+                        app_name="SourcingX",
+                        timeout=10
+                    )
+                # Windows sound
+                if HAS_WINSOUND:
+                    try:
+                        winsound.MessageBeep(winsound.MB_OK)
+                    except:
+                        pass
+            except:
+                pass
+            st.rerun()
+        elif container_status == 'error':
+            error_message = status_result.get('exitMessage') or status_result.get('error') or 'Phantom failed'
+            st.session_state['pb_launch_status'] = 'error'
+            st.session_state['pb_launch_error'] = error_message
+            # Release agent lock on error too
+            if st.session_state.get('pb_launch_agent_id'):
+                pb_agent_unlock(st.session_state['pb_launch_agent_id'])
+            # Desktop notification for error
+            try:
+                if HAS_PLYER:
+                    notification.notify(
+                        title="PhantomBuster Error",
+                        message=error_message,
+                        app_name="SourcingX",
+                        timeout=10
+                    )
+                if HAS_WINSOUND:
+                    try:
+                        winsound.MessageBeep(winsound.MB_ICONHAND)
+                    except:
+                        pass
+            except:
+                pass
+            st.rerun()
+    else:
+        snapshot = {}
+
+    # Show running status with progress
+    elapsed = ""
+    if st.session_state.get('pb_launch_start_time'):
+        elapsed_seconds = int(time.time() - st.session_state['pb_launch_start_time'])
+        elapsed_min = elapsed_seconds // 60
+        elapsed_sec = elapsed_seconds % 60
+        elapsed = f"{elapsed_min}m {elapsed_sec}s"
+
+    # Display progress info
+    progress_info = st.session_state.get('pb_progress_info', {})
+    profiles_count = progress_info.get('profiles_count', 0)
+    progress_pct = progress_info.get('progress_pct', 0)
+
+    # Progress display
+    checked_at = snapshot.get('checked_at')
+    if checked_at:
+        st.info(f"**Running** - {elapsed} (status checked {int(time.time() - checked_at)}s ago)")
+    else:
+        st.info(f"**Running** - {elapsed} (checking status...)")
+    if profiles_count > 0 or progress_pct > 0:
+        col_prog1, col_prog2 = st.columns(2)
+        with col_prog1:
+            if profiles_count > 0:
+                st.metric("Profiles extracted", profiles_count)
+        with col_prog2:
+            if progress_pct > 0:
+                st.metric("Progress", f"{progress_pct}%")
 
-                # Look for progress percentage
-                pct_matches = re.findall(r'(\d+)%', output)
-                if pct_matches:
-                    result['progress_pct'] = int(pct_matches[-1])
+    # Show progress bar if we have percentage
+    if progress_pct > 0:
+        st.progress(progress_pct / 100)
 
-            return result
-        else:
-            return {'status': 'error', 'error': f"API error {response.status_code}"}
-    except Exception as e:
-        return {'status': 'error', 'error': str(e)}
+    # Cancel button
+    if st.button("Cancel", key="pb_cancel_btn"):
+        if container_id:
+            _get_container_pollers().discard(container_id)
+        st.session_state['pb_launch_status'] = 'idle'
+        st.session_state['pb_launch_container_id'] = None
+        st.session_state['pb_launch_start_time'] = None
+        st.session_state['pb_progress_info'] = {}
+        st.session_state['pb_launch_skip_count'] = 0
+        st.rerun()
 
 
 def normalize_phantombuster_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -1814,50 +2118,17 @@ def normalize_phantombuster_columns(df: pd.DataFrame) -> pd.DataFrame:
     Uses normalizers.py for consistent field mapping across dashboard and db.
     Does NOT add Crustdata-specific fields - keeps PhantomBuster data clean.
     """
-    # Debug: log all columns to help identify URL fields
-    url_cols = [c for c in df.columns if 'url' in c.lower() or 'link' in c.lower() or 'profile' in c.lower() or 'identifier' in c.lower()]
-    st.session_state['_debug_url_cols'] = url_cols
-    st.session_state['_debug_all_cols'] = list(df.columns)
-
-    # Convert DataFrame to list of dicts, normalize each, convert back
-    records = df.to_dict('records')
-    normalized_records = []
+    result_df = phantombuster_display_df(df)
+    _record_phantombuster_debug(list(df.columns), result_df)
+    return result_df
 
-    for raw in records:
-        normalized = normalize_phantombuster_profile(raw)
-        if normalized:
-            # Build display record with PhantomBuster fields only (no Crustdata fields)
-            first = normalized.get('first_name') or ''
-            last = normalized.get('last_name') or ''
-            name = f"{first} {last}".strip() or 'Unknown'
-
-            # Get raw PhantomBuster data for additional fields
-            raw_pb = normalized.get('raw_phantombuster') or {}
-
-            display_record = {
-                'name': name,
-                'first_name': first,
-                'last_name': last,
-                'current_company': normalized.get('current_company') or '',
-                'current_title': normalized.get('current_title') or '',
-                'headline': normalized.get('headline') or '',
-                'location': normalized.get('location') or '',
-                'linkedin_url': normalized.get('linkedin_url') or '',
-                'summary': normalized.get('summary') or raw_pb.get('summary') or '',
-                'title_description': raw_pb.get('titleDescription') or '',
-                'industry': raw_pb.get('industry') or '',
-                'company_location': raw_pb.get('companyLocation') or '',
-                'current_years_in_role': normalized.get('current_years_in_role'),
-                'current_years_at_company': normalized.get('current_years_at_company'),
-                'raw_phantombuster': raw_pb,
-            }
-            normalized_records.append(display_record)
-        else:
-            # Keep original record but mark as invalid (no URL)
-            raw['linkedin_url'] = None
-            normalized_records.append(raw)
 
-    result_df = pd.DataFrame(normalized_records)
+def _record_phantombuster_debug(raw_columns: list, result_df: pd.DataFrame):
+    """Keep the raw column names and the valid URL count for the debug views."""
+    # Debug: log all columns to help identify URL fields
+    url_cols = [c for c in raw_columns if 'url' in c.lower() or 'link' in c.lower() or 'profile' in c.lower() or 'identifier' in c.lower()]
+    st.session_state['_debug_url_cols'] = url_cols
+    st.session_state['_debug_all_cols'] = list(raw_columns)
 
     # Debug: count valid URLs
     if 'linkedin_url' in result_df.columns:
@@ -1866,8 +2137,6 @@ def normalize_phantombuster_columns(df: pd.DataFrame) -> pd.DataFrame:
     else:
         st.session_state['_debug_valid_urls'] = "0/0"
 
-    return result_df
-
 
 def normalize_uploaded_csv(df: pd.DataFrame) -> pd.DataFrame:
     """Normalize uploaded CSV columns to match expected dashboard format.
@@ -2211,16 +2480,20 @@ def enrich_batch(urls: list[str], api_key: str, tracker: 'UsageTracker' = None)
     }
 
     try:
-        response = requests.get(
-            'https://api.crustdata.com/screener/person/enrich',
-            params={'linkedin_profile_url': batch_str},
-            headers={'Authorization': f'Token {api_key}'},
-            timeout=120
-        )
-        elapsed_ms = int((time.time() - start_time) * 1000)
+        with timed_call('crustdata', 'enrich') as call:
+            call['bytes_out'] = len(batch_str)
+            response = requests.get(
+                'https://api.crustdata.com/screener/person/enrich',
+                params={'linkedin_profile_url': batch_str},
+                headers={'Authorization': f'Token {api_key}'},
+                timeout=120
+            )
+            elapsed_ms = int((time.time() - start_time) * 1000)
+            call['status'] = 'success' if response.status_code == 200 else 'error'
+            call['bytes_in'] = len(response.content)
+            data = response.json() if response.status_code == 200 else None
 
         if response.status_code == 200:
-            data = response.json()
             result = data if isinstance(data, list) else [data]
 
             # Inject original_url into each result by matching username
@@ -2362,31 +2635,58 @@ def flatten_for_csv(data: list[dict]) -> pd.DataFrame:
 # ========== PRE-FILTERING FUNCTIONS ==========
 
 def filter_csv_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """Filter CSV to keep only screening-relevant columns."""
-
-    def calc_years_to_today(date_str):
-        if pd.isna(date_str) or not str(date_str).strip():
-            return None
-        try:
-            dt = datetime.strptime(str(date_str).strip(), '%d %b %Y')
-            years = (datetime.now() - dt).days / 365.25
-            return round(years, 1)
-        except:
-            return None
+    """Filter CSV to keep only screening-relevant columns.
 
-    def calc_years_between(start_str, end_str):
-        if pd.isna(start_str) or not str(start_str).strip():
-            return None
-        try:
-            start = datetime.strptime(str(start_str).strip(), '%d %b %Y')
-            if pd.isna(end_str) or not str(end_str).strip():
-                end = datetime.now()
-            else:
-                end = datetime.strptime(str(end_str).strip(), '%d %b %Y')
-            years = (end - start).days / 365.25
-            return round(years, 1)
-        except:
-            return None
+    The numbered job/edu/skill slots are reshaped to long format (one entry per row and
+    slot), with each date column parsed once, and joined back per row with a groupby.
+    """
+    now = pd.Timestamp(datetime.now())
+    positions = pd.RangeIndex(len(df))
+
+    def as_text(series):
+        # Same text an f-string gives per cell ('nan' for missing values)
+        return series.astype(object).map(str)
+
+    # Every distinct date string in the export, parsed once (NaT if blank/unparseable)
+    date_cols = [col for col in df.columns if re.match(r'^job_\d+_job_(start|end)_date$', col)]
+    raw_dates = pd.unique(pd.concat([df[col].astype(object) for col in date_cols] + [pd.Series(dtype=object)]).dropna())
+    stripped = pd.Series([str(v).strip() for v in raw_dates], index=pd.Index(raw_dates, dtype=object), dtype=object)
+    parsed_dates = pd.to_datetime(stripped, format='%d %b %Y', errors='coerce')
+    blank_dates = set(stripped.index[stripped == '']) | {''}
+
+    def parse_dates(series):
+        return series.astype(object).map(parsed_dates)
+
+    def is_blank(series):
+        return series.isna() | series.isin(blank_dates)
+
+    rounded_years = {}  # days -> years, rounded like round(days / 365.25, 1)
+
+    def calc_years_between(start, end=None):
+        """Years from start to end (today if end is blank), NaN if start is blank or unparseable."""
+        end_dt = pd.Series(now, index=start.index)
+        if end is not None:
+            end_dt = parse_dates(end).where(~is_blank(end), now)
+        days = (end_dt - parse_dates(start)).dt.days
+        rounded_years.update({d: round(d / 365.25, 1) for d in days.dropna().unique() if d not in rounded_years})
+        return days.map(rounded_years)
+
+    def optional(series, prefix, suffix=''):
+        # prefix + value + suffix for truthy, non-missing values; '' otherwise
+        present = series.notna() & series.astype(object).astype(bool)
+        return (prefix + as_text(series) + suffix).where(present, '')
+
+    def column(sub, col):
+        return sub[col] if col in sub.columns else pd.Series('', index=sub.index)
+
+    def join_per_row(entries, sep):
+        """Join (row position -> text) entries, in slot order, into one string per row."""
+        if not entries:
+            joined = pd.Series(dtype=object)
+        else:
+            # Object-dtype groupby sum concatenates in C; drop the leading separator after
+            joined = (sep + pd.concat(entries).astype(object)).groupby(level=0, sort=True).sum().str[len(sep):]
+        return pd.Series(joined.reindex(positions, fill_value='').to_numpy(), index=df.index)
 
     result = pd.DataFrame()
 
@@ -2401,65 +2701,50 @@ def filter_csv_columns(df: pd.DataFrame) -> pd.DataFrame:
     result['current_title'] = df.get('job_1_job_title', pd.Series([''] * len(df)))
     result['current_company'] = df.get('job_1_job_company_name', pd.Series([''] * len(df)))
     result['current_start_date'] = df.get('job_1_job_start_date', pd.Series([''] * len(df)))
-    result['current_years_in_role'] = df.get('job_1_job_start_date', pd.Series()).apply(calc_years_to_today)
+    if 'job_1_job_start_date' in df.columns:
+        result['current_years_in_role'] = calc_years_between(df['job_1_job_start_date'])
+    else:
+        result['current_years_in_role'] = pd.Series(dtype=float)
     result['current_description'] = df.get('job_1_job_description', pd.Series([''] * len(df)))
 
-    # Past positions
-    def combine_past_positions(row):
-        positions = []
-        for i in range(2, 20):
-            title_col = f'job_{i}_job_title'
-            company_col = f'job_{i}_job_company_name'
-            start_col = f'job_{i}_job_start_date'
-            end_col = f'job_{i}_job_end_date'
-            desc_col = f'job_{i}_job_description'
-
-            if title_col in df.columns and pd.notna(row.get(title_col)):
-                title = row.get(title_col, '')
-                company = row.get(company_col, '')
-                start = row.get(start_col, '')
-                end = row.get(end_col, '')
-                desc = row.get(desc_col, '')
-                years = calc_years_between(start, end)
-                years_str = f" [{years} yrs]" if years else ""
-                desc_str = f": {desc}" if pd.notna(desc) and desc else ""
-                positions.append(f"{title} at {company} ({start} - {end}){years_str}{desc_str}")
-        return ' || '.join(positions)
-
-    result['past_positions'] = df.apply(combine_past_positions, axis=1)
-
-    # Education
-    def combine_education(row):
-        educations = []
-        for i in range(1, 10):
-            school_col = f'edu_{i}_school_name'
-            degree_col = f'edu_{i}_degree'
-            field_col = f'edu_{i}_field_of_study'
-
-            if school_col in df.columns and pd.notna(row.get(school_col)):
-                school = row.get(school_col, '')
-                degree = row.get(degree_col, '')
-                field = row.get(field_col, '')
-                parts = [school]
-                if pd.notna(degree) and degree:
-                    parts.append(degree)
-                if pd.notna(field) and field:
-                    parts.append(f"in {field}")
-                educations.append(', '.join(parts))
-        return ' | '.join(educations)
-
-    result['education'] = df.apply(combine_education, axis=1)
-
-    # Skills
-    skill_cols = [col for col in df.columns if re.match(r'^skill_\d+_name$', col)]
-    def combine_skills(row):
-        skills = []
-        for col in skill_cols:
-            if pd.notna(row.get(col)):
-                skills.append(str(row[col]))
-        return ', '.join(skills)
+    # Past positions: "title at company (start - end) [N yrs]: description" per slot
+    positions_entries = []
+    for i in range(2, 20):
+        title_col = f'job_{i}_job_title'
+        if title_col not in df.columns:
+            continue
+        has_title = df[title_col].notna().to_numpy()
+        slot_cols = [c for c in df.columns if c.startswith(f'job_{i}_job_')]
+        sub = df[slot_cols][has_title].astype(object).set_axis(positions[has_title])
+        start = column(sub, f'job_{i}_job_start_date')
+        end = column(sub, f'job_{i}_job_end_date')
+        years = calc_years_between(start, end).where(~is_blank(start))
+        positions_entries.append(
+            as_text(sub[title_col]) + ' at ' + as_text(column(sub, f'job_{i}_job_company_name'))
+            + ' (' + as_text(start) + ' - ' + as_text(end) + ')'
+            + optional(years, ' [', ' yrs]') + optional(column(sub, f'job_{i}_job_description'), ': ')
+        )
+    result['past_positions'] = join_per_row(positions_entries, ' || ')
+
+    # Education: "school, degree, in field" per slot
+    education_entries = []
+    for i in range(1, 10):
+        school_col = f'edu_{i}_school_name'
+        if school_col not in df.columns:
+            continue
+        has_school = df[school_col].notna().to_numpy()
+        slot_cols = [c for c in df.columns if c.startswith(f'edu_{i}_')]
+        sub = df[slot_cols][has_school].astype(object).set_axis(positions[has_school])
+        education_entries.append(
+            as_text(sub[school_col]) + optional(column(sub, f'edu_{i}_degree'), ', ')
+            + optional(column(sub, f'edu_{i}_field_of_study'), ', in ')
+        )
+    result['education'] = join_per_row(education_entries, ' | ')
 
-    result['skills'] = df.apply(combine_skills, axis=1)
+    # Skills (melted in column order, so each row keeps the CSV's skill order)
+    skill_cols = [col for col in df.columns if re.match(r'^skill_\d+_name$', col)]
+    skills = df[skill_cols].set_axis(positions).melt(ignore_index=False)['value'].dropna()
+    result['skills'] = join_per_row([as_text(skills)] if skill_cols else [], ', ')
 
     # LinkedIn URL
     result['public_url'] = df.get('public_url', df.get('linkedin_url', pd.Series([''] * len(df))))
@@ -2467,61 +2752,45 @@ def filter_csv_columns(df: pd.DataFrame) -> pd.DataFrame:
     return result
 
 
-def apply_pre_filters(df: pd.DataFrame, filters: dict) -> tuple[pd.DataFrame, dict, dict]:
-    """Apply pre-filters to candidates. Returns filtered df, stats, and filtered_out dict."""
-    stats = {}
-    filtered_out = {}  # Store removed candidates by filter type
-    original_count = len(df)
+def parse_duration_months(series: pd.Series) -> pd.Series:
+    """Months in duration strings like "2 years 3 months" (NaN if none), one vectorized pass."""
+    present = series.notna()
+    text = series[present].astype(str).str.lower()
+    distinct = text.drop_duplicates()
+    years = distinct.str.extract(r'(\d+)\s*(?:year|yr)', expand=False).map(int, na_action='ignore')
+    months = distinct.str.extract(r'(\d+)\s*(?:month|mo)', expand=False).map(int, na_action='ignore')
+    total = years.astype(float).fillna(0) * 12 + months.astype(float).fillna(0)
+    months_by_text = pd.Series(total.where(total > 0).to_numpy(), index=distinct.to_numpy())
+    parsed = pd.Series(index=series.index, dtype=float)
+    parsed[present] = text.map(months_by_text).to_numpy()
+    return parsed
 
-    df = df.copy()  # Avoid SettingWithCopyWarning
-
-    # Helper functions
-    def normalize_company(name):
-        """Normalize company name for comparison."""
-        if pd.isna(name) or not str(name).strip():
-            return ''
-        # Lowercase and strip
-        name = str(name).lower().strip()
-        # Remove common suffixes
-        for suffix in [' ltd', ' inc', ' corp', ' llc', ' limited', ' israel', ' il', ' technologies', ' tech', ' software', ' solutions', ' group']:
-            if name.endswith(suffix):
-                name = name[:-len(suffix)].strip()
-        return name
-
-    def matches_list(company, company_list):
-        """Check if company matches any in the list - uses normalized exact match."""
-        if pd.isna(company) or not str(company).strip():
-            return False
-        company_norm = normalize_company(company)
-        if not company_norm:
-            return False
-        for c in company_list:
-            c_norm = normalize_company(c)
-            if not c_norm:
-                continue
-            # Exact match after normalization
-            if company_norm == c_norm:
-                return True
-            # One contains the other fully (for cases like "Bank Leumi" vs "Bank Leumi Le-Israel")
-            if len(c_norm) >= 4 and len(company_norm) >= 4:
-                if company_norm.startswith(c_norm) or c_norm.startswith(company_norm):
-                    return True
-        return False
 
-    def matches_list_in_text(text, company_list):
-        """Check if any company from list appears in text - uses word boundary matching."""
-        if pd.isna(text) or not str(text).strip():
-            return False
-        text_lower = str(text).lower()
-        for c in company_list:
-            c_norm = normalize_company(c)
-            if not c_norm or len(c_norm) < 3:
-                continue
-            # Use word boundary pattern for longer names
-            pattern = r'\b' + re.escape(c_norm) + r'\b'
-            if re.search(pattern, text_lower):
-                return True
-        return False
+def _get_duration_months(series: pd.Series) -> pd.Series:
+    """Parsed months column for a duration column, cached per session until the column changes.
+
+    Re-applying the filters with other bounds reuses the parsed column.
+    """
+    version = fingerprint(series.to_frame())
+    cache = st.session_state.setdefault('_duration_months', {})
+    cached = cache.get(series.name)
+    if cached is None or cached[0] != version:
+        cached = (version, parse_duration_months(series))
+        cache[series.name] = cached
+    # Same values by position; the frame being filtered may carry a different index
+    return pd.Series(cached[1].to_numpy(), index=series.index)
+
+
+def apply_pre_filters(df: pd.DataFrame, filters: dict) -> tuple[pd.DataFrame, dict, FilteredOut]:
+    """Apply pre-filters to candidates. Returns filtered df, stats, and filtered_out.
+
+    Every filter computes its mask against the input frame and the masks are combined
+    once (see FilterPlan), so a candidate is counted under the first filter it fails.
+    filtered_out maps filter name -> removed candidates, materialized on access.
+    """
+    stats = {}
+    plan = FilterPlan(df)
+    original_count = len(df)
 
     # ========== EXCLUSION FILTERS ==========
     # Track skipped filters for diagnostics
@@ -2533,12 +2802,9 @@ def apply_pre_filters(df: pd.DataFrame, filters: dict) -> tuple[pd.DataFrame, di
         if 'Name' in past_df.columns:
             past_names = set(str(name).lower().strip() for name in past_df['Name'].dropna())
             if 'first_name' in df.columns and 'last_name' in df.columns:
-                df['_full_name'] = (df['first_name'].fillna('').str.lower().str.strip() + ' ' +
-                                   df['last_name'].fillna('').str.lower().str.strip())
-                df['_is_past'] = df['_full_name'].isin(past_names)
-                stats['past_candidates'] = df['_is_past'].sum()
-                filtered_out['Past Candidates'] = df[df['_is_past']].drop(columns=['_is_past', '_full_name']).copy()
-                df = df[~df['_is_past']].drop(columns=['_is_past', '_full_name'])
+                full_name = (df['first_name'].fillna('').str.lower().str.strip() + ' ' +
+                             df['last_name'].fillna('').str.lower().str.strip())
+                plan.add('past_candidates', 'Past Candidates', full_name.isin(past_names))
             else:
                 stats['_skipped_filters'].append('past_candidates (missing first_name/last_name columns)')
         else:
@@ -2548,10 +2814,7 @@ def apply_pre_filters(df: pd.DataFrame, filters: dict) -> tuple[pd.DataFrame, di
     if filters.get('blacklist'):
         blacklist = [c.lower().strip() for c in filters['blacklist']]
         if 'current_company' in df.columns:
-            df['_blacklisted'] = df['current_company'].apply(lambda x: matches_list(x, blacklist))
-            stats['blacklist'] = df['_blacklisted'].sum()
-            filtered_out['Blacklist Companies'] = df[df['_blacklisted']].drop(columns=['_blacklisted']).copy()
-            df = df[~df['_blacklisted']].drop(columns=['_blacklisted'])
+            plan.add('blacklist', 'Blacklist Companies', CompanyMatcher(blacklist).match_series(df['current_company']))
         else:
             stats['_skipped_filters'].append('blacklist (missing current_company column)')
 
@@ -2559,10 +2822,8 @@ def apply_pre_filters(df: pd.DataFrame, filters: dict) -> tuple[pd.DataFrame, di
     if filters.get('not_relevant'):
         not_relevant = [c.lower().strip() for c in filters['not_relevant']]
         if 'current_company' in df.columns:
-            df['_not_relevant'] = df['current_company'].apply(lambda x: matches_list(x, not_relevant))
-            stats['not_relevant_current'] = df['_not_relevant'].sum()
-            filtered_out['Not Relevant (Current)'] = df[df['_not_relevant']].drop(columns=['_not_relevant']).copy()
-            df = df[~df['_not_relevant']].drop(columns=['_not_relevant'])
+            plan.add('not_relevant_current', 'Not Relevant (Current)',
+                     CompanyMatcher(not_relevant).match_series(df['current_company']))
         else:
             stats['_skipped_filters'].append('not_relevant (missing current_company column)')
 
@@ -2576,10 +2837,8 @@ def apply_pre_filters(df: pd.DataFrame, filters: dict) -> tuple[pd.DataFrame, di
             title_lower = str(title).lower()
             return any(kw in title_lower for kw in exclude_keywords)
 
-        df['_excluded_title'] = df['current_title'].apply(has_excluded_title)
-        stats['excluded_titles'] = df['_excluded_title'].sum()
-        filtered_out['Excluded Titles'] = df[df['_excluded_title']].drop(columns=['_excluded_title']).copy()
-        df = df[~df['_excluded_title']].drop(columns=['_excluded_title'])
+        excluded = {t: has_excluded_title(t) for t in df['current_title'].dropna().unique()}
+        plan.add('excluded_titles', 'Excluded Titles', df['current_title'].map(excluded).fillna(False).astype(bool))
 
     # 5. Include title keywords filter (only keep matching)
     if filters.get('include_titles') and 'current_title' in df.columns:
@@ -2591,30 +2850,10 @@ def apply_pre_filters(df: pd.DataFrame, filters: dict) -> tuple[pd.DataFrame, di
             title_lower = str(title).lower()
             return any(kw in title_lower for kw in include_keywords)
 
-        df['_included_title'] = df['current_title'].apply(has_included_title)
-        not_included = ~df['_included_title']
-        stats['not_matching_titles'] = not_included.sum()
-        filtered_out['Not Matching Titles'] = df[not_included].drop(columns=['_included_title']).copy()
-        df = df[df['_included_title']].drop(columns=['_included_title'])
+        included = {t: has_included_title(t) for t in df['current_title'].dropna().unique()}
+        plan.add('not_matching_titles', 'Not Matching Titles', ~df['current_title'].map(included).fillna(False).astype(bool))
 
     # 6. Duration filters (from Phantom data)
-    # Helper to parse duration strings like "2 years 3 months" to months
-    def parse_duration_to_months(duration_str):
-        if pd.isna(duration_str) or not str(duration_str).strip():
-            return None
-        text = str(duration_str).lower()
-        years = 0
-        months = 0
-        import re
-        year_match = re.search(r'(\d+)\s*(?:year|yr)', text)
-        if year_match:
-            years = int(year_match.group(1))
-        month_match = re.search(r'(\d+)\s*(?:month|mo)', text)
-        if month_match:
-            months = int(month_match.group(1))
-        total = years * 12 + months
-        return total if total > 0 else None
-
     # Check for duration columns (Phantom format)
     role_col = 'durationInRole' if 'durationInRole' in df.columns else 'current_years_in_role' if 'current_years_in_role' in df.columns else None
     company_col = 'durationInCompany' if 'durationInCompany' in df.columns else 'current_years_at_company' if 'current_years_at_company' in df.columns else None
@@ -2629,82 +2868,28 @@ def apply_pre_filters(df: pd.DataFrame, filters: dict) -> tuple[pd.DataFrame, di
     if filters.get('max_company_months') and not company_col:
         stats['_skipped_filters'].append('max_company_months (no duration column found)')
 
-    # Min role duration
-    if filters.get('min_role_months') and role_col:
-        min_months = filters['min_role_months']
-        df['_role_months'] = df[role_col].apply(parse_duration_to_months)
-        df['_role_too_short'] = df['_role_months'].apply(lambda x: x < min_months if pd.notna(x) else False)
-        stats['role_too_short'] = df['_role_too_short'].sum()
-        filtered_out['Role Too Short'] = df[df['_role_too_short']].drop(columns=['_role_months', '_role_too_short'], errors='ignore').copy()
-        df = df[~df['_role_too_short']].drop(columns=['_role_months', '_role_too_short'], errors='ignore')
-
-    # Max role duration
-    if filters.get('max_role_months') and role_col:
-        max_months = filters['max_role_months']
-        df['_role_months'] = df[role_col].apply(parse_duration_to_months)
-        df['_role_too_long'] = df['_role_months'].apply(lambda x: x > max_months if pd.notna(x) else False)
-        stats['role_too_long'] = df['_role_too_long'].sum()
-        filtered_out['Role Too Long'] = df[df['_role_too_long']].drop(columns=['_role_months', '_role_too_long'], errors='ignore').copy()
-        df = df[~df['_role_too_long']].drop(columns=['_role_months', '_role_too_long'], errors='ignore')
-
-    # Min company duration
-    if filters.get('min_company_months') and company_col:
-        min_months = filters['min_company_months']
-        df['_company_months'] = df[company_col].apply(parse_duration_to_months)
-        df['_company_too_short'] = df['_company_months'].apply(lambda x: x < min_months if pd.notna(x) else False)
-        stats['company_too_short'] = df['_company_too_short'].sum()
-        filtered_out['Company Too Short'] = df[df['_company_too_short']].drop(columns=['_company_months', '_company_too_short'], errors='ignore').copy()
-        df = df[~df['_company_too_short']].drop(columns=['_company_months', '_company_too_short'], errors='ignore')
-
-    # Max company duration
-    if filters.get('max_company_months') and company_col:
-        max_months = filters['max_company_months']
-        df['_company_months'] = df[company_col].apply(parse_duration_to_months)
-        df['_company_too_long'] = df['_company_months'].apply(lambda x: x > max_months if pd.notna(x) else False)
-        stats['company_too_long'] = df['_company_too_long'].sum()
-        filtered_out['Company Too Long'] = df[df['_company_too_long']].drop(columns=['_company_months', '_company_too_long'], errors='ignore').copy()
-        df = df[~df['_company_too_long']].drop(columns=['_company_months', '_company_too_long'], errors='ignore')
+    # Each duration column is parsed once and shared by its min/max bounds
+    if role_col and (filters.get('min_role_months') or filters.get('max_role_months')):
+        role_months = _get_duration_months(df[role_col])
+        if filters.get('min_role_months'):
+            plan.add('role_too_short', 'Role Too Short', role_months < filters['min_role_months'])
+        if filters.get('max_role_months'):
+            plan.add('role_too_long', 'Role Too Long', role_months > filters['max_role_months'])
+    if company_col and (filters.get('min_company_months') or filters.get('max_company_months')):
+        company_months = _get_duration_months(df[company_col])
+        if filters.get('min_company_months'):
+            plan.add('company_too_short', 'Company Too Short', company_months < filters['min_company_months'])
+        if filters.get('max_company_months'):
+            plan.add('company_too_long', 'Company Too Long', company_months > filters['max_company_months'])
 
     # 7. Universities filter (keep only top university graduates - only for enriched data)
     if filters.get('universities') and 'education' in df.columns:
-        universities = [u.lower().strip() for u in filters['universities']]
-
-        def has_top_university(education):
-            """Check if education matches a target university using stricter matching."""
-            if pd.isna(education) or not str(education).strip():
-                return False
-            edu_lower = str(education).lower()
-            # Split education into parts (may contain multiple schools)
-            edu_parts = [p.strip() for p in edu_lower.replace('|', ',').split(',')]
-
-            for edu_part in edu_parts:
-                for uni in universities:
-                    if not uni:
-                        continue
-                    # Exact match
-                    if edu_part == uni:
-                        return True
-                    # Education part starts with university name
-                    if edu_part.startswith(uni):
-                        return True
-                    # University name starts with education part (if part is substantial)
-                    if uni.startswith(edu_part) and len(edu_part) > 10:
-                        return True
-                    # Word-based matching for longer names
-                    if len(uni) > 8:
-                        uni_words = set(uni.split())
-                        edu_words = set(edu_part.split())
-                        common = uni_words & edu_words
-                        # Require 70%+ of university words to match
-                        if len(common) >= len(uni_words) * 0.7:
-                            return True
-            return False
+        # Stricter part-based matching (see SchoolMatcher), compiled once for the list
+        universities = SchoolMatcher(u.lower().strip() for u in filters['universities'])
+        plan.add('not_top_university', 'Not Top University', ~universities.match_series(df['education']))
 
-        df['_top_uni'] = df['education'].apply(has_top_university)
-        not_top_uni = ~df['_top_uni']
-        stats['not_top_university'] = not_top_uni.sum()
-        filtered_out['Not Top University'] = df[not_top_uni].drop(columns=['_top_uni']).copy()
-        df = df[df['_top_uni']].drop(columns=['_top_uni'])
+    df, removed_counts, filtered_out = plan.run()
+    stats.update(removed_counts)
 
     stats['original'] = original_count
     stats['final'] = len(df)
@@ -2713,6 +2898,16 @@ def apply_pre_filters(df: pd.DataFrame, filters: dict) -> tuple[pd.DataFrame, di
     return df, stats, filtered_out
 
 
+def _get_search_index(df: pd.DataFrame) -> ProfileSearchIndex:
+    """Search index for the enriched DataFrame, cached per session until the data changes."""
+    version = fingerprint(df)
+    cached = st.session_state.get('_search_index')
+    if cached is None or cached[0] != version:
+        cached = (version, ProfileSearchIndex(df))
+        st.session_state['_search_index'] = cached
+    return cached[1]
+
+
 from prompts import DEFAULT_PROMPTS, DEFAULT_SCREENING_PROMPT
 
 
@@ -3051,34 +3246,44 @@ Respond with ONLY valid JSON in this exact format:
         if 'Company Description Analysis' not in prompt_to_use:
             prompt_to_use += _company_desc_reminder
 
-        # Retry with exponential backoff on rate limit (429) errors
-        response = None
-        last_err = None
-        for _attempt in range(4):  # 1 initial + 3 retries
+        with timed_call('openai', 'screen') as call:
+            # Retry with exponential backoff on rate limit (429) errors
+            response = None
+            last_err = None
+            for _attempt in range(4):  # 1 initial + 3 retries
+                try:
+                    response = client.chat.completions.create(
+                        model="gpt-4o-mini",
+                        messages=[
+                            {"role": "system", "content": prompt_to_use},
+                            {"role": "user", "content": user_prompt}
+                        ],
+                        temperature=0.3,
+                        max_tokens=max_tokens,
+                        response_format={"type": "json_object"}
+                    )
+                    break  # Success
+                except Exception as api_err:
+                    err_str = str(api_err).lower()
+                    if '429' in err_str or 'rate' in err_str:
+                        last_err = api_err
+                        time.sleep(2 ** _attempt)  # 1s, 2s, 4s
+                        continue
+                    raise  # Non-rate-limit error, don't retry
+            if response is None:
+                raise last_err or Exception("OpenAI rate limit exceeded after retries")
+            elapsed_ms = int((time.time() - start_time) * 1000)
+            call['bytes_in'] = len(response.choices[0].message.content or '')
+            call['bytes_out'] = len(prompt_to_use) + len(user_prompt)
+
+            parse_error = None
             try:
-                response = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": prompt_to_use},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    temperature=0.3,
-                    max_tokens=max_tokens,
-                    response_format={"type": "json_object"}
-                )
-                break  # Success
-            except Exception as api_err:
-                err_str = str(api_err).lower()
-                if '429' in err_str or 'rate' in err_str:
-                    last_err = api_err
-                    time.sleep(2 ** _attempt)  # 1s, 2s, 4s
-                    continue
-                raise  # Non-rate-limit error, don't retry
-        if response is None:
-            raise last_err or Exception("OpenAI rate limit exceeded after retries")
-        elapsed_ms = int((time.time() - start_time) * 1000)
+                result = json.loads(response.choices[0].message.content)
+            except json.JSONDecodeError as e:
+                call['status'] = 'error'
+                parse_error = e
 
-        # Log usage with token counts
+        # Log usage with token counts (spent even if the reply doesn't parse)
         if tracker and hasattr(response, 'usage') and response.usage:
             tracker.log_openai(
                 tokens_input=response.usage.prompt_tokens,
@@ -3089,17 +3294,16 @@ Respond with ONLY valid JSON in this exact format:
                 response_time_ms=elapsed_ms
             )
 
-        result = json.loads(response.choices[0].message.content)
+        if parse_error:
+            return {
+                "score": 0,
+                "fit": "Error",
+                "summary": f"JSON parse error: {str(parse_error)[:80]}",
+                "why": str(parse_error)[:100],
+                "strengths": [],
+                "concerns": []
+            }
         return result
-    except json.JSONDecodeError as e:
-        return {
-            "score": 0,
-            "fit": "Error",
-            "summary": f"JSON parse error: {str(e)[:80]}",
-            "why": str(e)[:100],
-            "strengths": [],
-            "concerns": []
-        }
     except Exception as e:
         elapsed_ms = int((time.time() - start_time) * 1000)
         if tracker:
@@ -3262,7 +3466,7 @@ api_key = load_api_key()
 has_crust_key = api_key and api_key != "YOUR_CRUSTDATA_API_KEY_HERE"
 
 # Show data status in header (always render to keep widget tree stable for tabs)
-_profile_count = len(st.session_state.get('results') or [])
+_profile_count = _session_len('results')
 st.info(f"📊 **{_profile_count}** profiles loaded" if _profile_count else "No profiles loaded — start from the Load tab")
 
 # Create tabs
@@ -3273,7 +3477,7 @@ tab_upload, tab_filter, tab_enrich, tab_filter2, tab_screening, tab_database, ta
 # ========== TAB 1: Upload ==========
 with tab_upload:
     # ===== Resume Last Session =====
-    has_local_session = _get_session_file().exists() or _LEGACY_SESSION_FILE.exists()
+    has_local_session = _has_saved_session()
 
     # Show restore options if there's data to restore
     if has_local_session or HAS_DATABASE:
@@ -3320,7 +3524,9 @@ with tab_upload:
                             col1, col2, col3 = st.columns(3)
                             with col1:
                                 if enriched_count > 0 and st.button(f"Load Enriched ({enriched_count})", key="resume_enriched"):
-                                    profiles = get_profiles_by_status(db_client, "enriched", limit=1000)
+                                    # Screening view: filters and AI screening read raw_data
+                                    profiles = get_profiles_by_status(db_client, "enriched", limit=1000,
+                                                                      columns=PROFILE_SCREENING_COLUMNS)
                                     if profiles:
                                         df = profiles_to_dataframe(profiles)
                                         st.session_state['results'] = profiles
@@ -3332,7 +3538,8 @@ with tab_upload:
 
                             with col2:
                                 if screened_count > 0 and st.button(f"Load Screened ({screened_count})", key="resume_screened"):
-                                    profiles = get_profiles_by_status(db_client, "screened", limit=1000)
+                                    profiles = get_profiles_by_status(db_client, "screened", limit=1000,
+                                                                      columns=PROFILE_SCREENING_COLUMNS)
                                     if profiles:
                                         df = profiles_to_dataframe(profiles)
                                         st.session_state['results'] = profiles
@@ -3413,8 +3620,8 @@ with tab_upload:
 
     # ===== Preview =====
     # Shows loaded results from PhantomBuster or CSV upload
-    if 'results' in st.session_state and st.session_state['results']:
-        results_df = st.session_state.get('results_df')
+    if _session_len('results'):
+        results_df = _session_get('results_df')
         if results_df is not None and not results_df.empty:
             st.divider()
             st.markdown("### Preview")
@@ -3605,7 +3812,7 @@ with tab_upload:
                                 st.rerun()
 
                     # Show current loaded count if any
-                    existing_count = len(st.session_state.get('results', []))
+                    existing_count = len(_session_get('results', []))
                     if existing_count > 0:
                         st.caption(f"Currently loaded: **{existing_count}** profiles")
 
@@ -3617,10 +3824,8 @@ with tab_upload:
                             if selected_search:
                                 with st.spinner("Loading results..."):
                                     filename = selected_search['csv_name']
-                                    pb_df = fetch_phantombuster_result_csv(pb_key, selected_agent['id'], debug=False, filename=filename)
+                                    pb_df = fetch_phantombuster_result_csv(pb_key, selected_agent['id'], debug=False, filename=filename, normalize=True)
                                     if not pb_df.empty:
-                                        pb_df = normalize_phantombuster_columns(pb_df)
-
                                         # PhantomBuster data stays in session state only (not saved to DB)
                                         # DB save happens after Crustdata enrichment
                                         st.session_state['results'] = pb_df.to_dict('records')
@@ -3638,14 +3843,12 @@ with tab_upload:
                             if selected_search:
                                 with st.spinner("Adding results..."):
                                     filename = selected_search['csv_name']
-                                    pb_df = fetch_phantombuster_result_csv(pb_key, selected_agent['id'], debug=False, filename=filename)
+                                    pb_df = fetch_phantombuster_result_csv(pb_key, selected_agent['id'], debug=False, filename=filename, normalize=True)
                                     if not pb_df.empty:
-                                        pb_df = normalize_phantombuster_columns(pb_df)
-
                                         # PhantomBuster data stays in session state only (not saved to DB)
                                         # Merge with existing results
-                                        if 'results_df' in st.session_state and not st.session_state['results_df'].empty:
-                                            existing_df = st.session_state['results_df']
+                                        if _session_has('results_df') and not _session_get('results_df').empty:
+                                            existing_df = _session_get('results_df')
                                             # Combine and remove duplicates based on linkedin_url or name
                                             combined_df = pd.concat([existing_df, pb_df], ignore_index=True)
                                             # Remove duplicates - prefer keeping first occurrence
@@ -3739,109 +3942,7 @@ with tab_upload:
         current_status = st.session_state['pb_launch_status']
 
         if current_status == 'running':
-            # Auto-fetch latest status
-            container_id = st.session_state['pb_launch_container_id']
-            if container_id:
-                status_result = fetch_container_status(pb_key, container_id)
-                container_status = status_result.get('status', 'unknown')
-
-                # Store progress info
-                st.session_state['pb_progress_info'] = {
-                    'profiles_count': status_result.get('profiles_count', 0),
-                    'progress_pct': status_result.get('progress_pct', 0),
-                    'progress': status_result.get('progress'),
-                }
-
-                # Check if finished or error
-                if container_status == 'finished':
-                    st.session_state['pb_launch_status'] = 'finished'
-                    # Release agent lock so other users can launch
-                    if st.session_state.get('pb_launch_agent_id'):
-                        pb_agent_unlock(st.session_state['pb_launch_agent_id'])
-                    # Desktop notification
-                    try:
-                        profiles = status_result.get('profiles_count', 0)
-                        msg = f"Extracted {profiles} profiles" if profiles else "Ready to load results"
-                        if HAS_PLYER:
-                            notification.notify(
-                                title="PhantomBuster Finished",
-                                message=msg,
-                                app_name="SourcingX",
-                                timeout=10
-                            )
-                        # Windows sound
-                        if HAS_WINSOUND:
-                            try:
-                                winsound.MessageBeep(winsound.MB_OK)
-                            except:
-                                pass
-                    except:
-                        pass
-                    st.rerun()
-                elif container_status == 'error':
-                    st.session_state['pb_launch_status'] = 'error'
-                    st.session_state['pb_launch_error'] = status_result.get('exitMessage', 'Phantom failed')
-                    # Release agent lock on error too
-                    if st.session_state.get('pb_launch_agent_id'):
-                        pb_agent_unlock(st.session_state['pb_launch_agent_id'])
-                    # Desktop notification for error
-                    try:
-                        if HAS_PLYER:
-                            notification.notify(
-                                title="PhantomBuster Error",
-                                message=status_result.get('exitMessage', 'Phantom failed'),
-                                app_name="SourcingX",
-                                timeout=10
-                            )
-                        if HAS_WINSOUND:
-                            try:
-                                winsound.MessageBeep(winsound.MB_ICONHAND)
-                            except:
-                                pass
-                    except:
-                        pass
-                    st.rerun()
-
-            # Show running status with progress
-            elapsed = ""
-            if st.session_state['pb_launch_start_time']:
-                elapsed_seconds = int(time.time() - st.session_state['pb_launch_start_time'])
-                elapsed_min = elapsed_seconds // 60
-                elapsed_sec = elapsed_seconds % 60
-                elapsed = f"{elapsed_min}m {elapsed_sec}s"
-
-            # Display progress info
-            progress_info = st.session_state.get('pb_progress_info', {})
-            profiles_count = progress_info.get('profiles_count', 0)
-            progress_pct = progress_info.get('progress_pct', 0)
-
-            # Progress display
-            st.info(f"**Running** - {elapsed} (auto-refreshing every 10s)")
-            if profiles_count > 0 or progress_pct > 0:
-                col_prog1, col_prog2 = st.columns(2)
-                with col_prog1:
-                    if profiles_count > 0:
-                        st.metric("Profiles extracted", profiles_count)
-                with col_prog2:
-                    if progress_pct > 0:
-                        st.metric("Progress", f"{progress_pct}%")
-
-            # Show progress bar if we have percentage
-            if progress_pct > 0:
-                st.progress(progress_pct / 100)
-
-            # Cancel button
-            if st.button("Cancel", key="pb_cancel_btn"):
-                st.session_state['pb_launch_status'] = 'idle'
-                st.session_state['pb_launch_container_id'] = None
-                st.session_state['pb_launch_start_time'] = None
-                st.session_state['pb_progress_info'] = {}
-                st.session_state['pb_launch_skip_count'] = 0
-                st.rerun()
-
-            # Auto-refresh every 10 seconds
-            time.sleep(10)
-            st.rerun()
+            _render_pb_launch_progress(pb_key)
 
         elif current_status == 'finished':
             progress_info = st.session_state.get('pb_progress_info', {})
@@ -3864,10 +3965,8 @@ with tab_upload:
                 agent_id = st.session_state['pb_launch_agent_id']
                 with st.spinner("Loading results..."):
                     # Load the specific file created during this launch
-                    pb_df = fetch_phantombuster_result_csv(pb_key, agent_id, filename=csv_name)
+                    pb_df = fetch_phantombuster_result_csv(pb_key, agent_id, filename=csv_name, normalize=True)
                     if not pb_df.empty:
-                        pb_df = normalize_phantombuster_columns(pb_df)
-
                         # Log PhantomBuster completion with profiles scraped
                         pb_tracker = get_usage_tracker()
                         if pb_tracker:
@@ -3988,12 +4087,12 @@ with tab_upload:
 
 # ========== TAB 2: Filter ==========
 with tab_filter:
-    if 'results' not in st.session_state or not st.session_state['results']:
+    if not _session_len('results'):
         st.info("Upload data in the Upload tab first.")
     else:
-        df = st.session_state['results_df']
+        df = _session_get('results_df')
         # Store original data if not already stored (for reset functionality)
-        if 'original_results_df' not in st.session_state or st.session_state.get('original_results_df') is None:
+        if not _session_has('original_results_df') or _session_get('original_results_df') is None:
             st.session_state['original_results_df'] = df.copy()
         needs_filtering = 'job_1_job_title' in df.columns and 'current_title' not in df.columns
 
@@ -4172,7 +4271,7 @@ with tab_filter:
         with btn_col2:
             if st.button("Reset Filters", key="reset_filters_main"):
                 # Reset to original unfiltered data
-                original_df = st.session_state.get('original_results_df')
+                original_df = _session_get('original_results_df')
                 if original_df is not None and not original_df.empty:
                     st.session_state['results_df'] = original_df.copy()
                     st.session_state['results'] = original_df.to_dict('records')
@@ -4189,8 +4288,8 @@ with tab_filter:
 
         if apply_clicked:
             # Store original data before first filter (only if not already stored)
-            if 'original_results_df' not in st.session_state or st.session_state.get('original_results_df') is None:
-                st.session_state['original_results_df'] = st.session_state.get('results_df').copy()
+            if not _session_has('original_results_df') or _session_get('original_results_df') is None:
+                st.session_state['original_results_df'] = _session_get('results_df').copy()
             filters = {}
 
             # Load filter data from Google Sheets or files
@@ -4259,7 +4358,7 @@ with tab_filter:
 
             # Apply filters
             with st.spinner("Applying filters..."):
-                df = st.session_state['results_df']
+                df = _session_get('results_df')
                 filtered_df, stats, filtered_out = apply_pre_filters(df, filters)
 
                 # Track which filters were enabled
@@ -4318,12 +4417,12 @@ with tab_filter:
                 st.caption("No individual matches found. Check column names in your data.")
 
     # View passed candidates section (only show after filtering)
-    if 'filter_stats' in st.session_state and 'passed_candidates_df' in st.session_state:
+    if 'filter_stats' in st.session_state and _session_has('passed_candidates_df'):
         st.divider()
         st.markdown("### View Passed Candidates")
         st.caption("Browse candidates that passed all filters, with priority categorization")
 
-        passed_df = st.session_state['passed_candidates_df']
+        passed_df = _session_get('passed_candidates_df')
 
         # Priority categorization section
         filter_sheets = get_filter_sheets_config()
@@ -4333,65 +4432,6 @@ with tab_filter:
         if has_sheets and st.button("Load Priority Categories", key="apply_categories"):
             sheet_url = filter_sheets.get('url', '')
 
-            # Helper function for matching
-            def normalize_company(name):
-                if pd.isna(name) or not str(name).strip():
-                    return ''
-                name = str(name).lower().strip()
-                for suffix in [' ltd', ' inc', ' corp', ' llc', ' limited', ' israel', ' il', ' technologies', ' tech', ' software', ' solutions', ' group']:
-                    if name.endswith(suffix):
-                        name = name[:-len(suffix)].strip()
-                return name
-
-            def matches_list(company, company_list):
-                if pd.isna(company) or not str(company).strip():
-                    return False
-                company_norm = normalize_company(company)
-                if not company_norm:
-                    return False
-                for c in company_list:
-                    c_norm = normalize_company(c)
-                    if not c_norm:
-                        continue
-                    if company_norm == c_norm:
-                        return True
-                    if len(c_norm) >= 4 and len(company_norm) >= 4:
-                        if company_norm.startswith(c_norm) or c_norm.startswith(company_norm):
-                            return True
-                return False
-
-            def matches_list_in_text(text, items_list):
-                """Stricter matching for universities - avoids partial matches like
-                'Tel Aviv University' matching 'Afeka Tel Aviv College'."""
-                if pd.isna(text) or not str(text).strip():
-                    return False
-                text_lower = str(text).lower()
-                text_parts = [p.strip() for p in text_lower.replace('|', ',').split(',')]
-
-                for item in items_list:
-                    item_norm = str(item).lower().strip()
-                    if not item_norm or len(item_norm) < 3:
-                        continue
-
-                    for text_part in text_parts:
-                        # Exact match
-                        if text_part == item_norm:
-                            return True
-                        # Text part starts with item
-                        if text_part.startswith(item_norm):
-                            return True
-                        # Item starts with text part (if substantial)
-                        if item_norm.startswith(text_part) and len(text_part) > 10:
-                            return True
-                        # Word-based matching for longer items
-                        if len(item_norm) > 8:
-                            item_words = set(item_norm.split())
-                            text_words = set(text_part.split())
-                            common = item_words & text_words
-                            if len(common) >= len(item_words) * 0.7:
-                                return True
-                return False
-
             with st.spinner("Loading priority lists..."):
                 # Target companies
                 if filter_sheets.get('target_companies'):
@@ -4402,7 +4442,7 @@ with tab_filter:
                             if 'company' in col.lower() or 'name' in col.lower():
                                 target_companies.extend(tc_df[col].dropna().tolist())
                         target_list = [str(c).lower().strip() for c in target_companies if c]
-                        passed_df['is_target_company'] = passed_df['current_company'].apply(lambda x: matches_list(x, target_list))
+                        passed_df['is_target_company'] = CompanyMatcher(target_list).match_series(passed_df['current_company'])
                         st.info(f"Target Companies: {len(target_list)} loaded, {passed_df['is_target_company'].sum()} matches")
 
                 # Layoff alerts
@@ -4414,7 +4454,7 @@ with tab_filter:
                             if 'company' in col.lower() or 'name' in col.lower():
                                 tech_alerts.extend(ta_df[col].dropna().tolist())
                         alerts_list = [str(c).lower().strip() for c in tech_alerts if c]
-                        passed_df['is_layoff_company'] = passed_df['current_company'].apply(lambda x: matches_list(x, alerts_list))
+                        passed_df['is_layoff_company'] = CompanyMatcher(alerts_list).match_series(passed_df['current_company'])
                         st.info(f"Layoff Alerts: {len(alerts_list)} loaded, {passed_df['is_layoff_company'].sum()} matches")
 
                 # Universities (read ALL columns)
@@ -4425,7 +4465,9 @@ with tab_filter:
                         for col in uni_df.columns:
                             uni_list.extend(uni_df[col].dropna().tolist())
                         uni_list = list(set(uni_list))  # Dedupe
-                        passed_df['is_top_university'] = passed_df['education'].apply(lambda x: matches_list_in_text(x, uni_list))
+                        # Stricter matching for universities - avoids partial matches like
+                        # 'Tel Aviv University' matching 'Afeka Tel Aviv College'
+                        passed_df['is_top_university'] = SchoolMatcher(uni_list, min_len=3).match_series(passed_df['education'])
                         st.info(f"Top Universities: {len(uni_list)} loaded ({len(uni_df.columns)} columns), {passed_df['is_top_university'].sum()} matches")
 
             # Save categorized data
@@ -4434,7 +4476,7 @@ with tab_filter:
             st.rerun()
 
         # Re-read from session state to get latest data with categories
-        passed_df = st.session_state['passed_candidates_df']
+        passed_df = _session_get('passed_candidates_df')
 
         # Filter checkboxes at the top
         st.markdown("**Filter by category:**")
@@ -4516,7 +4558,7 @@ with tab_filter:
         st.caption("View candidates removed by each filter and restore selected ones")
 
         filtered_out = st.session_state['filtered_out']
-        filter_names = [k for k, v in filtered_out.items() if len(v) > 0]
+        filter_names = [k for k in filtered_out if filtered_out.size(k) > 0]
 
         if filter_names:
             selected_filter = st.selectbox("Select filter to review:", filter_names)
@@ -4553,7 +4595,7 @@ with tab_filter:
                         to_restore = filter_df.iloc[restore_indices]
 
                         # Add back to main results
-                        current_df = st.session_state['results_df']
+                        current_df = _session_get('results_df')
                         restored_df = pd.concat([current_df, to_restore], ignore_index=True)
                         st.session_state['results_df'] = restored_df
                         st.session_state['results'] = restored_df.to_dict('records')
@@ -4574,9 +4616,9 @@ with tab_filter:
     st.markdown("### Email Enrichment (SalesQL)")
     salesql_key = load_salesql_key()
     if salesql_key:
-        if 'results' in st.session_state and st.session_state['results']:
-            current_count = len(st.session_state['results_df'])
-            already_enriched = (st.session_state['results_df']['salesql_email'].notna() & (st.session_state['results_df']['salesql_email'] != '')).sum() if 'salesql_email' in st.session_state['results_df'].columns else 0
+        if _session_len('results'):
+            current_count = len(_session_get('results_df'))
+            already_enriched = (_session_get('results_df')['salesql_email'].notna() & (_session_get('results_df')['salesql_email'] != '')).sum() if 'salesql_email' in _session_get('results_df').columns else 0
             not_enriched = current_count - already_enriched
             st.caption(f"{current_count} profiles | {already_enriched} already have emails | {not_enriched} remaining")
 
@@ -4600,7 +4642,7 @@ with tab_filter:
                         status_text.text(f"Enriching {current}/{total}...")
 
                     enriched_df = enrich_profiles_with_salesql(
-                        st.session_state['results_df'],
+                        _session_get('results_df'),
                         salesql_key,
                         progress_callback=update_progress,
                         limit=enrich_count
@@ -4640,14 +4682,14 @@ with tab_enrich:
         st.error("Supabase is not connected. Enrichment is disabled because results won't be saved. Check your supabase_url and supabase_key in secrets.")
     elif not has_crust_key:
         st.warning("Crust Data API key not configured. Add 'api_key' to config.json")
-    elif 'results' not in st.session_state or not st.session_state['results']:
+    elif not _session_len('results'):
         st.info("Load profiles first (tab 1). Filtering (tab 2) is optional.")
     else:
         # Use filtered data if available (from Filter+ tab), otherwise use loaded data
-        passed_df = st.session_state.get('passed_candidates_df')
+        passed_df = _session_get('passed_candidates_df')
         using_filtered = passed_df is not None and not passed_df.empty
-        results_df = passed_df if using_filtered else st.session_state.get('results_df')
-        enriched_df = st.session_state.get('enriched_df')
+        results_df = passed_df if using_filtered else _session_get('results_df')
+        enriched_df = _session_get('enriched_df')
 
         # Show data source indicator
         if using_filtered:
@@ -4788,8 +4830,17 @@ with tab_enrich:
                     db_client = _get_db_client()
                     if not db_client:
                         return [], set(), set()
-                    url_list = get_recently_enriched_urls(db_client, months=_months)
-                    url_set = set(normalize_linkedin_url(u) for u in url_list if u)
+                    mirror = _get_local_mirror()
+                    url_list = None
+                    if mirror:
+                        try:
+                            mirror.sync(db_client, tables=['profiles'])
+                            url_list = mirror.recently_enriched_urls(months=_months)
+                        except Exception as e:
+                            print(f"[Mirror] Sync failed, reading from Supabase: {e}")
+                    if url_list is None:
+                        url_list = get_recently_enriched_urls(db_client, months=_months)
+                    url_set = set(normalize_linkedin_urls([u for u in url_list if u]))
                     username_set = set()
                     for u in url_list:
                         base = get_base_username_from_url(u)
@@ -4815,8 +4866,8 @@ with tab_enrich:
                 # Filter out recently enriched URLs (older ones can be re-enriched)
                 new_urls = []
                 skipped_urls = []
-                for url in urls:
-                    normalized = normalize_linkedin_url(url) if HAS_DATABASE else url
+                normalized_urls = normalize_linkedin_urls(urls).tolist() if HAS_DATABASE else urls
+                for url, normalized in zip(urls, normalized_urls):
                     # Try exact URL match first
                     if normalized in recently_enriched:
                         skipped_urls.append(url)
@@ -4894,27 +4945,6 @@ with tab_enrich:
                                     if not db_client:
                                         st.error("Database connection failed")
                                     else:
-                                        # Get all recently enriched profiles with pagination (Supabase 1000 row limit)
-                                        import datetime as dt
-                                        cutoff_date = (dt.datetime.utcnow() - dt.timedelta(days=refresh_months * 30)).isoformat()
-
-                                        # Paginate to get all profiles
-                                        all_db_profiles = []
-                                        offset = 0
-                                        page_size = 1000
-                                        while True:
-                                            filters = {'enriched_at': f'gte.{cutoff_date}', 'offset': str(offset)}
-                                            batch = db_client.select('profiles', '*', filters, limit=page_size)
-                                            if not batch:
-                                                break
-                                            all_db_profiles.extend(batch)
-                                            if len(batch) < page_size:
-                                                break
-                                            offset += page_size
-
-                                        st.write(f"Debug: Got {len(all_db_profiles)} profiles from DB (with pagination)")
-                                        all_profiles = all_db_profiles  # Already filtered by date in query
-
                                         # Build comprehensive set of variations from skipped URLs for matching
                                         skipped_variations = set()
                                         for u in skipped_urls:
@@ -4934,46 +4964,34 @@ with tab_enrich:
                                                 # Hyphen-free version
                                                 skipped_variations.add(base.replace('-', ''))
 
-                                        # Filter to matching profiles
-                                        matched_profiles = []
-                                        seen_urls = set()  # Avoid duplicates
-                                        for p in all_profiles:
-                                            p_url = p.get('linkedin_url') or ''
-                                            if p_url in seen_urls:
-                                                continue
-
-                                            matched = False
+                                        def _matches_skipped(db_url):
                                             # Check normalized URL
-                                            p_normalized = normalize_linkedin_url(p_url)
-                                            if p_normalized and p_normalized in skipped_variations:
-                                                matched = True
-
+                                            db_normalized = normalize_linkedin_url(db_url)
+                                            if db_normalized and db_normalized in skipped_variations:
+                                                return True
                                             # Check base username and variations
-                                            if not matched:
-                                                p_base = get_base_username_from_url(p_url)
-                                                if p_base:
-                                                    if p_base in skipped_variations:
-                                                        matched = True
-                                                    elif p_base.replace('-', '') in skipped_variations:
-                                                        matched = True
-                                                    else:
-                                                        p_reversed = get_reversed_username(p_base)
-                                                        if p_reversed and p_reversed in skipped_variations:
-                                                            matched = True
-
-                                            if matched:
-                                                matched_profiles.append(p)
-                                                seen_urls.add(p_url)
+                                            db_base = get_base_username_from_url(db_url)
+                                            if not db_base:
+                                                return False
+                                            if db_base in skipped_variations or db_base.replace('-', '') in skipped_variations:
+                                                return True
+                                            db_reversed = get_reversed_username(db_base)
+                                            return bool(db_reversed and db_reversed in skipped_variations)
+
+                                        # Match against the recently enriched URLs already loaded for the skip
+                                        # check, then fetch just those profiles (by linkedin_url or original_url)
+                                        matched_db_urls = [u for u in recently_enriched_list if u and _matches_skipped(u)]
+                                        matched_profiles = get_profiles_by_urls(db_client, matched_db_urls)
 
                                         if matched_profiles:
                                             enriched_df = profiles_to_dataframe(matched_profiles)
                                             st.session_state['enriched_results'] = matched_profiles
                                             st.session_state['enriched_df'] = enriched_df
                                             save_session_state()
-                                            st.success(f"Loaded **{len(matched_profiles)}** enriched profiles for screening! (from {len(all_profiles)} in DB, {len(skipped_variations)} variations)")
+                                            st.success(f"Loaded **{len(matched_profiles)}** enriched profiles for screening! ({len(matched_db_urls)} matching DB URLs, {len(skipped_variations)} variations)")
                                             st.balloons()
                                         else:
-                                            st.warning(f"No matching profiles found. DB has {len(all_profiles)} profiles, tried {len(skipped_variations)} variations.")
+                                            st.warning(f"No matching profiles found. {len(recently_enriched_list)} recently enriched URLs in DB, tried {len(skipped_variations)} variations.")
                                 except Exception as e:
                                     st.error(f"Error loading profiles: {e}")
 
@@ -5135,7 +5153,7 @@ with tab_filter2:
     st.markdown("### Advanced Filtering (Enriched Data)")
     st.caption("Filter on full profile data: work history, education, skills")
 
-    enriched_df = st.session_state.get('enriched_df')
+    enriched_df = _session_get('enriched_df')
     is_enriched = enriched_df is not None and not enriched_df.empty
 
     if not is_enriched:
@@ -5265,6 +5283,8 @@ with tab_filter2:
                 removed = {}
                 filtered_out = {}  # Track filtered profiles by reason
                 priority_matches = []
+                # Per-row search text is built once per enriched dataset and reused across clicks
+                search_index = _get_search_index(enriched_df)
 
                 sheet_url = filter_sheets.get('url', '') if has_sheets else ''
 
@@ -5276,24 +5296,7 @@ with tab_filter2:
                         for col in nr_df.columns:
                             not_relevant_companies.update(nr_df[col].dropna().str.lower().str.strip().tolist())
                         if 'all_employers' in df.columns:
-                            def has_not_relevant_employer(employers_data):
-                                # Handle None, NaN, empty
-                                if employers_data is None:
-                                    return False
-                                try:
-                                    if pd.isna(employers_data):
-                                        return False
-                                except (ValueError, TypeError):
-                                    pass  # Handle arrays that can't be checked with isna
-                                if not employers_data:
-                                    return False
-                                # Handle list/array or comma-separated string
-                                if isinstance(employers_data, (list, tuple)):
-                                    employers = [str(e).strip().lower() for e in employers_data if e]
-                                else:
-                                    employers = [e.strip().lower() for e in str(employers_data).split(',')]
-                                return any(emp in not_relevant_companies for emp in employers)
-                            mask = df['all_employers'].apply(has_not_relevant_employer)
+                            mask = search_index.any_item_in('all_employers', not_relevant_companies, rows=df)
                             filtered_out['Not Relevant Companies'] = df[mask].to_dict('records')
                             removed['Not Relevant Companies'] = mask.sum()
                             df = df[~mask]
@@ -5306,51 +5309,11 @@ with tab_filter2:
                         for col in uni_df.columns:
                             target_unis.update(uni_df[col].dropna().str.lower().str.strip().tolist())
                         if 'all_schools' in df.columns:
-                            def has_target_university(schools_data):
-                                """Check if profile attended a target university.
-                                Uses stricter matching: target must match start of school name
-                                or be a significant portion (>60%) to avoid false positives like
-                                'Tel Aviv University' matching 'Afeka Tel Aviv College'.
-                                """
-                                # Handle None, NaN, empty
-                                if schools_data is None:
-                                    return False
-                                try:
-                                    if pd.isna(schools_data):
-                                        return False
-                                except (ValueError, TypeError):
-                                    pass  # Handle arrays that can't be checked with isna
-                                if not schools_data:
-                                    return False
-                                # Handle list/array or comma-separated string
-                                if isinstance(schools_data, (list, tuple)):
-                                    schools = [str(s).strip().lower() for s in schools_data if s]
-                                else:
-                                    schools = [s.strip().lower() for s in str(schools_data).split(',')]
-                                for school in schools:
-                                    for target in target_unis:
-                                        if not target:
-                                            continue
-                                        # Exact match
-                                        if school == target:
-                                            return True
-                                        # School starts with target (e.g., "technion" matches "technion - israel institute of technology")
-                                        if school.startswith(target):
-                                            return True
-                                        # Target starts with school (e.g., "tel aviv university" in target, "tel aviv uni" in school)
-                                        if target.startswith(school) and len(school) > 10:
-                                            return True
-                                        # Target is >70% of school name length and appears at start
-                                        # This catches "hebrew university" matching "hebrew university of jerusalem"
-                                        if len(target) > 8 and school.startswith(target.split()[0]) and len(target) / len(school) > 0.5:
-                                            # Check if key words match
-                                            target_words = set(target.split())
-                                            school_words = set(school.split())
-                                            common = target_words & school_words
-                                            if len(common) >= len(target_words) * 0.7:
-                                                return True
-                                return False
-                            df['_target_uni'] = df['all_schools'].apply(has_target_university)
+                            # Stricter matching: target must match start of school name or be a
+                            # significant portion, to avoid false positives like 'Tel Aviv University'
+                            # matching 'Afeka Tel Aviv College' (see SchoolMatcher)
+                            target_matcher = SchoolMatcher(target_unis, overlap_at_start=True)
+                            df['_target_uni'] = search_index.any_item_matches('all_schools', target_matcher.matches_name, rows=df)
                             priority_matches = df[df['_target_uni']].index.tolist()
 
                             if uni_filter_mode == "Require (filter others out)":
@@ -5368,11 +5331,7 @@ with tab_filter2:
                     keywords = [k.strip().lower() for k in include_keywords.split(',') if k.strip()]
                     if keywords:
                         search_cols = ['past_positions', 'current_title']
-                        available_search_cols = [c for c in search_cols if c in df.columns]
-                        def has_include_keyword(row):
-                            text = ' '.join(str(row[c]) for c in available_search_cols if row.get(c) is not None).lower()
-                            return any(kw in text for kw in keywords)
-                        mask = df.apply(has_include_keyword, axis=1)
+                        mask = search_index.keyword_mask(search_cols, keywords, rows=df)
                         filtered_out['Missing Title Keywords'] = df[~mask].to_dict('records')
                         removed['Missing Title Keywords'] = (~mask).sum()
                         df = df[mask]
@@ -5382,11 +5341,7 @@ with tab_filter2:
                     keywords = [k.strip().lower() for k in exclude_keywords.split(',') if k.strip()]
                     if keywords:
                         search_cols = ['past_positions', 'current_title']
-                        available_search_cols = [c for c in search_cols if c in df.columns]
-                        def has_exclude_keyword(row):
-                            text = ' '.join(str(row[c]) for c in available_search_cols if row.get(c) is not None).lower()
-                            return any(kw in text for kw in keywords)
-                        mask = df.apply(has_exclude_keyword, axis=1)
+                        mask = search_index.keyword_mask(search_cols, keywords, rows=df)
                         filtered_out['Excluded Title Keywords'] = df[mask].to_dict('records')
                         removed['Excluded Title Keywords'] = mask.sum()
                         df = df[~mask]
@@ -5406,30 +5361,8 @@ with tab_filter2:
                         available_search_cols = [c for c in search_cols if c in df.columns]
 
                         if available_search_cols:
-                            import json as json_module
-                            def has_required_keywords(row):
-                                # Combine text from all search columns
-                                text_parts = []
-                                for c in available_search_cols:
-                                    if c not in row or row.get(c) is None:
-                                        continue
-                                    val = row[c]
-                                    # Handle raw_crustdata dict/JSON
-                                    if c == 'raw_crustdata' and isinstance(val, dict):
-                                        text_parts.append(json_module.dumps(val, ensure_ascii=False))
-                                    else:
-                                        text_parts.append(str(val))
-                                combined_text = ' '.join(text_parts).lower()
-
-                                if not combined_text.strip():
-                                    return False
-
-                                if skills_logic == "AND":
-                                    return all(kw in combined_text for kw in skills_list)
-                                else:  # OR
-                                    return any(kw in combined_text for kw in skills_list)
-
-                            mask = df.apply(has_required_keywords, axis=1)
+                            mask = search_index.keyword_mask(available_search_cols, skills_list,
+                                                             require_all=(skills_logic == "AND"), rows=df)
                             logic_label = "all" if skills_logic == "AND" else "any"
                             filter_name = f'Missing Keywords in {scope_label} ({logic_label})'
                             filtered_out[filter_name] = df[~mask].to_dict('records')
@@ -5490,7 +5423,7 @@ with tab_filter2:
         # Show passed candidates
         st.divider()
         st.markdown("### Passed Candidates")
-        display_df = st.session_state.get('passed_candidates_df', enriched_df)
+        display_df = _session_get('passed_candidates_df', enriched_df)
 
         col1, col2 = st.columns([3, 1])
         with col1:
@@ -5523,7 +5456,7 @@ with tab_filter2:
             st.markdown("### Filtered Out Candidates")
             st.caption("Review candidates removed by each filter")
 
-            filtered_out = st.session_state['f2_filtered_out']
+            filtered_out = st.session_state['f2_filtered_out']  # {reason: list of records}
             filter_names = [k for k, v in filtered_out.items() if len(v) > 0]
 
             if filter_names:
@@ -5559,7 +5492,7 @@ with tab_filter2:
         salesql_key = load_salesql_key()
         if salesql_key:
             # Use passed_candidates_df if available
-            email_df = st.session_state.get('passed_candidates_df', display_df)
+            email_df = _session_get('passed_candidates_df', display_df)
             if email_df is not None and not email_df.empty:
                 current_count = len(email_df)
                 already_enriched = (email_df['salesql_email'].notna() & (email_df['salesql_email'] != '')).sum() if 'salesql_email' in email_df.columns else 0
@@ -5604,7 +5537,7 @@ with tab_screening:
     openai_key = load_openai_key()
 
     # Check if data is enriched
-    enriched_df = st.session_state.get('enriched_df')
+    enriched_df = _session_get('enriched_df')
     is_enriched = enriched_df is not None and not enriched_df.empty
 
     if not openai_key:
@@ -5614,15 +5547,15 @@ with tab_screening:
         st.info("Go to **tab 3 (Enrich)** to enrich profiles with full LinkedIn data, then come back here.")
     else:
         # Use passed_candidates_df if available (filtered), otherwise use enriched_df
-        if 'passed_candidates_df' in st.session_state and not st.session_state['passed_candidates_df'].empty:
-            profiles_df = st.session_state['passed_candidates_df']
+        if _session_has('passed_candidates_df') and not _session_get('passed_candidates_df').empty:
+            profiles_df = _session_get('passed_candidates_df')
             st.success(f"**{len(profiles_df)}** filtered candidates ready for screening")
         else:
             profiles_df = enriched_df
             st.info(f"**{len(profiles_df)}** enriched profiles ready for screening")
 
-        # Convert DataFrame to dicts for screening
-        profiles = profiles_df.to_dict('records')
+        # Dict-like records for screening (cells stay in the DataFrame until read)
+        profiles = records_from_df(profiles_df)
 
         # Helper: ensure raw_data is a dict (may arrive as JSON string from DB/session)
         def _ensure_raw_dict(raw):
@@ -5650,7 +5583,7 @@ with tab_screening:
             # Index by BOTH linkedin_flagship_url (clean) and linkedin_url (encoded)
             # since display DF uses flagship but raw Crustdata has both
             raw_by_url = {}
-            for ep in (st.session_state.get('enriched_results') or []):
+            for ep in (_session_get('enriched_results') or []):
                 raw = ep.get('raw_data') or ep.get('raw_crustdata') or ep
                 parsed_raw = _ensure_raw_dict(raw) if not isinstance(raw, dict) else raw
                 if not parsed_raw:
@@ -5679,14 +5612,17 @@ with tab_screening:
                     if db_client:
                         missing_urls = [p.get('linkedin_url', '') for p in still_missing if p.get('linkedin_url')]
                         if missing_urls:
-                            # Batch fetch all profiles from DB
-                            db_profiles = db_client.select('profiles', 'linkedin_url,raw_data', limit=len(profiles) + 100)
+                            # Fetch raw_data for just the missing profiles (by linkedin_url or original_url)
+                            db_profiles = get_profiles_by_urls(db_client, missing_urls,
+                                                               columns='linkedin_url,original_url,raw_data')
                             db_raw_by_url = {}
                             for dp in db_profiles:
-                                if dp.get('linkedin_url'):
-                                    db_raw_by_url[dp['linkedin_url']] = _ensure_raw_dict(dp.get('raw_data'))
+                                raw = _ensure_raw_dict(dp.get('raw_data'))
+                                for url_key in ('original_url', 'linkedin_url'):
+                                    if dp.get(url_key):
+                                        db_raw_by_url[dp[url_key]] = raw
                             for p in still_missing:
-                                url = p.get('linkedin_url', '')
+                                url = normalize_linkedin_url(p.get('linkedin_url', ''))
                                 if url and url in db_raw_by_url and db_raw_by_url[url]:
                                     p['raw_data'] = db_raw_by_url[url]
                 except Exception as e:
@@ -6065,7 +6001,7 @@ with tab_screening:
                         st.rerun()
 
             # Show existing results and options
-            existing_results = st.session_state.get('screening_results', [])
+            existing_results = _session_get('screening_results', [])
             start_button = False
             continue_button = False
             rescreen_selected_button = False
@@ -6239,12 +6175,12 @@ with tab_screening:
                 if rescreen_selected_button:
                     # Re-screen specific profiles: screen only selected, keep the rest
                     rescreen_urls = set(st.session_state.get('rescreen_selected_urls', []))
-                    existing_results = st.session_state.get('screening_results', [])
+                    existing_results = _session_get('screening_results', [])
                     initial_results = [r for r in existing_results if r.get('linkedin_url', '') not in rescreen_urls]
                     profiles_to_screen = [p for p in profiles if p.get('linkedin_url', '') in rescreen_urls]
                 elif continue_button:
                     # Continue: only screen profiles not yet screened
-                    existing_results = st.session_state.get('screening_results', [])
+                    existing_results = _session_get('screening_results', [])
                     screened_urls = set(r.get('linkedin_url', '') for r in existing_results if r.get('linkedin_url'))
                     unscreened = [p for p in profiles if p.get('linkedin_url', '') not in screened_urls]
                     profiles_to_screen = unscreened[:screen_count]
@@ -6279,11 +6215,11 @@ with tab_screening:
             st.warning("Please paste a job description to start screening")
 
         # Show screening results
-        if 'screening_results' in st.session_state and st.session_state['screening_results']:
+        if _session_len('screening_results'):
             st.divider()
             st.markdown("### Screening Results")
 
-            screening_results = st.session_state['screening_results']
+            screening_results = _session_get('screening_results')
 
             # Summary stats
             stats_col1, stats_col2, stats_col3, stats_col4 = st.columns(4)
@@ -6321,7 +6257,7 @@ with tab_screening:
                 df_display = pd.DataFrame(sorted_results)
 
                 # Merge with enriched profile data if available
-                enriched_df_merge = st.session_state.get('enriched_df')
+                enriched_df_merge = _session_get('enriched_df')
                 if enriched_df_merge is not None and not enriched_df_merge.empty and 'linkedin_url' in df_display.columns:
                     merge_cols = [c for c in enriched_df_merge.columns if c not in df_display.columns]
                     if merge_cols and 'linkedin_url' in enriched_df_merge.columns:
@@ -6488,7 +6424,7 @@ with tab_screening:
             with export_col3:
                 # Clear results
                 if st.button("Clear Results", key="clear_screening"):
-                    del st.session_state['screening_results']
+                    _session_pop('screening_results')
                     st.rerun()
 
 # ========== TAB 6: Database ==========
@@ -6528,13 +6464,107 @@ with tab_database:
                     stat_cols[4].metric("Contacted", stats.get('contacted', 0))
                     stat_cols[5].metric("Stale (>6mo)", stats.get('stale_profiles', 0))
 
+                mirror = _get_local_mirror()
+                if mirror:
+                    with st.expander("Local mirror", expanded=False):
+                        mirror_status = mirror.status()
+                        for table, info in mirror_status.items():
+                            st.caption(f"**{table}**: {info.get('rows', 0)} rows, last synced {info.get('synced_at') or 'never'}")
+                        mcol1, mcol2 = st.columns(2)
+                        with mcol1:
+                            if st.button("Sync changes", key="mirror_sync"):
+                                with st.spinner("Syncing local mirror..."):
+                                    fetched = mirror.sync(db_client)
+                                st.success("Fetched " + ", ".join(f"{n} {t}" for t, n in fetched.items()))
+                        with mcol2:
+                            if st.button("Full resync", key="mirror_full_sync"):
+                                with st.spinner("Rebuilding local mirror..."):
+                                    fetched = mirror.sync(db_client, full=True)
+                                st.success("Fetched " + ", ".join(f"{n} {t}" for t, n in fetched.items()))
+                        if HAS_DUCKDB:
+                            mirror_sql = st.text_area("SQL (tables: profiles, api_usage_logs)", key="mirror_sql",
+                                                      placeholder="SELECT screening_fit_level, COUNT(*) FROM profiles GROUP BY 1")
+                            if mirror_sql and st.button("Run query", key="mirror_query"):
+                                try:
+                                    st.dataframe(mirror.query(mirror_sql), use_container_width=True, hide_index=True)
+                                except Exception as e:
+                                    st.error(f"Query failed: {e}")
+                        else:
+                            st.caption("Install duckdb to run SQL on the mirror")
+
                 st.divider()
 
                 # Browse & filter profiles
                 st.markdown("#### Browse Profiles")
 
-                # Fetch all profiles once
-                all_profiles = get_all_profiles(db_client, limit=2000)
+                # --- Filters (applied in Postgres, so they cover the whole table) ---
+                fcol1, fcol2, fcol3 = st.columns(3)
+                with fcol1:
+                    f_title = st.text_input("Title", key="db_f_title", placeholder="e.g. devops, backend, product manager")
+                with fcol2:
+                    f_company = st.text_input("Company", key="db_f_company", placeholder="e.g. Wiz, Monday, Check Point")
+                with fcol3:
+                    f_location = st.text_input("Location", key="db_f_location", placeholder="e.g. israel, new york, london")
+
+                fcol4, fcol5, fcol6 = st.columns(3)
+                with fcol4:
+                    f_skills = st.text_input("Skills", key="db_f_skills", placeholder="e.g. python, kubernetes, react")
+                with fcol5:
+                    f_fit = st.multiselect(
+                        "Fit Level",
+                        options=["Strong Fit", "Good Fit", "Partial Fit", "Not a Fit", NOT_SCREENED],
+                        key="db_f_fit"
+                    )
+                with fcol6:
+                    f_status = st.multiselect(
+                        "Status",
+                        options=["enriched", "screened", "contacted", "archived"],
+                        key="db_f_status"
+                    )
+
+                with st.expander("Exact match filters (indexed)", expanded=False):
+                    st.caption("Comma-separated names, matched exactly (case-sensitive) against employer, school and skill lists")
+                    xcol1, xcol2 = st.columns(2)
+                    with xcol1:
+                        f_employers_any = st.text_input("Worked at any of", key="db_f_employers_any", placeholder="e.g. Wiz, Monday.com")
+                        f_schools_any = st.text_input("Studied at any of", key="db_f_schools_any", placeholder="e.g. Technion")
+                        f_enriched_from = st.date_input("Enriched from", value=None, key="db_f_enriched_from")
+                    with xcol2:
+                        f_employers_none = st.text_input("Never worked at", key="db_f_employers_none", placeholder="e.g. Google")
+                        f_skills_all = st.text_input("Has all skills", key="db_f_skills_all", placeholder="e.g. Python, AWS")
+                        f_enriched_to = st.date_input("Enriched before", value=None, key="db_f_enriched_to")
+
+                def _split_names(text):
+                    return [t.strip() for t in (text or '').split(',') if t.strip()]
+
+                # Title/company/location/skills are case-insensitive substring filters;
+                # location and skill/employer lists are searched in raw_data
+                db_query = (ProfileQuery()
+                            .text_contains('current_title', f_title)
+                            .text_contains(['current_company', 'raw_data->>all_employers'], f_company)
+                            .text_contains('raw_data->>location', f_location)
+                            .text_contains('raw_data->>skills', f_skills)
+                            .fit_levels(f_fit)
+                            .statuses(f_status)
+                            .include('all_employers', _split_names(f_employers_any))
+                            .exclude('all_employers', _split_names(f_employers_none))
+                            .include('all_schools', _split_names(f_schools_any))
+                            .include('skills', _split_names(f_skills_all), match_all=True)
+                            .date_range('enriched_at', start=f_enriched_from, end=f_enriched_to))
+
+                @st.cache_data(ttl=60, show_spinner=False)
+                def _load_db_profiles(query_params: tuple, limit: int):
+                    c = _get_db_client()
+                    params = dict(query_params)
+                    profiles = get_profiles_filtered(c, params, columns=PROFILE_SCREENING_COLUMNS, limit=limit)
+                    matching = count_profiles_filtered(c, params) if len(profiles) >= limit else len(profiles)
+                    return profiles, matching
+
+                try:
+                    all_profiles, matching_count = _load_db_profiles(tuple(sorted(db_query.to_params().items())), 2000)
+                except Exception as e:
+                    st.error(f"Could not load profiles: {e}")
+                    all_profiles, matching_count = [], 0
 
                 if all_profiles:
                     df = profiles_to_dataframe(all_profiles)
@@ -6543,75 +6573,14 @@ with tab_database:
                     if 'first_name' in df.columns and 'last_name' in df.columns:
                         df['name'] = (df['first_name'].fillna('') + ' ' + df['last_name'].fillna('')).str.strip()
 
-                    # Fill NaN for filtering
-                    filter_cols = ['current_title', 'current_company', 'all_employers', 'location', 'skills', 'screening_fit_level', 'status']
-                    for col in filter_cols:
-                        if col in df.columns:
-                            df[col] = df[col].fillna('')
-
-                    # --- Filters ---
-                    fcol1, fcol2, fcol3 = st.columns(3)
-                    with fcol1:
-                        f_title = st.text_input("Title", key="db_f_title", placeholder="e.g. devops, backend, product manager")
-                    with fcol2:
-                        f_company = st.text_input("Company", key="db_f_company", placeholder="e.g. Wiz, Monday, Check Point")
-                    with fcol3:
-                        f_location = st.text_input("Location", key="db_f_location", placeholder="e.g. israel, new york, london")
-
-                    fcol4, fcol5, fcol6 = st.columns(3)
-                    with fcol4:
-                        f_skills = st.text_input("Skills", key="db_f_skills", placeholder="e.g. python, kubernetes, react")
-                    with fcol5:
-                        f_fit = st.multiselect(
-                            "Fit Level",
-                            options=["Strong Fit", "Good Fit", "Partial Fit", "Not a Fit", "Not Screened"],
-                            key="db_f_fit"
-                        )
-                    with fcol6:
-                        f_status = st.multiselect(
-                            "Status",
-                            options=["enriched", "screened", "contacted", "archived"],
-                            key="db_f_status"
-                        )
-
-                    # Apply filters
-                    filtered_df = df.copy()
-
-                    if f_title:
-                        filtered_df = filtered_df[filtered_df['current_title'].str.contains(f_title, case=False, na=False)]
-
-                    if f_company:
-                        if 'all_employers' in filtered_df.columns:
-                            company_mask = (
-                                filtered_df['current_company'].str.contains(f_company, case=False, na=False) |
-                                filtered_df['all_employers'].str.contains(f_company, case=False, na=False)
-                            )
-                        else:
-                            company_mask = filtered_df['current_company'].str.contains(f_company, case=False, na=False)
-                        filtered_df = filtered_df[company_mask]
-
-                    if f_location and 'location' in filtered_df.columns:
-                        filtered_df = filtered_df[filtered_df['location'].str.contains(f_location, case=False, na=False)]
-
-                    if f_skills and 'skills' in filtered_df.columns:
-                        filtered_df = filtered_df[filtered_df['skills'].str.contains(f_skills, case=False, na=False)]
-
-                    if f_fit:
-                        fit_mask = pd.Series(False, index=filtered_df.index)
-                        named_fits = [f for f in f_fit if f != "Not Screened"]
-                        if named_fits and 'screening_fit_level' in filtered_df.columns:
-                            fit_mask = fit_mask | filtered_df['screening_fit_level'].isin(named_fits)
-                        if "Not Screened" in f_fit and 'screening_fit_level' in filtered_df.columns:
-                            fit_mask = fit_mask | (filtered_df['screening_fit_level'] == '')
-                        filtered_df = filtered_df[fit_mask]
-
-                    if f_status and 'status' in filtered_df.columns:
-                        filtered_df = filtered_df[filtered_df['status'].isin(f_status)]
+                    filtered_df = df
 
                     # Results
-                    has_filters = any([f_title, f_company, f_location, f_skills, f_fit, f_status])
-                    filter_label = f" (filtered from {len(df)})" if has_filters else ""
-                    st.info(f"Showing **{len(filtered_df)}** profiles{filter_label}")
+                    if matching_count > len(filtered_df):
+                        st.info(f"Showing the newest **{len(filtered_df)}** of {matching_count} matching profiles")
+                    else:
+                        filter_label = " matching filters" if db_query else ""
+                        st.info(f"Showing **{len(filtered_df)}** profiles{filter_label}")
 
                     # Toggle to show all columns
                     show_all_db_cols = st.checkbox("Show all columns", value=False, key="db_show_all_cols")
@@ -6656,6 +6625,8 @@ with tab_database:
                         "database_filtered.csv",
                         "text/csv"
                     )
+                elif db_query:
+                    st.info("No profiles match these filters")
                 else:
                     st.info("No profiles in database yet")
 
@@ -6930,3 +6901,46 @@ with tab_usage:
 
         except Exception as e:
             st.error(f"Usage dashboard error: {e}")
+
+    # Live in-process metrics (no DB needed) - latency/error rate per stage since server start
+    st.divider()
+    st.markdown("#### Live Metrics (this server)")
+    metrics_rows = metrics_registry.snapshot()
+    if metrics_rows:
+        st.caption(f"Since {datetime.fromtimestamp(metrics_registry.started_at).strftime('%Y-%m-%d %H:%M')} - all sessions on this server")
+        metrics_df = pd.DataFrame(metrics_rows)
+        metrics_df['error_rate'] = metrics_df['error_rate'] * 100
+        st.dataframe(
+            metrics_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "provider": st.column_config.TextColumn("Provider"),
+                "operation": st.column_config.TextColumn("Operation"),
+                "calls": st.column_config.NumberColumn("Calls", format="%d"),
+                "errors": st.column_config.NumberColumn("Errors", format="%d"),
+                "error_rate": st.column_config.NumberColumn("Error %", format="%.1f%%"),
+                "avg_ms": st.column_config.NumberColumn("Avg (ms)", format="%.0f"),
+                "p50_ms": st.column_config.NumberColumn("p50 (ms)", format="%.0f"),
+                "p95_ms": st.column_config.NumberColumn("p95 (ms)", format="%.0f"),
+                "p99_ms": st.column_config.NumberColumn("p99 (ms)", format="%.0f"),
+                "bytes_in": st.column_config.NumberColumn("Bytes In", format="%d"),
+                "bytes_out": st.column_config.NumberColumn("Bytes Out", format="%d"),
+            }
+        )
+        prom_text = metrics_registry.to_prometheus()
+        try:
+            written = metrics_registry.write_prometheus_file()
+            if written:
+                st.caption(f"Prometheus textfile: `{written}`")
+        except Exception as e:
+            st.caption(f"Could not write Prometheus textfile: {e}")
+        st.download_button(
+            "Download Metrics (Prometheus)",
+            prom_text,
+            "linkedin_enricher_metrics.prom",
+            "text/plain",
+            key="usage_metrics_download"
+        )
+    else:
+        st.info("No API calls recorded since the server started")
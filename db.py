@@ -8,13 +8,18 @@ Uses REST API directly - no supabase package required.
 import os
 import json
 import re
+import time
+import zlib
+import base64
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from pathlib import Path
 import pandas as pd
 
-from normalizers import normalize_linkedin_url
+from normalizers import normalize_linkedin_url, normalize_linkedin_urls
+from metrics import record_call
 
 # Refresh threshold for re-enriching stale profiles
 ENRICHMENT_REFRESH_MONTHS = 3
@@ -36,14 +41,20 @@ class SupabaseClient:
     def _request(self, method: str, endpoint: str, params: dict = None, json_data: dict = None) -> dict:
         """Make a request to Supabase REST API."""
         url = f"{self.url}/rest/v1/{endpoint}"
-        response = requests.request(
-            method,
-            url,
-            headers=self.headers,
-            params=params,
-            json=json_data,
-            timeout=30
-        )
+        start_time = time.time()
+        try:
+            response = requests.request(
+                method,
+                url,
+                headers=self.headers,
+                params=params,
+                json=json_data,
+                timeout=30
+            )
+        except Exception:
+            _record_supabase_call(method, endpoint, start_time, None)
+            raise
+        _record_supabase_call(method, endpoint, start_time, response)
         response.raise_for_status()
         if response.text:
             return response.json()
@@ -95,7 +106,9 @@ class SupabaseClient:
         json_str = json_str.replace(': NaN', ': null').replace(':NaN', ':null')
         json_str = json_str.replace(': Infinity', ': null').replace(':Infinity', ':null')
         json_str = json_str.replace(': -Infinity', ': null').replace(':-Infinity', ':null')
+        start_time = time.time()
         response = requests.post(url, headers=headers, params=params, data=json_str, timeout=30)
+        _record_supabase_call('UPSERT', table, start_time, response, bytes_out=len(json_str))
         if response.status_code >= 400:
             error_msg = f"{response.status_code}: {response.text}"
             raise requests.HTTPError(error_msg)
@@ -118,7 +131,9 @@ class SupabaseClient:
         json_str = json_str.replace(': NaN', ': null').replace(':NaN', ':null')
         json_str = json_str.replace(': Infinity', ': null').replace(':Infinity', ':null')
         json_str = json_str.replace(': -Infinity', ': null').replace(':-Infinity', ':null')
+        start_time = time.time()
         response = requests.post(url, headers=headers, params=params, data=json_str, timeout=60)
+        _record_supabase_call('UPSERT', table, start_time, response, bytes_out=len(json_str))
         if response.status_code >= 400:
             error_msg = f"{response.status_code}: {response.text}"
             raise requests.HTTPError(error_msg)
@@ -140,6 +155,15 @@ class SupabaseClient:
             params[key] = f'eq.{value}'
         return self._request('DELETE', table, params=params)
 
+    def rpc(self, function: str, args: dict = None, columns: str = None) -> list:
+        """Call a Postgres function exposed by PostgREST (POST /rpc/<function>).
+
+        columns selects the returned columns of functions that return table rows.
+        """
+        params = {'select': columns} if columns else None
+        result = self._request('POST', f'rpc/{function}', params=params, json_data=args or {})
+        return result if isinstance(result, list) else ([result] if result else [])
+
     def count(self, table: str, filters: dict = None) -> int:
         """Count rows in a table."""
         headers = self.headers.copy()
@@ -150,13 +174,32 @@ class SupabaseClient:
         if filters:
             for key, value in filters.items():
                 params[key] = value
+        start_time = time.time()
         response = requests.get(url, headers=headers, params=params, timeout=30)
+        _record_supabase_call('COUNT', table, start_time, response)
         response.raise_for_status()
         content_range = response.headers.get('Content-Range', '*/0')
         total = content_range.split('/')[-1]
         return int(total) if total != '*' else 0
 
 
+def _record_supabase_call(method: str, endpoint: str, start_time: float, response, bytes_out: int = None):
+    """Record a REST call on the in-process metrics registry (operation = 'METHOD table')."""
+    elapsed_ms = (time.time() - start_time) * 1000
+    if bytes_out is None:
+        body = getattr(getattr(response, 'request', None), 'body', None)
+        bytes_out = len(body) if body else 0
+    failed = response is None or response.status_code >= 400
+    record_call(
+        'supabase',
+        f"{method} {endpoint}",
+        elapsed_ms,
+        status='error' if failed else 'success',
+        bytes_in=len(response.content) if response is not None else 0,
+        bytes_out=bytes_out,
+    )
+
+
 def get_supabase_client() -> Optional[SupabaseClient]:
     """Get Supabase client from config.json, Streamlit secrets, or environment."""
     url = None
@@ -198,17 +241,87 @@ def get_supabase_client() -> Optional[SupabaseClient]:
 # PROFILE OPERATIONS (Crustdata Enriched Profiles Only)
 # ============================================================================
 
-def save_enriched_profile(client: SupabaseClient, linkedin_url: str, crustdata_response: dict, original_url: str = None) -> dict:
+# How save_enriched_profile stores the Crustdata response:
+# - 'full' (default): raw_data is the response as-is
+# - 'slim': raw_data is slim_raw_data(response) - opt-in, drops RAW_DATA_DROP_FIELDS
+# - 'archive': slim raw_data + the full response compressed in profile_raw_archive
+#   (see migrations/007_raw_data_archive.sql)
+RAW_DATA_STORAGE = 'full'
+
+# Response fields no reader uses (logos, internal IDs, domains, background picture) -
+# dropped from slim raw_data at the top level and inside employer/education entries.
+# Profile picture fields stay: extract_display_fields and CRUSTDATA_FIELD_MAP read them.
+RAW_DATA_DROP_FIELDS = frozenset([
+    'employer_logo_url',
+    'employer_company_website_domain', 'domains',
+    'employer_company_id', 'employee_position_id', 'employer_linkedin_id',
+    'background_picture_permalink',
+])
+RAW_DATA_NESTED_LISTS = ('current_employers', 'past_employers', 'education_background')
+
+
+def slim_raw_data(raw: dict) -> dict:
+    """Screening projection of a Crustdata response (same as SQL slim_raw_data()).
+
+    Keeps everything the display, filters and AI screening read - names, headline,
+    location, summary, employers with descriptions, education, skills, the
+    all_* arrays, the profile URLs and the profile picture.
+    """
+    if not isinstance(raw, dict):
+        return raw
+    slim = {}
+    for key, value in raw.items():
+        if key in RAW_DATA_DROP_FIELDS:
+            continue
+        if key in RAW_DATA_NESTED_LISTS and isinstance(value, list):
+            value = [{k: v for k, v in item.items() if k not in RAW_DATA_DROP_FIELDS}
+                     if isinstance(item, dict) else item for item in value]
+        slim[key] = value
+    return slim
+
+
+def _encode_raw_data(raw: dict) -> bytes:
+    return json.dumps(raw, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+
+def compress_raw_data(raw: dict, encoded: bytes = None) -> str:
+    """Full response as base64(zlib(JSON)) for profile_raw_archive."""
+    encoded = encoded if encoded is not None else _encode_raw_data(raw)
+    return base64.b64encode(zlib.compress(encoded, 9)).decode('ascii')
+
+
+def decompress_raw_data(blob: str) -> dict:
+    """Inverse of compress_raw_data."""
+    return json.loads(zlib.decompress(base64.b64decode(blob)).decode('utf-8'))
+
+
+def get_profile_raw_archive(client: SupabaseClient, linkedin_url: str) -> Optional[dict]:
+    """Full Crustdata response of a profile saved with the 'archive' storage mode.
+
+    Returns None if no archive exists (profile saved in 'full'/'slim' mode).
+    """
+    linkedin_url = normalize_linkedin_url(linkedin_url)
+    if not linkedin_url:
+        return None
+    rows = client.select('profile_raw_archive', 'raw_data_z', {'linkedin_url': f'eq.{linkedin_url}'}, limit=1)
+    if not rows:
+        return None
+    return decompress_raw_data(rows[0]['raw_data_z'])
+
+
+def save_enriched_profile(client: SupabaseClient, linkedin_url: str, crustdata_response: dict, original_url: str = None,
+                          storage: str = None) -> dict:
     """Save a Crustdata-enriched profile to the database.
 
-    Simplified approach: Store raw_data as-is, extract only title/company for indexing.
-    All other fields are extracted at display time from raw_data.
+    Simplified approach: Store raw_data (full response by default), extract only
+    title/company for indexing. All other fields are extracted at display time from raw_data.
 
     Args:
         client: SupabaseClient instance
         linkedin_url: The LinkedIn URL (used as primary key, typically from Crustdata)
         crustdata_response: Raw response from Crustdata API
         original_url: The original input URL (for matching with loaded data)
+        storage: 'full', 'slim' or 'archive' (default: RAW_DATA_STORAGE)
 
     Returns:
         The saved profile record
@@ -216,6 +329,7 @@ def save_enriched_profile(client: SupabaseClient, linkedin_url: str, crustdata_r
     linkedin_url = normalize_linkedin_url(linkedin_url)
     if not linkedin_url:
         raise ValueError("Valid linkedin_url is required")
+    storage = storage or RAW_DATA_STORAGE
 
     # Also normalize original_url for matching
     original_url = normalize_linkedin_url(original_url) if original_url else None
@@ -260,7 +374,7 @@ def save_enriched_profile(client: SupabaseClient, linkedin_url: str, crustdata_r
     data = {
         'linkedin_url': linkedin_url,
         'original_url': original_url,  # For matching with loaded data
-        'raw_data': crustdata_response,
+        'raw_data': crustdata_response if storage == 'full' else slim_raw_data(crustdata_response),
         'current_title': current_title,
         'current_company': current_company,
         'all_employers': all_employers if all_employers else None,
@@ -275,6 +389,20 @@ def save_enriched_profile(client: SupabaseClient, linkedin_url: str, crustdata_r
     data = {k: v for k, v in data.items() if v is not None}
 
     result = client.upsert('profiles', data, on_conflict='linkedin_url')
+
+    # Archive the full response (after the profile row exists - FK)
+    if storage == 'archive' and crustdata_response:
+        try:
+            encoded = _encode_raw_data(crustdata_response)
+            client.upsert('profile_raw_archive', {
+                'linkedin_url': linkedin_url,
+                'raw_data_z': compress_raw_data(crustdata_response, encoded),
+                'raw_bytes': len(encoded),
+                'archived_at': datetime.utcnow().isoformat(),
+            }, on_conflict='linkedin_url')
+        except Exception as e:
+            print(f"[DB] Raw archive save failed for {linkedin_url}: {e}")
+
     return result[0] if result else None
 
 
@@ -376,31 +504,125 @@ def update_profile_email(client: SupabaseClient, linkedin_url: str, email: str,
 # QUERY OPERATIONS
 # ============================================================================
 
+# ============================================================================
+# PROFILE COLUMN SETS (what each view selects instead of '*')
+# ============================================================================
+
+# Table columns the display rows and screening results read
+PROFILE_ROW_COLUMNS = (
+    'linkedin_url', 'current_title', 'current_company',
+    'screening_score', 'screening_fit_level', 'screening_summary', 'screening_reasoning',
+    'status', 'email', 'enriched_at', 'screened_at', 'updated_at',
+)
+
+# raw_data keys the list view selects by JSON path (raw_data->key) - no summary,
+# work history or education entries, which make up most of the document
+PROFILE_LIST_RAW_KEYS = (
+    'name', 'first_name', 'last_name', 'headline', 'location',
+    'all_schools', 'all_employers', 'skills', 'num_of_connections', 'connections_count',
+)
+
+# Alias prefix for raw_data JSON-path columns (folded back into raw_data on read)
+_RAW_PATH_PREFIX = 'raw__'
+
+# - list: tables and session loads that show name/title/company/score
+# - screening: the row columns + the whole raw_data (filters and AI screening)
+# - full: every column, including original_url and the filter arrays
+PROFILE_LIST_COLUMNS = ','.join(PROFILE_ROW_COLUMNS + tuple(
+    f'{_RAW_PATH_PREFIX}{key}:raw_data->{key}' for key in PROFILE_LIST_RAW_KEYS))
+PROFILE_SCREENING_COLUMNS = ','.join(PROFILE_ROW_COLUMNS + ('raw_data',))
+PROFILE_FULL_COLUMNS = '*'
+
+# Marks profiles whose raw_data only holds the list-view keys
+PARTIAL_RAW_FLAG = '_raw_partial'
+
+# URLs per in.(...) filter when fetching specific profiles (keeps request URLs short),
+# and how many of those requests run at once
+URL_LOOKUP_CHUNK_SIZE = 100
+URL_LOOKUP_WORKERS = 4
+
+
+def _fold_raw_paths(rows: list) -> list:
+    """Move raw__key columns of list-view rows back into a (partial) raw_data dict."""
+    for row in rows:
+        raw_keys = [k for k in row if k.startswith(_RAW_PATH_PREFIX)]
+        if not raw_keys:
+            continue
+        raw = {}
+        for key in raw_keys:
+            value = row.pop(key)
+            if value is not None:
+                raw[key[len(_RAW_PATH_PREFIX):]] = value
+        row['raw_data'] = raw
+        row[PARTIAL_RAW_FLAG] = True
+    return rows
+
+
+def select_profiles(client: SupabaseClient, columns: str = PROFILE_LIST_COLUMNS, filters: dict = None,
+                    limit: int = 50000) -> list:
+    """Select profiles with a column set; list-view rows get their partial raw_data folded in."""
+    rows = client.select('profiles', columns, filters, limit=limit)
+    if _RAW_PATH_PREFIX in columns:
+        _fold_raw_paths(rows)
+    return rows
+
+
+def get_profiles_by_urls(client: SupabaseClient, urls, columns: str = PROFILE_SCREENING_COLUMNS,
+                         url_columns=('linkedin_url', 'original_url')) -> list:
+    """Profiles whose linkedin_url or original_url is one of urls - each profile once.
+
+    URLs are normalized and sent as chunked in.(...) filters, one request per chunk
+    and URL column, run concurrently - only the requested profiles are transferred.
+    """
+    wanted = list(normalize_linkedin_urls(list(urls)).dropna().unique())
+    if not wanted:
+        return []
+
+    def fetch(url_column, chunk):
+        in_list = ','.join(_pg_quote(u) for u in chunk)
+        return select_profiles(client, columns, {url_column: f'in.({in_list})'}, limit=1000)
+
+    jobs = [(url_column, wanted[i:i + URL_LOOKUP_CHUNK_SIZE])
+            for url_column in url_columns
+            for i in range(0, len(wanted), URL_LOOKUP_CHUNK_SIZE)]
+    with ThreadPoolExecutor(max_workers=min(URL_LOOKUP_WORKERS, len(jobs))) as executor:
+        batches = list(executor.map(lambda job: fetch(*job), jobs))
+
+    profiles = {}
+    for batch in batches:
+        for row in batch:
+            profiles.setdefault(row.get('linkedin_url'), row)
+    return list(profiles.values())
+
+
 def get_profile(client: SupabaseClient, linkedin_url: str) -> Optional[dict]:
     """Get a single profile by LinkedIn URL."""
     linkedin_url = normalize_linkedin_url(linkedin_url)
-    result = client.select('profiles', '*', {'linkedin_url': f'eq.{linkedin_url}'})
+    result = client.select('profiles', PROFILE_FULL_COLUMNS, {'linkedin_url': f'eq.{linkedin_url}'})
     return result[0] if result else None
 
 
 def get_profiles_needing_screening(client: SupabaseClient, limit: int = 100) -> list:
     """Get enriched profiles that haven't been screened yet."""
-    return client.select('profiles', '*', {'status': 'eq.enriched', 'screening_score': 'is.null'}, limit=limit)
+    return select_profiles(client, PROFILE_SCREENING_COLUMNS,
+                           {'status': 'eq.enriched', 'screening_score': 'is.null'}, limit=limit)
 
 
-def get_profiles_by_status(client: SupabaseClient, status: str, limit: int = 1000) -> list:
-    """Get profiles by pipeline status."""
-    return client.select('profiles', '*', {'status': f'eq.{status}'}, limit=limit)
+def get_profiles_by_status(client: SupabaseClient, status: str, limit: int = 1000,
+                           columns: str = PROFILE_LIST_COLUMNS) -> list:
+    """Get profiles by pipeline status (list view unless columns says otherwise)."""
+    return select_profiles(client, columns, {'status': f'eq.{status}'}, limit=limit)
 
 
-def get_profiles_by_fit_level(client: SupabaseClient, fit_level: str, limit: int = 1000) -> list:
-    """Get profiles by screening fit level."""
-    return client.select('profiles', '*', {'screening_fit_level': f'eq.{fit_level}'}, limit=limit)
+def get_profiles_by_fit_level(client: SupabaseClient, fit_level: str, limit: int = 1000,
+                              columns: str = PROFILE_LIST_COLUMNS) -> list:
+    """Get profiles by screening fit level (list view unless columns says otherwise)."""
+    return select_profiles(client, columns, {'screening_fit_level': f'eq.{fit_level}'}, limit=limit)
 
 
-def get_all_profiles(client: SupabaseClient, limit: int = 10000) -> list:
-    """Get all profiles."""
-    return client.select('profiles', '*', limit=limit)
+def get_all_profiles(client: SupabaseClient, limit: int = 10000, columns: str = PROFILE_LIST_COLUMNS) -> list:
+    """Get all profiles (list view unless columns says otherwise)."""
+    return select_profiles(client, columns, limit=limit)
 
 
 def get_pipeline_stats(client: SupabaseClient) -> dict:
@@ -414,15 +636,219 @@ def get_pipeline_stats(client: SupabaseClient) -> dict:
     return {}
 
 
-def search_profiles(client: SupabaseClient, query: str, limit: int = 100) -> list:
-    """Search profiles by name, company, or title."""
-    results = client.select('profiles', '*', {'current_company': f'ilike.%{query}%'}, limit=limit)
+def search_profiles_ranked(client: SupabaseClient, query: str, limit: int = 100,
+                           columns: str = PROFILE_LIST_COLUMNS) -> list:
+    """Full-text search over name, headline, titles, employers, schools and skills.
+
+    Every word must match (prefixes count); most relevant first. Runs in Postgres on
+    the indexed search_vector column (see migrations/008_profile_search_vector.sql).
+    """
+    rows = client.rpc('search_profiles_ranked', {'query': query, 'max_results': limit}, columns=columns)
+    if _RAW_PATH_PREFIX in columns:
+        _fold_raw_paths(rows)
+    return rows
+
+
+def search_profiles(client: SupabaseClient, query: str, limit: int = 100,
+                    columns: str = PROFILE_LIST_COLUMNS) -> list:
+    """Search profiles by name, company, title, school or skill (ranked)."""
+    if not query or not query.strip():
+        return []
+    try:
+        return search_profiles_ranked(client, query, limit=limit, columns=columns)
+    except Exception as e:
+        print(f"[DB] search_profiles_ranked RPC unavailable ({e}), falling back to ilike")
+
+    # Pre-008 fallback: substring match on company, then name
+    results = select_profiles(client, columns, {'current_company': f'ilike.%{query}%'}, limit=limit)
     if len(results) < limit:
-        more = client.select('profiles', '*', {'first_name': f'ilike.%{query}%'}, limit=limit - len(results))
+        more = select_profiles(client, columns, {'raw_data->>name': f'ilike.%{query}%'}, limit=limit - len(results))
         results.extend(more)
     return results
 
 
+# ============================================================================
+# FILTERED QUERIES (filters run in Postgres, only matching rows are returned)
+# ============================================================================
+
+# TEXT[] columns with GIN indexes (see migrations/005_add_filter_arrays.sql)
+PROFILE_ARRAY_COLUMNS = ('all_employers', 'all_titles', 'all_schools', 'skills')
+
+# Fit level filter value for profiles without a screening result
+NOT_SCREENED = 'Not Screened'
+
+
+def _pg_quote(value) -> str:
+    """Double-quote a value for PostgREST list, array and logic-tree syntax."""
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{text}"'
+
+
+def _pg_like(text: str) -> str:
+    """ILIKE pattern matching text anywhere (PostgREST uses * as the wildcard)."""
+    text = str(text).strip().replace('*', '').replace('%', r'\%').replace('_', r'\_')
+    return f'*{text}*'
+
+
+class ProfileQuery:
+    """Filters for the profiles table, rendered as PostgREST query params.
+
+    All conditions are ANDed. Array filters use ov (any of) / cs (all of), which the
+    GIN indexes on all_employers/all_titles/all_schools/skills serve; array matches are
+    exact and case-sensitive. Text filters use ILIKE and accept JSON paths into
+    raw_data (e.g. 'raw_data->>location').
+
+    Usage:
+        query = (ProfileQuery()
+                 .include('all_employers', ['Wiz', 'Monday.com'])
+                 .exclude('all_schools', ['Some College'])
+                 .fit_levels(['Strong Fit', 'Good Fit'])
+                 .date_range('enriched_at', start='2025-01-01'))
+        profiles = get_profiles_filtered(client, query, limit=5000)
+    """
+
+    def __init__(self):
+        self._filters = []  # (column, operator, value, value_is_literal, negated)
+        self._groups = []   # OR groups, each a list of filters
+
+    def __bool__(self):
+        return bool(self._filters or self._groups)
+
+    def where(self, column: str, operator: str, value, negated: bool = False) -> 'ProfileQuery':
+        """Add a raw PostgREST condition (e.g. where('screening_score', 'gte', 70))."""
+        self._filters.append((column, operator, str(value), False, negated))
+        return self
+
+    def include(self, column: str, values, match_all: bool = False) -> 'ProfileQuery':
+        """Array column contains any (or, with match_all, every one) of the values."""
+        values = [v for v in (values or []) if str(v).strip()]
+        if values:
+            self._filters.append((column, 'cs' if match_all else 'ov', self._array(values), True, False))
+        return self
+
+    def exclude(self, column: str, values) -> 'ProfileQuery':
+        """Array column contains none of the values (profiles with no array are kept)."""
+        values = [v for v in (values or []) if str(v).strip()]
+        if values:
+            self._groups.append([(column, 'is', 'null', True, False),
+                                 (column, 'ov', self._array(values), True, True)])
+        return self
+
+    def one_of(self, column: str, values) -> 'ProfileQuery':
+        """Scalar column equals one of the values."""
+        values = list(values or [])
+        if values:
+            self._filters.append((column, 'in', self._list(values), True, False))
+        return self
+
+    def statuses(self, statuses) -> 'ProfileQuery':
+        """Profile status is one of statuses."""
+        return self.one_of('status', statuses)
+
+    def fit_levels(self, levels) -> 'ProfileQuery':
+        """Screening fit level is one of levels; NOT_SCREENED matches unscreened profiles."""
+        levels = list(levels or [])
+        named = [level for level in levels if level != NOT_SCREENED]
+        conditions = []
+        if named:
+            conditions.append(('screening_fit_level', 'in', self._list(named), True, False))
+        if NOT_SCREENED in levels:
+            conditions.append(('screening_fit_level', 'is', 'null', True, False))
+            conditions.append(('screening_fit_level', 'eq', '', False, False))
+        if len(conditions) == 1:
+            self._filters.append(conditions[0])
+        elif conditions:
+            self._groups.append(conditions)
+        return self
+
+    def date_range(self, column: str, start=None, end=None) -> 'ProfileQuery':
+        """Timestamp column >= start and < end (either bound optional; dates or ISO strings)."""
+        if start:
+            self._filters.append((column, 'gte', self._iso(start), True, False))
+        if end:
+            self._filters.append((column, 'lt', self._iso(end), True, False))
+        return self
+
+    def text_contains(self, columns, terms) -> 'ProfileQuery':
+        """Any of the columns contains any of the terms (case-insensitive).
+
+        terms is a string (comma-separated) or a list.
+        """
+        if isinstance(terms, str):
+            terms = terms.split(',')
+        terms = [t.strip() for t in terms if t and t.strip()]
+        if isinstance(columns, str):
+            columns = [columns]
+        conditions = [(column, 'ilike', _pg_like(term), False, False) for column in columns for term in terms]
+        if len(conditions) == 1:
+            self._filters.append(conditions[0])
+        elif conditions:
+            self._groups.append(conditions)
+        return self
+
+    @staticmethod
+    def _array(values) -> str:
+        return '{' + ','.join(_pg_quote(v) for v in values) + '}'
+
+    @staticmethod
+    def _list(values) -> str:
+        return '(' + ','.join(_pg_quote(v) for v in values) + ')'
+
+    @staticmethod
+    def _iso(value) -> str:
+        return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+    @staticmethod
+    def _param_value(operator, value, literal, negated) -> str:
+        return f"{'not.' if negated else ''}{operator}.{value}"
+
+    @staticmethod
+    def _tree_condition(column, operator, value, literal, negated) -> str:
+        value = value if literal else _pg_quote(value)
+        return f"{column}.{'not.' if negated else ''}{operator}.{value}"
+
+    def to_params(self) -> dict:
+        """PostgREST query params for these filters.
+
+        The first condition on a column is a plain column=op.value param; further
+        conditions on the same column and OR groups go into and=(...) / or=(...).
+        """
+        params = {}
+        extra = []
+        for column, operator, value, literal, negated in self._filters:
+            if column in params:
+                extra.append(self._tree_condition(column, operator, value, literal, negated))
+            else:
+                params[column] = self._param_value(operator, value, literal, negated)
+        for i, group in enumerate(self._groups):
+            tree = ','.join(self._tree_condition(*condition) for condition in group)
+            if i == 0:
+                params['or'] = f'({tree})'
+            else:
+                extra.append(f'or({tree})')
+        if extra:
+            params['and'] = '(' + ','.join(extra) + ')'
+        return params
+
+
+def get_profiles_filtered(client: SupabaseClient, query, columns: str = '*',
+                          limit: int = 2000, order: str = 'enriched_at.desc.nullslast') -> list:
+    """Get profiles matching query, newest first. Filtering happens in Postgres.
+
+    query is a ProfileQuery or the params dict from ProfileQuery.to_params().
+    """
+    filters = dict(query.to_params() if isinstance(query, ProfileQuery) else query or {})
+    if order:
+        filters['order'] = order
+    return client.select('profiles', columns, filters, limit=limit)
+
+
+def count_profiles_filtered(client: SupabaseClient, query) -> int:
+    """Count profiles matching query (ProfileQuery or params dict) without fetching them."""
+    filters = query.to_params() if isinstance(query, ProfileQuery) else query
+    return client.count('profiles', filters or None)
+
+
 # ============================================================================
 # DEDUPLICATION (for skipping already-enriched URLs)
 # ============================================================================
@@ -433,12 +859,8 @@ def get_enriched_urls(client: SupabaseClient) -> set:
     Used to skip profiles that are already in the database when enriching.
     """
     result = client.select('profiles', 'linkedin_url', limit=50000)
-    urls = set()
-    for p in result:
-        url = p.get('linkedin_url')
-        if url:
-            urls.add(normalize_linkedin_url(url))
-    return urls
+    urls = [p.get('linkedin_url') for p in result if p.get('linkedin_url')]
+    return set(normalize_linkedin_urls(urls))
 
 
 def get_all_linkedin_urls(client: SupabaseClient) -> list:
@@ -536,12 +958,58 @@ def log_api_usage(client: SupabaseClient, data: dict) -> Optional[dict]:
         return None
 
 
+def _empty_usage_summary() -> dict:
+    return {
+        'crustdata': {'credits': 0, 'requests': 0, 'errors': 0},
+        'salesql': {'lookups': 0, 'requests': 0, 'errors': 0},
+        'openai': {'cost_usd': 0.0, 'tokens_input': 0, 'tokens_output': 0, 'requests': 0, 'errors': 0},
+        'phantombuster': {'runs': 0, 'profiles_scraped': 0, 'errors': 0},
+    }
+
+
 def get_usage_summary(client: SupabaseClient, days: int = None) -> dict:
-    """Get aggregated usage stats by provider."""
-    filters = {}
-    if days:
-        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
-        filters['created_at'] = f'gte.{cutoff}'
+    """Get aggregated usage stats by provider.
+
+    Totals are grouped server-side by the usage_summary_by_provider function
+    (migrations/006_usage_aggregates.sql), so only one row per provider is transferred.
+    Falls back to summing raw logs if the function hasn't been created yet.
+    """
+    cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat() if days else None
+
+    try:
+        rows = client.rpc('usage_summary_by_provider', {'since': cutoff})
+    except Exception as e:
+        print(f"[DB] usage_summary_by_provider RPC unavailable ({e}), aggregating raw logs")
+        return _get_usage_summary_from_logs(client, cutoff)
+
+    summary = _empty_usage_summary()
+    for row in rows:
+        provider = (row.get('provider') or '').lower()
+        if provider not in summary:
+            continue
+
+        stats = summary[provider]
+        stats['requests'] = int(row.get('requests') or 0)
+        stats['errors'] = int(row.get('errors') or 0)
+
+        if provider == 'crustdata':
+            stats['credits'] = float(row.get('credits_used') or 0)
+        elif provider == 'salesql':
+            stats['lookups'] = float(row.get('credits_used') or 0)
+        elif provider == 'openai':
+            stats['cost_usd'] = float(row.get('cost_usd') or 0)
+            stats['tokens_input'] = int(row.get('tokens_input') or 0)
+            stats['tokens_output'] = int(row.get('tokens_output') or 0)
+        elif provider == 'phantombuster':
+            stats['runs'] = int(row.get('runs') or 0)
+            stats['profiles_scraped'] = int(row.get('profiles_scraped') or 0)
+
+    return summary
+
+
+def _get_usage_summary_from_logs(client: SupabaseClient, cutoff: str = None) -> dict:
+    """Legacy client-side aggregation (limited to the most recent 10,000 log rows)."""
+    filters = {'created_at': f'gte.{cutoff}'} if cutoff else {}
 
     try:
         logs = client.select('api_usage_logs', '*', filters, limit=10000)
@@ -549,12 +1017,7 @@ def get_usage_summary(client: SupabaseClient, days: int = None) -> dict:
         print(f"[DB] Failed to fetch usage logs: {e}")
         return {}
 
-    summary = {
-        'crustdata': {'credits': 0, 'requests': 0, 'errors': 0},
-        'salesql': {'lookups': 0, 'requests': 0, 'errors': 0},
-        'openai': {'cost_usd': 0.0, 'tokens_input': 0, 'tokens_output': 0, 'requests': 0, 'errors': 0},
-        'phantombuster': {'runs': 0, 'profiles_scraped': 0, 'errors': 0},
-    }
+    summary = _empty_usage_summary()
 
     for log in logs:
         provider = log.get('provider', '').lower()
@@ -613,9 +1076,41 @@ def get_usage_logs(client: SupabaseClient, provider: str = None, days: int = Non
 
 
 def get_usage_by_date(client: SupabaseClient, days: int = 30) -> list:
-    """Get usage aggregated by date for charting."""
+    """Get usage aggregated by date for charting.
+
+    Uses the usage_by_day function so the database returns one row per
+    (day, provider) instead of every log row.
+    """
     cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
 
+    try:
+        rows = client.rpc('usage_by_day', {'since': cutoff})
+    except Exception as e:
+        print(f"[DB] usage_by_day RPC unavailable ({e}), aggregating raw logs")
+        return _get_usage_by_date_from_logs(client, cutoff)
+
+    by_date = {}
+    for row in rows:
+        date_str = str(row.get('day') or '')[:10]
+        if not date_str:
+            continue
+        provider = (row.get('provider') or '').lower()
+
+        if date_str not in by_date:
+            by_date[date_str] = {'date': date_str, 'crustdata': 0, 'salesql': 0, 'openai': 0, 'phantombuster': 0}
+
+        if provider in ('crustdata', 'salesql'):
+            by_date[date_str][provider] += float(row.get('credits_used') or 0)
+        elif provider == 'openai':
+            by_date[date_str]['openai'] += float(row.get('cost_usd') or 0)
+        elif provider == 'phantombuster':
+            by_date[date_str]['phantombuster'] += int(row.get('runs') or 0)
+
+    return sorted(by_date.values(), key=lambda x: x['date'])
+
+
+def _get_usage_by_date_from_logs(client: SupabaseClient, cutoff: str) -> list:
+    """Legacy client-side daily aggregation (limited to 10,000 log rows)."""
     try:
         logs = client.select('api_usage_logs', '*', {'created_at': f'gte.{cutoff}'}, limit=10000)
     except Exception as e:
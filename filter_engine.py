@@ -0,0 +1,105 @@
+"""
+Filter Engine for LinkedIn Enricher
+Applies a list of row filters to a DataFrame in one pass.
+
+Each filter contributes a boolean "removed" mask computed against the same input
+frame. Masks are combined once, and a row failing several filters is attributed to
+the first one in plan order - the same result as running the filters one after
+another. The removed rows are copied once and grouped by filter as index arrays,
+so nothing is materialized per filter until the review UI asks for it.
+
+Usage:
+    plan = FilterPlan(df)
+    plan.add('blacklist', 'Blacklist Companies', matcher.match_series(df['current_company']))
+    kept_df, counts, filtered_out = plan.run()
+"""
+
+from collections.abc import MutableMapping
+
+import numpy as np
+import pandas as pd
+
+
+class FilteredOut(MutableMapping):
+    """Removed rows grouped by filter label, materialized on access.
+
+    Behaves like the {label: DataFrame} dict the review UI expects. Assigning a
+    DataFrame to a label (e.g. after restoring some rows) stores it as-is.
+    """
+
+    def __init__(self, removed_df: pd.DataFrame = None, positions: dict = None):
+        self._removed = removed_df
+        self._positions = dict(positions or {})  # label -> row positions in removed_df
+        self._frames = {}  # label -> DataFrame assigned explicitly
+        self._labels = list(self._positions)
+
+    def __getitem__(self, label) -> pd.DataFrame:
+        if label in self._frames:
+            return self._frames[label]
+        return self._removed.iloc[self._positions[label]]
+
+    def __setitem__(self, label, frame: pd.DataFrame):
+        if label not in self:
+            self._labels.append(label)
+        self._frames[label] = frame
+        self._positions.pop(label, None)
+
+    def __delitem__(self, label):
+        if label not in self:
+            raise KeyError(label)
+        self._labels.remove(label)
+        self._frames.pop(label, None)
+        self._positions.pop(label, None)
+
+    def __iter__(self):
+        return iter(list(self._labels))
+
+    def __len__(self):
+        return len(self._labels)
+
+    def __contains__(self, label):
+        return label in self._positions or label in self._frames
+
+    def size(self, label) -> int:
+        """Number of rows removed by a filter, without materializing them."""
+        if label in self._frames:
+            return len(self._frames[label])
+        return len(self._positions[label])
+
+
+class FilterPlan:
+    """Ordered filter masks over one DataFrame, combined with first-match attribution."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.steps = []
+
+    def add(self, stat_key: str, label: str, removed_mask) -> None:
+        """Add a filter step.
+
+        Args:
+            stat_key: Key for the removed count in the stats dict
+            label: Group name for the removed rows in filtered_out
+            removed_mask: Boolean Series/array over df, True for rows this filter removes
+        """
+        mask = np.asarray(removed_mask, dtype=bool)
+        if mask.shape != (len(self.df),):
+            raise ValueError(f"Mask for '{stat_key}' has shape {mask.shape}, expected ({len(self.df)},)")
+        self.steps.append((stat_key, label, mask))
+
+    def run(self) -> tuple[pd.DataFrame, dict, FilteredOut]:
+        """Apply all steps. Returns (kept rows, {stat_key: removed count}, filtered_out)."""
+        removed = np.zeros(len(self.df), dtype=bool)
+        counts = {}
+        hits = []
+        for stat_key, label, mask in self.steps:
+            hit = mask & ~removed
+            counts[stat_key] = hit.sum()
+            hits.append((label, hit))
+            removed |= hit
+
+        # Positions of each filter's rows within the single copy of removed rows
+        removed_positions = np.cumsum(removed) - 1
+        positions = {label: removed_positions[hit] for label, hit in hits}
+        filtered_out = FilteredOut(self.df[removed], positions)
+        return self.df[~removed], counts, filtered_out
@@ -5,6 +5,18 @@ This is the ONE place where Crustdata field names are mapped to display fields.
 If Crustdata changes their API, update only this file.
 """
 
+import threading
+from collections import OrderedDict
+
+# Display rows kept by profiles_to_display_df, keyed by (linkedin_url, updated_at) and
+# the columns the profile was read with. The profiles table bumps updated_at on every
+# update (trigger), so a cached row is reused only while the profile is unchanged and
+# only for the same column projection. List-view profiles (db.PARTIAL_RAW_FLAG) carry
+# only part of raw_data, so their raw keys are part of the key too.
+DISPLAY_ROW_CACHE_SIZE = 20000
+_display_rows = OrderedDict()
+_display_rows_lock = threading.Lock()
+
 
 def extract_display_fields(raw_data: dict) -> dict:
     """Extract display fields from Crustdata raw response.
@@ -207,14 +219,50 @@ def profile_to_display_row(profile: dict) -> dict:
     }
 
 
+def cached_display_row(profile: dict) -> dict:
+    """profile_to_display_row, reusing the row built for the same profile version.
+
+    Profiles without updated_at (e.g. partial selects) are always rebuilt.
+    """
+    updated_at = profile.get('updated_at')
+    if not updated_at:
+        return profile_to_display_row(profile)
+
+    raw = profile.get('raw_data')
+    raw_keys = frozenset(raw) if profile.get('_raw_partial') and isinstance(raw, dict) else None
+    key = (profile.get('linkedin_url'), updated_at, frozenset(profile), raw_keys)
+    with _display_rows_lock:
+        row = _display_rows.get(key)
+        if row is not None:
+            _display_rows.move_to_end(key)
+            return row
+
+    row = profile_to_display_row(profile)
+    with _display_rows_lock:
+        _display_rows[key] = row
+        while len(_display_rows) > DISPLAY_ROW_CACHE_SIZE:
+            _display_rows.popitem(last=False)
+    return row
+
+
+def clear_display_row_cache():
+    """Drop all cached display rows."""
+    with _display_rows_lock:
+        _display_rows.clear()
+
+
 def profiles_to_display_df(profiles: list) -> 'pd.DataFrame':
-    """Convert list of DB profiles to display DataFrame."""
+    """Convert list of DB profiles to display DataFrame.
+
+    Rows come from the display-row cache, so only new or updated profiles are
+    re-extracted from raw_data.
+    """
     import pandas as pd
 
     if not profiles:
         return pd.DataFrame()
 
-    rows = [profile_to_display_row(p) for p in profiles]
+    rows = [cached_display_row(p) for p in profiles]
     df = pd.DataFrame(rows)
 
     # Column order for display
@@ -0,0 +1,258 @@
+"""
+Local Mirror for LinkedIn Enricher
+Opt-in local Parquet copy of the profiles and api_usage_logs tables for analytics.
+
+Supabase stays the system of record; the mirror is a read-only copy that whole-pool
+scans (dedup URL sets, aggregations, ad-hoc SQL) can run against locally instead of
+paging through the REST API. Enable it with "local_mirror": true in config.json.
+
+Sync is incremental: each table keeps a cursor (the newest updated_at / created_at
+seen) in mirror.json, and a sync fetches only rows at or after it, merging the new or
+changed ones into the table's Parquet file by primary key (the file is left alone when
+there are none). Rows deleted in Supabase stay in the mirror until a full resync
+(sync(full=True)).
+
+Nested columns (raw_data, metadata) are stored as JSON strings, like session_store.
+SQL queries need the optional duckdb package; load() works with pandas alone.
+
+Usage:
+    mirror = LocalMirror()
+    mirror.sync(client)
+    df = mirror.load('profiles')
+    mirror.query("SELECT status, COUNT(*) FROM profiles GROUP BY 1")  # duckdb
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from db import PROFILE_ROW_COLUMNS
+from normalizers import normalize_linkedin_urls
+
+try:
+    import duckdb
+    HAS_DUCKDB = True
+except ImportError:
+    HAS_DUCKDB = False
+
+
+MIRROR_DIR = Path(__file__).parent / '.mirror'
+MIRROR_STATE_FILE = 'mirror.json'
+PARQUET_COMPRESSION = 'zstd'
+
+# Mirrored tables: primary key, sync cursor column, selected columns, JSON columns
+MIRROR_TABLES = {
+    'profiles': {
+        'key': 'linkedin_url',
+        'cursor': 'updated_at',
+        'columns': ','.join(PROFILE_ROW_COLUMNS + (
+            'original_url', 'created_at', 'all_employers', 'all_titles', 'all_schools', 'skills', 'raw_data')),
+        'json_columns': ('raw_data', 'all_employers', 'all_titles', 'all_schools', 'skills'),
+    },
+    'api_usage_logs': {
+        'key': 'id',
+        'cursor': 'created_at',  # append-only table
+        'columns': '*',
+        'json_columns': ('metadata',),
+    },
+}
+
+# Rows fetched per sync request (the client pages past Supabase's 1000-row limit)
+SYNC_MAX_ROWS = 200000
+
+
+def _encode_json_cell(value):
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _cell_str(value) -> str:
+    """Key/cursor cell as a comparable string ('' for missing, however Parquet read it back)."""
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return str(value)
+
+
+def _decode_json_cell(value):
+    if not isinstance(value, str) or not value:
+        return value
+    try:
+        return json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return value
+
+
+class LocalMirror:
+    """Parquet files mirroring Supabase tables, synced incrementally by cursor column."""
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path or MIRROR_DIR)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._frames = {}  # table -> (file mtime, decoded DataFrame)
+
+    # ----- state -----
+
+    def _state_path(self) -> Path:
+        return self.path / MIRROR_STATE_FILE
+
+    def _read_state(self) -> dict:
+        try:
+            with open(self._state_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_state(self, state: dict):
+        tmp = self._state_path().with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp, self._state_path())
+
+    def table_path(self, table: str) -> Path:
+        return self.path / f'{table}.parquet'
+
+    def status(self) -> dict:
+        """{table: {'rows', 'cursor', 'synced_at'}} for the mirrored tables."""
+        state = self._read_state()
+        return {table: state.get(table, {'rows': 0, 'cursor': None, 'synced_at': None}) for table in MIRROR_TABLES}
+
+    # ----- sync -----
+
+    def sync(self, client, tables=None, full: bool = False) -> dict:
+        """Pull rows changed since the last sync into the mirror.
+
+        Args:
+            client: SupabaseClient
+            tables: Table names to sync (default: all of MIRROR_TABLES)
+            full: Refetch everything (drops rows deleted in Supabase)
+
+        Returns:
+            {table: number of new or changed rows}
+        """
+        state = self._read_state()
+        fetched = {}
+        for table in tables or MIRROR_TABLES:
+            spec = MIRROR_TABLES[table]
+            table_state = {} if full else state.get(table, {})
+            cursor = table_state.get('cursor')
+
+            filters = {'order': f"{spec['cursor']}.asc,{spec['key']}.asc"}
+            if cursor:
+                # gte, not gt: rows sharing the cursor timestamp are re-fetched and
+                # de-duplicated by key rather than missed
+                filters[spec['cursor']] = f'gte.{cursor}'
+            rows = client.select(table, spec['columns'], filters, limit=SYNC_MAX_ROWS)
+            if rows and cursor:
+                rows = self._unmirrored_rows(table, rows)
+            fetched[table] = len(rows)
+
+            if rows or full:
+                new = pd.DataFrame(rows)
+                for column in spec['json_columns']:
+                    if column in new.columns:
+                        new[column] = new[column].map(_encode_json_cell).astype(object)
+                existing = None if full else self._read_table(table)
+                merged = new if existing is None or existing.empty else pd.concat([existing, new], ignore_index=True)
+                if not merged.empty:
+                    merged = merged.drop_duplicates(spec['key'], keep='last').reset_index(drop=True)
+                self._write_table(table, merged)
+                cursors = merged[spec['cursor']].dropna() if spec['cursor'] in merged.columns else pd.Series(dtype=object)
+                table_state = {'cursor': str(cursors.max()) if not cursors.empty else cursor, 'rows': len(merged)}
+
+            table_state.setdefault('cursor', cursor)
+            table_state.setdefault('rows', 0)
+            table_state['synced_at'] = datetime.utcnow().isoformat()
+            state[table] = table_state
+        self._write_state(state)
+        return fetched
+
+    def _unmirrored_rows(self, table: str, rows: list) -> list:
+        """Rows not already in the mirror with the same key and cursor value.
+
+        The gte cursor filter always re-fetches the rows at the cursor; without this a
+        sync with no upstream changes would still rewrite the whole Parquet file.
+        """
+        spec = MIRROR_TABLES[table]
+        key, cursor = spec['key'], spec['cursor']
+        existing = self._read_table(table, columns=[key, cursor])
+        if existing is None or existing.empty:
+            return rows
+        mirrored = set(zip(existing[key].map(_cell_str), existing[cursor].map(_cell_str)))
+        return [row for row in rows if (_cell_str(row.get(key)), _cell_str(row.get(cursor))) not in mirrored]
+
+    def _read_table(self, table: str, columns: list = None):
+        path = self.table_path(table)
+        return pd.read_parquet(path, columns=columns) if path.exists() else None
+
+    def _write_table(self, table: str, df: pd.DataFrame):
+        path = self.table_path(table)
+        tmp = path.with_suffix('.tmp')
+        df.to_parquet(tmp, index=False, compression=PARQUET_COMPRESSION)
+        os.replace(tmp, path)
+        self._frames.pop(table, None)
+
+    # ----- reads -----
+
+    def load(self, table: str, columns: list = None, decode_json: bool = True) -> pd.DataFrame:
+        """A mirrored table as a DataFrame (JSON columns decoded). Empty if never synced.
+
+        Full reads are cached until the Parquet file changes.
+        """
+        path = self.table_path(table)
+        if not path.exists():
+            return pd.DataFrame(columns=columns or [])
+        if columns:
+            df = pd.read_parquet(path, columns=columns)
+        else:
+            mtime = path.stat().st_mtime_ns
+            cached = self._frames.get(table)
+            if cached and cached[0] == mtime and decode_json:
+                return cached[1]
+            df = pd.read_parquet(path)
+        if decode_json:
+            for column in MIRROR_TABLES.get(table, {}).get('json_columns', ()):
+                if column in df.columns:
+                    df[column] = df[column].astype(object).map(_decode_json_cell)
+            if not columns:
+                self._frames[table] = (mtime, df)
+        return df
+
+    def query(self, sql: str) -> pd.DataFrame:
+        """Run SQL over the mirrored tables (each available as a view by its name). Needs duckdb."""
+        if not HAS_DUCKDB:
+            raise RuntimeError("SQL on the local mirror needs the duckdb package (pip install duckdb)")
+        con = duckdb.connect()
+        try:
+            for table in MIRROR_TABLES:
+                path = self.table_path(table)
+                if path.exists():
+                    con.execute(f"CREATE VIEW {table} AS SELECT * FROM read_parquet('{path.as_posix()}')")
+            return con.execute(sql).df()
+        finally:
+            con.close()
+
+    def recently_enriched_urls(self, months: int = 6) -> list:
+        """Same result as db.get_recently_enriched_urls, read from the mirror."""
+        df = self.load('profiles', columns=['linkedin_url', 'original_url', 'enriched_at'], decode_json=False)
+        if df.empty:
+            return []
+        cutoff = pd.Timestamp(datetime.utcnow() - timedelta(days=months * 30), tz='UTC')
+        recent = df[pd.to_datetime(df['enriched_at'], utc=True, errors='coerce', format='ISO8601') >= cutoff]
+        urls = []
+        # Missing values come back from Parquet as NaN - treat them as empty
+        recent = recent[['linkedin_url', 'original_url']].astype(object).fillna('')
+        for linkedin_url, original_url in zip(recent['linkedin_url'].tolist(), recent['original_url'].tolist()):
+            if linkedin_url:
+                urls.append(linkedin_url)
+            if original_url and original_url != linkedin_url:
+                urls.append(original_url)
+        return urls
+
+    def enriched_urls(self) -> set:
+        """Same result as db.get_enriched_urls, read from the mirror."""
+        df = self.load('profiles', columns=['linkedin_url'], decode_json=False)
+        return set(normalize_linkedin_urls(df['linkedin_url'].dropna().tolist()))
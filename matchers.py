@@ -0,0 +1,169 @@
+"""
+Company Matchers for LinkedIn Enricher
+Compiled lookups for matching candidate companies and schools against filter lists.
+
+The pre-filters and priority categories used to normalize every list entry for every
+candidate row. A matcher normalizes the list once and answers each lookup with a
+handful of hash/bisect operations, giving the same results as the old loops.
+
+- CompanyMatcher: current company vs. blacklist / not-relevant / target lists
+- SchoolMatcher: education text vs. the top universities list
+"""
+
+from bisect import bisect_left
+
+import pandas as pd
+
+
+# Suffixes stripped (in this order) when normalizing company names
+COMPANY_SUFFIXES = [' ltd', ' inc', ' corp', ' llc', ' limited', ' israel', ' il',
+                    ' technologies', ' tech', ' software', ' solutions', ' group']
+
+# Names shorter than this only match exactly (no prefix matching)
+MIN_PREFIX_LEN = 4
+
+
+def normalize_company(name) -> str:
+    """Normalize company name for comparison."""
+    if pd.isna(name) or not str(name).strip():
+        return ''
+    # Lowercase and strip
+    name = str(name).lower().strip()
+    # Remove common suffixes
+    for suffix in COMPANY_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)].strip()
+    return name
+
+
+class CompanyMatcher:
+    """Match company names against a list - normalized exact match or prefix match.
+
+    A company matches an entry when, after normalize_company, they are equal, or both
+    are at least MIN_PREFIX_LEN long and one starts with the other (for cases like
+    "Bank Leumi" vs "Bank Leumi Le-Israel").
+
+    Usage:
+        matcher = CompanyMatcher(blacklist)
+        df['current_company'].map(matcher.matches)
+    """
+
+    def __init__(self, company_list):
+        normalized = {normalize_company(c) for c in company_list}
+        normalized.discard('')
+        self._exact = normalized
+        # Entries eligible for prefix matching, as a set (company starts with entry)
+        # and sorted (entry starts with company, found by bisecting to the company)
+        self._long = {c for c in normalized if len(c) >= MIN_PREFIX_LEN}
+        self._long_sorted = sorted(self._long)
+
+    def __len__(self):
+        return len(self._exact)
+
+    def matches(self, company) -> bool:
+        """Check if company matches any entry in the list."""
+        if pd.isna(company) or not str(company).strip():
+            return False
+        company_norm = normalize_company(company)
+        if not company_norm:
+            return False
+        if company_norm in self._exact:
+            return True
+        if len(company_norm) < MIN_PREFIX_LEN:
+            return False
+        # Company starts with an entry
+        for end in range(MIN_PREFIX_LEN, len(company_norm) + 1):
+            if company_norm[:end] in self._long:
+                return True
+        # An entry starts with the company
+        i = bisect_left(self._long_sorted, company_norm)
+        return i < len(self._long_sorted) and self._long_sorted[i].startswith(company_norm)
+
+    def match_series(self, series: pd.Series) -> pd.Series:
+        """Vectorized matches() over a Series - each distinct value is checked once."""
+        uniques = series.dropna().unique()
+        lookup = {value: self.matches(value) for value in uniques}
+        return series.map(lookup).fillna(False).astype(bool)
+
+
+class SchoolMatcher:
+    """Match education text against a university list, one compiled lookup per list.
+
+    The text is split into parts on ',' and '|' (one school each) and a part matches a
+    university when it equals or starts with it, when the university starts with the
+    part (parts longer than 10 chars), or, for names longer than 8 chars, when 70%+ of
+    the university's words appear in the part. This is stricter than a substring
+    search, so 'Tel Aviv University' doesn't match 'Afeka Tel Aviv College'.
+
+    With overlap_at_start=True (Filter+ rules) the word-overlap rule additionally
+    requires the part to start with the university's first word and the name to be
+    more than half the part's length.
+    """
+
+    def __init__(self, universities, min_len: int = 1, overlap_at_start: bool = False):
+        self.names = []
+        seen = set()
+        for uni in universities:
+            name = str(uni).lower().strip()
+            if len(name) < min_len or name in seen:
+                continue
+            seen.add(name)
+            self.names.append(name)
+        self._ids = {name: i for i, name in enumerate(self.names)}
+        self._min_len = max(min_len, 1)
+        self._overlap_at_start = overlap_at_start
+        self._sorted = sorted(self._ids)
+        # word -> ids of long names containing it, for the word-overlap rule
+        self._word_index = {}
+        self._word_counts = {}
+        for i, name in enumerate(self.names):
+            if len(name) > 8:
+                words = set(name.split())
+                self._word_counts[i] = len(words)
+                for word in words:
+                    self._word_index.setdefault(word, []).append(i)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _part_matches(self, part: str) -> bool:
+        # Part equals or starts with a name
+        for end in range(self._min_len, len(part) + 1):
+            if part[:end] in self._ids:
+                return True
+        # Name starts with the part (if part is substantial)
+        if len(part) > 10:
+            pos = bisect_left(self._sorted, part)
+            if pos < len(self._sorted) and self._sorted[pos].startswith(part):
+                return True
+        # 70%+ of a long name's words appear in the part
+        common = {}
+        for word in set(part.split()):
+            for i in self._word_index.get(word, ()):
+                common[i] = common.get(i, 0) + 1
+        for i, n in common.items():
+            if n >= self._word_counts[i] * 0.7:
+                if self._overlap_at_start:
+                    name = self.names[i]
+                    if not part.startswith(name.split()[0]) or len(name) / len(part) <= 0.5:
+                        continue
+                return True
+        return False
+
+    def _parts(self, text):
+        if pd.isna(text) or not str(text).strip():
+            return []
+        return [p.strip() for p in str(text).lower().replace('|', ',').split(',')]
+
+    def matches_name(self, school: str) -> bool:
+        """True if a single (already split, lowercased) school name matches a university."""
+        return self._part_matches(school)
+
+    def matches(self, text) -> bool:
+        """True if any part of the education text matches a university."""
+        return any(self._part_matches(part) for part in self._parts(text))
+
+    def match_series(self, series: pd.Series) -> pd.Series:
+        """Vectorized matches() over a Series - each distinct value is checked once."""
+        lookup = {value: self.matches(value) for value in series.dropna().unique()}
+        return series.map(lookup).fillna(False).astype(bool)
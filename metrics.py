@@ -0,0 +1,215 @@
+"""
+In-process Metrics for LinkedIn Enricher
+Counters and latency histograms per provider/operation, kept in memory.
+
+UsageTracker persists individual calls to Supabase for billing; this module answers
+"which stage is slow right now" without querying the DB. One registry is shared by
+every Streamlit session in the server process.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+
+# Histogram bucket upper bounds in milliseconds (Prometheus-style, cumulative)
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000)
+
+# Recent samples kept per series for exact percentiles
+SAMPLE_WINDOW = 2048
+
+# Optional path for the Prometheus textfile (node_exporter textfile collector format)
+METRICS_TEXTFILE_ENV = 'METRICS_TEXTFILE'
+
+
+class _Series:
+    """Stats for one (provider, operation) pair."""
+
+    __slots__ = ('count', 'errors', 'bytes_in', 'bytes_out', 'latency_sum_ms',
+                 'bucket_counts', 'samples')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.latency_sum_ms = 0.0
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS_MS)
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return float(sorted_values[max(0, min(rank, len(sorted_values)) - 1)])
+
+
+class MetricsRegistry:
+    """Thread-safe registry of call counters and latency histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+        self.started_at = time.time()
+
+    def record(
+        self,
+        provider: str,
+        operation: str,
+        elapsed_ms: float,
+        status: str = 'success',
+        bytes_in: int = 0,
+        bytes_out: int = 0
+    ) -> None:
+        """Record one completed call.
+
+        Args:
+            provider: API provider or subsystem (crustdata, openai, salesql, phantombuster, supabase)
+            operation: Operation type (enrich, screen, email_lookup, launch, select, ...)
+            elapsed_ms: Wall-clock duration of the call in milliseconds
+            status: 'success' or 'error'
+            bytes_in: Response payload size
+            bytes_out: Request payload size
+        """
+        key = (provider.lower(), operation)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.count += 1
+            if status == 'error':
+                series.errors += 1
+            series.bytes_in += bytes_in or 0
+            series.bytes_out += bytes_out or 0
+            series.latency_sum_ms += elapsed_ms
+            series.samples.append(elapsed_ms)
+            for i, bound in enumerate(LATENCY_BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    series.bucket_counts[i] += 1
+                    break
+
+    def snapshot(self) -> list[dict]:
+        """Summarize every series as a list of dicts (one row per provider/operation)."""
+        with self._lock:
+            items = [(key, s.count, s.errors, s.bytes_in, s.bytes_out, s.latency_sum_ms, sorted(s.samples))
+                     for key, s in self._series.items()]
+
+        rows = []
+        for (provider, operation), count, errors, bytes_in, bytes_out, latency_sum, samples in sorted(items):
+            rows.append({
+                'provider': provider,
+                'operation': operation,
+                'calls': count,
+                'errors': errors,
+                'error_rate': errors / count if count else 0.0,
+                'avg_ms': latency_sum / count if count else 0.0,
+                'p50_ms': _percentile(samples, 50),
+                'p95_ms': _percentile(samples, 95),
+                'p99_ms': _percentile(samples, 99),
+                'bytes_in': bytes_in,
+                'bytes_out': bytes_out,
+            })
+        return rows
+
+    def to_prometheus(self) -> str:
+        """Render all series in the Prometheus text exposition format."""
+        with self._lock:
+            items = [(key, s.count, s.errors, s.bytes_in, s.bytes_out, s.latency_sum_ms, list(s.bucket_counts))
+                     for key, s in self._series.items()]
+
+        lines = [
+            '# HELP enricher_calls_total API calls by provider and operation.',
+            '# TYPE enricher_calls_total counter',
+        ]
+        for (provider, operation), count, *_ in sorted(items):
+            lines.append(f'enricher_calls_total{{provider="{provider}",operation="{operation}"}} {count}')
+
+        lines += ['# HELP enricher_errors_total Failed API calls.', '# TYPE enricher_errors_total counter']
+        for (provider, operation), _, errors, *_ in sorted(items):
+            lines.append(f'enricher_errors_total{{provider="{provider}",operation="{operation}"}} {errors}')
+
+        lines += ['# HELP enricher_bytes_total Payload bytes by direction.', '# TYPE enricher_bytes_total counter']
+        for (provider, operation), _, _, bytes_in, bytes_out, *_ in sorted(items):
+            labels = f'provider="{provider}",operation="{operation}"'
+            lines.append(f'enricher_bytes_total{{{labels},direction="in"}} {bytes_in}')
+            lines.append(f'enricher_bytes_total{{{labels},direction="out"}} {bytes_out}')
+
+        lines += ['# HELP enricher_latency_ms API call latency in milliseconds.', '# TYPE enricher_latency_ms histogram']
+        for (provider, operation), count, _, _, _, latency_sum, buckets in sorted(items):
+            labels = f'provider="{provider}",operation="{operation}"'
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS_MS, buckets):
+                cumulative += n
+                lines.append(f'enricher_latency_ms_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'enricher_latency_ms_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'enricher_latency_ms_sum{{{labels}}} {latency_sum:.1f}')
+            lines.append(f'enricher_latency_ms_count{{{labels}}} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus_file(self, path: str = None) -> Optional[Path]:
+        """Write the Prometheus text to a file (atomic rename).
+
+        Uses METRICS_TEXTFILE env var when path is not given. Returns the path written,
+        or None if no path is configured.
+        """
+        path = path or os.environ.get(METRICS_TEXTFILE_ENV)
+        if not path:
+            return None
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(target.suffix + '.tmp')
+        tmp.write_text(self.to_prometheus(), encoding='utf-8')
+        os.replace(tmp, target)
+        return target
+
+    def reset(self) -> None:
+        """Clear all series."""
+        with self._lock:
+            self._series.clear()
+            self.started_at = time.time()
+
+
+# Process-wide registry shared by all sessions
+registry = MetricsRegistry()
+
+
+def record_call(provider: str, operation: str, elapsed_ms: float, status: str = 'success',
+                bytes_in: int = 0, bytes_out: int = 0) -> None:
+    """Record a call on the shared registry. Never raises."""
+    try:
+        registry.record(provider, operation, elapsed_ms, status=status, bytes_in=bytes_in, bytes_out=bytes_out)
+    except Exception as e:
+        print(f"[Metrics] Failed to record {provider}/{operation}: {e}")
+
+
+@contextmanager
+def timed_call(provider: str, operation: str):
+    """Context manager that times a block and records it on the shared registry.
+
+    The yielded dict can be updated with 'status', 'bytes_in' and 'bytes_out'.
+    Exceptions are recorded as errors and re-raised.
+
+    Usage:
+        with timed_call('openai', 'screen') as call:
+            response = client.chat.completions.create(...)
+            call['bytes_in'] = len(response.choices[0].message.content)
+    """
+    call = {'status': 'success', 'bytes_in': 0, 'bytes_out': 0}
+    start_time = time.time()
+    try:
+        yield call
+    except Exception:
+        call['status'] = 'error'
+        raise
+    finally:
+        elapsed_ms = (time.time() - start_time) * 1000
+        record_call(provider, operation, elapsed_ms, status=call['status'],
+                    bytes_in=call['bytes_in'], bytes_out=call['bytes_out'])
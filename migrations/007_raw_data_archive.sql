@@ -0,0 +1,52 @@
+-- Migration: Slim raw_data + compressed archive of full Crustdata responses
+-- profiles.raw_data holds the full Crustdata response, including logos, internal IDs
+-- and company domains that nothing reads (AI screening strips them too), and every
+-- select('*') ships all of it. With the opt-in 'slim' storage mode save_enriched_profile
+-- stores a slim projection in raw_data (db.slim_raw_data); 'archive' also keeps the
+-- full response, zlib-compressed, in a separate table - so profile reads never fetch
+-- it unless asked (db.get_profile_raw_archive). The default ('full') is unchanged.
+--
+-- Run in Supabase SQL Editor
+
+-- Full responses, base64(zlib(JSON)), one row per profile
+CREATE TABLE IF NOT EXISTS profile_raw_archive (
+  linkedin_url TEXT PRIMARY KEY REFERENCES profiles(linkedin_url) ON DELETE CASCADE,
+  raw_data_z TEXT NOT NULL,
+  raw_bytes INTEGER,
+  archived_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Same projection as db.slim_raw_data: drop the unused fields at the top level and
+-- inside employer/education entries
+CREATE OR REPLACE FUNCTION slim_raw_data(raw JSONB)
+RETURNS JSONB
+LANGUAGE sql IMMUTABLE AS $$
+  SELECT CASE
+    WHEN raw IS NULL OR jsonb_typeof(raw) <> 'object' THEN raw
+    ELSE (raw - ARRAY[
+            'employer_logo_url',
+            'employer_company_website_domain', 'domains',
+            'employer_company_id', 'employee_position_id', 'employer_linkedin_id',
+            'background_picture_permalink'])
+      || COALESCE((
+        SELECT jsonb_object_agg(key, (
+          SELECT COALESCE(jsonb_agg(
+            CASE WHEN jsonb_typeof(elem) = 'object' THEN elem - ARRAY[
+              'employer_logo_url',
+              'employer_company_website_domain', 'domains',
+              'employer_company_id', 'employee_position_id', 'employer_linkedin_id',
+              'background_picture_permalink']
+            ELSE elem END
+            ORDER BY ord), '[]'::jsonb)
+          FROM jsonb_array_elements(value) WITH ORDINALITY AS t(elem, ord)
+        ))
+        FROM jsonb_each(raw)
+        WHERE key IN ('current_employers', 'past_employers', 'education_background')
+          AND jsonb_typeof(value) = 'array'
+      ), '{}'::jsonb)
+  END
+$$;
+
+-- Optional: trim rows saved before this migration. The dropped fields are gone
+-- afterwards (archive them first from Python if you need the originals).
+-- UPDATE profiles SET raw_data = slim_raw_data(raw_data) WHERE raw_data IS NOT NULL;
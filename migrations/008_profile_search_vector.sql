@@ -0,0 +1,85 @@
+-- Migration: Full-text search over profiles
+-- search_profiles ran ilike '%q%' queries on current_company and first_name, which
+-- can't use an index and never looked at titles, skills or schools. This adds a
+-- generated tsvector column (GIN-indexed) over name, headline, titles, employers,
+-- schools and skills, and a function returning matches most relevant first.
+--
+-- Called via PostgREST: POST /rest/v1/rpc/search_profiles_ranked {"query": ..., "max_results": ...}
+-- (db.search_profiles_ranked; select= picks the returned columns)
+--
+-- Run in Supabase SQL Editor
+
+-- Weighted search document: A = name, B = headline/current position,
+-- C = all titles and employers, D = schools and skills.
+-- 'simple' config (no stemming) - the text is mostly names of people, companies and
+-- schools; prefix matching in the query covers engineer/engineering.
+CREATE OR REPLACE FUNCTION profile_search_vector(
+  raw JSONB, title TEXT, company TEXT,
+  titles TEXT[], employers TEXT[], schools TEXT[], skill_list TEXT[]
+)
+RETURNS tsvector
+LANGUAGE sql IMMUTABLE AS $$
+  SELECT setweight(to_tsvector('simple', COALESCE(raw->>'name', '')), 'A')
+      || setweight(to_tsvector('simple', concat_ws(' ', raw->>'headline', title, company)), 'B')
+      || setweight(to_tsvector('simple', concat_ws(' ', array_to_string(titles, ' '), array_to_string(employers, ' '))), 'C')
+      || setweight(to_tsvector('simple', concat_ws(' ', array_to_string(schools, ' '), array_to_string(skill_list, ' '))), 'D')
+$$;
+
+-- Generated column: kept up to date on every insert/update, filled for existing
+-- rows when the column is added
+ALTER TABLE profiles ADD COLUMN IF NOT EXISTS search_vector tsvector
+  GENERATED ALWAYS AS (profile_search_vector(
+    raw_data, current_title, current_company, all_titles, all_employers, all_schools, skills
+  )) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_profiles_search_vector ON profiles USING GIN (search_vector);
+
+-- Search query: every word of the input must match as a prefix. The words are the
+-- lexemes of to_tsvector('simple', query) - the same parser as the document - so
+-- 'monday.com' stays one word just like in the profile, and tsquery operators in
+-- the input are plain text. NULL for an empty query.
+CREATE OR REPLACE FUNCTION profile_search_query(query TEXT)
+RETURNS tsquery
+LANGUAGE sql IMMUTABLE AS $$
+  SELECT string_agg(
+           '''' || replace(replace(lexeme, '\', '\\'), '''', '''''') || ''':*', ' & '
+         )::tsquery
+  FROM unnest(to_tsvector('simple', COALESCE(query, ''))) AS t(lexeme, positions, weights)
+$$;
+
+-- Best rank first, newest on ties
+CREATE OR REPLACE FUNCTION search_profiles_ranked(query TEXT, max_results INT DEFAULT 100)
+RETURNS SETOF profiles
+LANGUAGE sql STABLE AS $$
+  WITH q AS (
+    SELECT profile_search_query(query) AS tsq
+  )
+  SELECT p.*
+  FROM profiles p, q
+  WHERE q.tsq IS NOT NULL AND p.search_vector @@ q.tsq
+  ORDER BY ts_rank(p.search_vector, q.tsq) DESC, p.enriched_at DESC NULLS LAST
+  LIMIT max_results
+$$;
+
+-- Self-check: queries must match documents built by profile_search_vector
+DO $$
+DECLARE
+  doc tsvector := profile_search_vector(
+    '{"name": "Noa Cohen", "headline": "Software Engineer at Monday.com"}'::jsonb,
+    'Software Engineer', 'Monday.com',
+    ARRAY['Software Engineer'], ARRAY['Monday.com', 'O''Reilly Media'],
+    ARRAY['Tel Aviv University'], ARRAY['c++', 'python']);
+BEGIN
+  -- Dotted company name: one lexeme in the document, so one word in the query
+  ASSERT doc @@ profile_search_query('monday.com'), 'monday.com';
+  ASSERT doc @@ profile_search_query('Monday.com engineer'), 'Monday.com engineer';
+  ASSERT doc @@ profile_search_query('monday'), 'monday (prefix of monday.com)';
+  ASSERT doc @@ profile_search_query('engineer'), 'engineer';
+  ASSERT doc @@ profile_search_query('tel aviv'), 'tel aviv';
+  ASSERT doc @@ profile_search_query('o''reilly'), 'o''reilly';
+  ASSERT doc @@ profile_search_query('c++ & !python'), 'operators are text';
+  ASSERT NOT doc @@ profile_search_query('wix.com'), 'wix.com must not match';
+  ASSERT NOT doc @@ profile_search_query('monday.com designer'), 'every word must match';
+  ASSERT profile_search_query('') IS NULL AND profile_search_query(' .,; ') IS NULL, 'empty query';
+END
+$$;
@@ -12,9 +12,12 @@ All normalization logic lives here. Both dashboard.py and db.py import from this
 import re
 import json
 import math
+from functools import lru_cache
 from typing import Optional, Any
 from datetime import datetime
 
+import pandas as pd
+
 # ============================================================================
 # FIELD MAPPING DOCUMENTATION
 # ============================================================================
@@ -109,7 +112,6 @@ def is_nan_or_none(value: Any) -> bool:
 
     # Try pandas isna
     try:
-        import pandas as pd
         if pd.isna(value):
             return True
     except (ImportError, TypeError, ValueError):
@@ -167,6 +169,10 @@ def get_first_valid(data: dict, field_names: list) -> Any:
 # URL NORMALIZATION
 # ============================================================================
 
+# Distinct URLs remembered by normalize_linkedin_url (about 10 MB at this size)
+URL_CACHE_SIZE = 65536
+
+
 def normalize_linkedin_url(url: str) -> Optional[str]:
     """
     Normalize LinkedIn URL to canonical format for consistent matching.
@@ -178,12 +184,20 @@ def normalize_linkedin_url(url: str) -> Optional[str]:
     - Convert to lowercase
     - Validate it's a regular profile URL (not Sales Navigator, company, etc.)
 
-    Returns None if URL is invalid.
+    Returns None if URL is invalid. Results are cached per URL string (bounded LRU);
+    use normalize_linkedin_urls for whole columns.
     """
+    if isinstance(url, str):
+        return _normalize_url_text(url)
     if is_nan_or_none(url):
         return None
+    return _normalize_url_text(str(url))
 
-    url = str(url).strip()
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _normalize_url_text(url: str) -> Optional[str]:
+    """normalize_linkedin_url for a string value."""
+    url = url.strip()
     if not url:
         return None
 
@@ -221,6 +235,42 @@ def normalize_linkedin_url(url: str) -> Optional[str]:
     return url
 
 
+def normalize_linkedin_urls(urls):
+    """
+    Vectorized normalize_linkedin_url over a Series or list of URLs.
+
+    Applies the same transformations with pandas string operations in one pass over
+    the column. Returns an object Series (aligned to the input Series' index) holding
+    the normalized URL, or None where the URL is missing or invalid.
+    """
+    values = urls if isinstance(urls, pd.Series) else pd.Series(list(urls), dtype=object)
+    present = values.notna().to_numpy()
+    text = values.astype('str')
+
+    url = text.str.strip()
+    # Add protocol if missing (covers www. too)
+    url = url.where(url.str.startswith('http', na=True), 'https://' + url)
+    # Remove query parameters
+    url = url.str.replace(r'(?s)\?.*', '', regex=True)
+    # Normalize www prefix, trailing slashes, case
+    url = url.str.replace('://linkedin.com', '://www.linkedin.com', regex=False)
+    url = url.str.rstrip('/').str.lower()
+
+    # Profile URLs only: linkedin.com, /in/, not Sales Navigator
+    valid = (url.str.contains('linkedin.com', regex=False, na=False)
+             & url.str.contains('/in/', regex=False, na=False)
+             & ~url.str.contains('/sales/', regex=False, na=False)).to_numpy()
+    normalized = url.astype(object).to_numpy(copy=True)
+    normalized[~(present & valid)] = None
+
+    # The string kernels strip/lowercase like Python only for printable ASCII -
+    # anything else (accents, tabs, 'İ', ...) goes through the scalar normalizer
+    special = present & ~text.str.fullmatch(r'[\x20-\x7e]*', na=False).to_numpy()
+    if special.any():
+        normalized[special] = [_normalize_url_text(v) for v in text.to_numpy()[special]]
+    return pd.Series(normalized, index=values.index, dtype=object)
+
+
 def extract_linkedin_url(data: dict, field_map: dict = None) -> Optional[str]:
     """
     Extract and normalize LinkedIn URL from data using field map.
@@ -382,10 +432,159 @@ def normalize_phantombuster_profile(raw: dict) -> Optional[dict]:
     }
 
 
+def _clean_cell(value: Any) -> Any:
+    """clean_dict's rule for one value: nested dicts/lists cleaned, None = dropped."""
+    if isinstance(value, dict):
+        return clean_dict(value)
+    if isinstance(value, list):
+        return [clean_value(v) for v in value if not is_nan_or_none(v)]
+    return clean_value(value)
+
+
+def _clean_column(values: list) -> list:
+    """_clean_cell over a column - each distinct value is cleaned once."""
+    cache = {}
+    cleaned = []
+    for value in values:
+        if value is None or (type(value) is float and value != value):
+            cleaned.append(None)
+            continue
+        key = (type(value), value)
+        try:
+            result = cache[key]
+        except KeyError:
+            result = cache[key] = _clean_cell(value)
+        except TypeError:  # unhashable (dict/list)
+            result = _clean_cell(value)
+        cleaned.append(result)
+    return cleaned
+
+
+def _is_valid(value: Any) -> bool:
+    """not is_nan_or_none, for an already cleaned value."""
+    return value is not None and (type(value) is str or not is_nan_or_none(value))
+
+
+def phantombuster_display_df(df):
+    """
+    Display DataFrame for a PhantomBuster export, normalized column by column.
+
+    Same result as running normalize_phantombuster_profile on every row and building
+    the display record: rows with a LinkedIn URL get the display fields plus
+    raw_phantombuster (the cleaned row); rows without one are kept as-is with
+    linkedin_url set to None. Each column is cleaned once (repeated values once).
+    """
+    n = len(df)
+    if not n:
+        return pd.DataFrame()
+
+    # Cleaned columns (duplicate column names: the last one wins, like to_dict)
+    cleaned = {}
+    for i, column in enumerate(df.columns):
+        cleaned[column] = _clean_column(df.iloc[:, i].tolist())
+
+    def first_valid(names):
+        result = [None] * n
+        for name in names:
+            values = cleaned.get(name)
+            if values is not None:
+                result = [r if r is not None else (v if _is_valid(v) else None) for r, v in zip(result, values)]
+        return result
+
+    # LinkedIn URL: first URL field that normalizes, else the first usable publicIdentifier
+    urls = [None] * n
+    for name in PHANTOMBUSTER_FIELD_MAP['linkedin_url']:
+        values = cleaned.get(name)
+        if values is not None:
+            urls = [u if u is not None or not v else normalize_linkedin_url(v) for u, v in zip(urls, values)]
+    decided = [u is not None for u in urls]
+    for name in PHANTOMBUSTER_FIELD_MAP['public_identifier']:
+        values = cleaned.get(name)
+        if values is None:
+            continue
+        for i, public_id in enumerate(values):
+            if not decided[i] and public_id and public_id != 'null' and not is_nan_or_none(public_id):
+                urls[i] = normalize_linkedin_url(f"https://www.linkedin.com/in/{public_id}")
+                decided[i] = True
+
+    first_names = first_valid(PHANTOMBUSTER_FIELD_MAP['first_name'])
+    last_names = first_valid(PHANTOMBUSTER_FIELD_MAP['last_name'])
+    full_names = first_valid(PHANTOMBUSTER_FIELD_MAP['full_name'])
+    for i in range(n):
+        if first_names[i] is None and last_names[i] is None:
+            first_names[i], last_names[i] = parse_full_name(full_names[i])
+
+    durations = {}
+
+    def years(values):
+        result = []
+        for value in values:
+            key = (type(value), value) if isinstance(value, (str, int, float)) else None
+            if key is None:
+                result.append(parse_duration(value))
+            else:
+                if key not in durations:
+                    durations[key] = parse_duration(value)
+                result.append(durations[key])
+        return result
+
+    def text(values):
+        return [v or '' for v in values]
+
+    def raw_text(name):
+        return text(cleaned.get(name) or [None] * n)
+
+    columns = list(cleaned)
+    display = {
+        'name': [f"{f or ''} {l or ''}".strip() or 'Unknown' for f, l in zip(first_names, last_names)],
+        'first_name': text(first_names),
+        'last_name': text(last_names),
+        'current_company': text(first_valid(PHANTOMBUSTER_FIELD_MAP['current_company'])),
+        'current_title': text(first_valid(PHANTOMBUSTER_FIELD_MAP['current_title'])),
+        'headline': text(first_valid(PHANTOMBUSTER_FIELD_MAP['headline'])),
+        'location': text(first_valid(['location'])),
+        'linkedin_url': text(urls),
+        'summary': text(first_valid(['summary'])),
+        'title_description': raw_text('titleDescription'),
+        'industry': raw_text('industry'),
+        'company_location': raw_text('companyLocation'),
+        'current_years_in_role': years(first_valid(PHANTOMBUSTER_FIELD_MAP['duration_in_role'])),
+        'current_years_at_company': years(first_valid(PHANTOMBUSTER_FIELD_MAP['duration_at_company'])),
+        'raw_phantombuster': [{k: v for k, v in zip(columns, row) if v is not None}
+                              for row in zip(*(cleaned[c] for c in columns))],
+    }
+
+    valid = [u is not None for u in urls]
+    if all(valid):
+        return pd.DataFrame(display)
+
+    # Rows without a URL keep their original columns - build row by row like before
+    invalid = df.iloc[[i for i in range(n) if not valid[i]]].to_dict('records')
+    invalid_rows = iter(invalid)
+    keys = list(display)
+    records = []
+    for i in range(n):
+        if valid[i]:
+            records.append({key: display[key][i] for key in keys})
+        else:
+            raw = next(invalid_rows)
+            raw['linkedin_url'] = None
+            records.append(raw)
+    return pd.DataFrame(records)
+
+
 # ============================================================================
 # CRUSTDATA NORMALIZATION
 # ============================================================================
 
+# Top-level response keys read by normalize_crustdata_profile (only these are cleaned)
+CRUSTDATA_READ_KEYS = tuple(dict.fromkeys(
+    [field for fields in CRUSTDATA_FIELD_MAP.values() for field in fields]
+    + ['publicIdentifier', 'current_employers', 'title', 'headline', 'company', 'company_name',
+       'skills', 'past_employers', 'all_employers', 'all_titles', 'all_schools']
+))
+
+
 def normalize_crustdata_profile(raw: dict, original_url: str = None) -> Optional[dict]:
     """
     Normalize a Crustdata API response to canonical format.
@@ -393,6 +592,9 @@ def normalize_crustdata_profile(raw: dict, original_url: str = None) -> Optional
     Input: Raw Crustdata API response dict
     Output: Canonical profile dict ready for Supabase, or None if invalid
 
+    The response is not copied or modified: only the fields read here are cleaned,
+    and raw_crustdata references the input dict itself.
+
     Args:
         raw: The Crustdata API response for a single profile
         original_url: The LinkedIn URL we sent to the API (for matching)
@@ -400,19 +602,11 @@ def normalize_crustdata_profile(raw: dict, original_url: str = None) -> Optional
     if not raw:
         return None
 
-    # Keep original raw data before any modifications
-    import copy
-    original_raw = copy.deepcopy(raw)
-
-    # Store original URL if provided (for matching back)
-    if original_url:
-        raw['_original_linkedin_url'] = original_url
-
-    # Clean the input
-    raw = clean_dict(raw)
+    # Clean the fields we read (same rules as cleaning the whole response)
+    fields = clean_dict({key: raw[key] for key in CRUSTDATA_READ_KEYS if key in raw})
 
     # Extract LinkedIn URL
-    linkedin_url = extract_linkedin_url(raw, CRUSTDATA_FIELD_MAP)
+    linkedin_url = extract_linkedin_url(fields, CRUSTDATA_FIELD_MAP)
     if not linkedin_url and original_url:
         linkedin_url = normalize_linkedin_url(original_url)
 
@@ -420,24 +614,24 @@ def normalize_crustdata_profile(raw: dict, original_url: str = None) -> Optional
         return None
 
     # Extract name
-    first_name = get_first_valid(raw, CRUSTDATA_FIELD_MAP['first_name'])
-    last_name = get_first_valid(raw, CRUSTDATA_FIELD_MAP['last_name'])
+    first_name = get_first_valid(fields, CRUSTDATA_FIELD_MAP['first_name'])
+    last_name = get_first_valid(fields, CRUSTDATA_FIELD_MAP['last_name'])
 
     # Fallback to full name parsing
     if not first_name and not last_name:
-        full_name = get_first_valid(raw, CRUSTDATA_FIELD_MAP['full_name'])
+        full_name = get_first_valid(fields, CRUSTDATA_FIELD_MAP['full_name'])
         first_name, last_name = parse_full_name(full_name)
 
     # Basic fields
-    headline = get_first_valid(raw, CRUSTDATA_FIELD_MAP['headline'])
-    location = get_first_valid(raw, CRUSTDATA_FIELD_MAP['location'])
-    summary = get_first_valid(raw, CRUSTDATA_FIELD_MAP['summary'])
+    headline = get_first_valid(fields, CRUSTDATA_FIELD_MAP['headline'])
+    location = get_first_valid(fields, CRUSTDATA_FIELD_MAP['location'])
+    summary = get_first_valid(fields, CRUSTDATA_FIELD_MAP['summary'])
 
     # Extract current position from current_employers array (Crustdata format)
     current_title = None
     current_company = None
 
-    current_employers = raw.get('current_employers', [])
+    current_employers = fields.get('current_employers', [])
     if current_employers and isinstance(current_employers, list) and len(current_employers) > 0:
         emp = current_employers[0]
         if isinstance(emp, dict):
@@ -446,12 +640,12 @@ def normalize_crustdata_profile(raw: dict, original_url: str = None) -> Optional
 
     # Fallback to top-level fields
     if not current_title:
-        current_title = raw.get('title') or raw.get('headline', '').split(' at ')[0] if ' at ' in raw.get('headline', '') else raw.get('title')
+        current_title = fields.get('title') or fields.get('headline', '').split(' at ')[0] if ' at ' in fields.get('headline', '') else fields.get('title')
     if not current_company:
-        current_company = raw.get('company') or raw.get('company_name')
+        current_company = fields.get('company') or fields.get('company_name')
 
     # Skills - convert array to comma-separated string
-    skills = raw.get('skills', [])
+    skills = fields.get('skills', [])
     if isinstance(skills, list):
         skills_str = ', '.join(str(s) for s in skills[:50] if s)
     elif skills:
@@ -460,7 +654,7 @@ def normalize_crustdata_profile(raw: dict, original_url: str = None) -> Optional
         skills_str = None
 
     # Past positions - format work history for preview
-    past_employers = raw.get('past_employers', [])
+    past_employers = fields.get('past_employers', [])
     past_positions_parts = []
     for emp in past_employers[:10]:  # Limit to 10
         if isinstance(emp, dict):
@@ -473,19 +667,19 @@ def normalize_crustdata_profile(raw: dict, original_url: str = None) -> Optional
     past_positions_str = ' | '.join(past_positions_parts) if past_positions_parts else None
 
     # Pre-flattened arrays from Crustdata (convert to comma-separated for display)
-    all_employers = raw.get('all_employers', [])
+    all_employers = fields.get('all_employers', [])
     all_employers_str = ', '.join(str(x) for x in all_employers if x) if isinstance(all_employers, list) else None
 
-    all_titles = raw.get('all_titles', [])
+    all_titles = fields.get('all_titles', [])
     all_titles_str = ', '.join(str(x) for x in all_titles if x) if isinstance(all_titles, list) else None
 
-    all_schools = raw.get('all_schools', [])
+    all_schools = fields.get('all_schools', [])
     all_schools_str = ', '.join(str(x) for x in all_schools if x) if isinstance(all_schools, list) else None
 
     # Other fields
-    connections = get_first_valid(raw, CRUSTDATA_FIELD_MAP['connections'])
-    followers = get_first_valid(raw, CRUSTDATA_FIELD_MAP['followers'])
-    profile_pic = get_first_valid(raw, CRUSTDATA_FIELD_MAP['profile_pic'])
+    connections = get_first_valid(fields, CRUSTDATA_FIELD_MAP['connections'])
+    followers = get_first_valid(fields, CRUSTDATA_FIELD_MAP['followers'])
+    profile_pic = get_first_valid(fields, CRUSTDATA_FIELD_MAP['profile_pic'])
 
     # Combine name for display
     name = f"{first_name or ''} {last_name or ''}".strip() or None
@@ -506,7 +700,7 @@ def normalize_crustdata_profile(raw: dict, original_url: str = None) -> Optional
         'all_schools': all_schools_str,
         'past_positions': past_positions_str,
         'connections_count': connections,
-        'raw_crustdata': original_raw,  # Keep original unmodified data
+        'raw_crustdata': raw,  # Original response (not copied)
     }
 
 
@@ -586,8 +780,6 @@ def profiles_to_display_df(profiles: list[dict]):
     """
     Convert list of canonical profiles to a pandas DataFrame for display.
     """
-    import pandas as pd
-
     if not profiles:
         return pd.DataFrame()
 
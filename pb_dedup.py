@@ -170,13 +170,13 @@ def filter_results_against_database(df: pd.DataFrame, url_column: str = None) ->
         # Get all URLs from database
         db_urls = set(get_all_linkedin_urls(client))
 
-        # Normalize URLs for comparison
-        from normalizers import normalize_linkedin_url as normalize
+        # Normalize URLs for comparison (one vectorized pass per side)
+        from normalizers import normalize_linkedin_urls
 
-        db_urls_normalized = {normalize(u) for u in db_urls if normalize(u)}
+        db_urls_normalized = set(normalize_linkedin_urls(list(db_urls)).dropna())
 
         # Filter out profiles already in database
-        mask = ~df[url_column].apply(lambda x: (normalize(x) or '') in db_urls_normalized)
+        mask = ~normalize_linkedin_urls(df[url_column]).isin(db_urls_normalized)
         filtered_df = df[mask].copy()
 
         filtered_count = original_count - len(filtered_df)
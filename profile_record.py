@@ -0,0 +1,169 @@
+"""
+Profile Record for LinkedIn Enricher
+Compact in-memory profile for the screening pipeline.
+
+The screening tab used to turn the candidates DataFrame into one dict per row
+(to_dict('records')), copying every cell - including long text such as summaries
+and past_positions JSON - out of the DataFrame that session state already holds.
+ProfileRecord keeps only the identity fields in __slots__ and reads every other
+column from the source frame when asked:
+- short repeated strings (companies, titles, locations) are interned, so every
+  profile at "Google" points at the same string - across sessions too
+- raw_crustdata / raw_data are stored by reference, never copied
+- other columns stay in the DataFrame's own (Arrow) storage until read
+
+Records behave like the dicts they replace (get, [], in, keys, items, assignment),
+so the screening code keeps using profile.get(...) and profile['raw_data'] = ...
+
+Usage:
+    profiles = records_from_df(candidates_df)
+    profiles[0].get('current_company')
+"""
+
+import sys
+from collections.abc import MutableMapping
+
+
+# Strings up to this length are interned (names, titles, companies, schools)
+INTERN_MAX_LEN = 80
+
+# Marks a source column deleted from one record
+_DELETED = object()
+
+
+def intern_text(value):
+    """sys.intern short strings; anything else is returned unchanged."""
+    if type(value) is str and len(value) <= INTERN_MAX_LEN:
+        return sys.intern(value)
+    return value
+
+
+class ProfileRecord(MutableMapping):
+    """Dict-compatible profile: slots for identity fields, the rest read from a shared source.
+
+    An unset slot means the key is absent (KeyError / get() default), like a dict.
+    Values assigned to other keys are kept per record and shadow the source.
+    """
+
+    FIELDS = (
+        'linkedin_url', 'name', 'first_name', 'last_name', 'headline', 'location',
+        'current_title', 'current_company', 'education', 'connections_count',
+        'raw_crustdata', 'raw_data',
+    )
+    __slots__ = FIELDS + ('_source', '_pos', '_extra')
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(self, data=None, source: dict = None, pos: int = 0):
+        """
+        Args:
+            data: Initial key/value pairs
+            source: Shared {column: array} the record reads other keys from
+            pos: This record's row position in the source arrays
+        """
+        self._source = source
+        self._pos = pos
+        self._extra = None
+        for key, value in (data or {}).items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        if key in self._FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            value = self._extra[key]
+            if value is _DELETED:
+                raise KeyError(key)
+            return value
+        if self._source is not None and key in self._source:
+            return self._source[key][self._pos]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._FIELD_SET:
+            setattr(self, key, intern_text(value))
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = intern_text(value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key in self._FIELD_SET:
+            delattr(self, key)
+        elif self._source is not None and key in self._source:
+            self[key] = _DELETED
+        else:
+            del self._extra[key]
+
+    def __iter__(self):
+        for key in self.FIELDS:
+            if hasattr(self, key):
+                yield key
+        for key in self._source or ():
+            if key not in self._FIELD_SET and (self._extra is None or key not in self._extra):
+                yield key
+        for key, value in list((self._extra or {}).items()):
+            if value is not _DELETED:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        if key in self._FIELD_SET:
+            return hasattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key] is not _DELETED
+        return self._source is not None and key in self._source
+
+    def __repr__(self):
+        return f"ProfileRecord({self.to_dict()!r})"
+
+    @property
+    def raw(self) -> dict:
+        """The profile's raw Crustdata response (shared, not a copy)."""
+        return self.get('raw_crustdata') or self.get('raw_data') or {}
+
+    def to_dict(self) -> dict:
+        """Plain dict with every key materialized (raw data is still shared)."""
+        return dict(self.items())
+
+
+class _ColumnValues:
+    """Row access to one DataFrame column, converting a cell to a Python value on read."""
+
+    __slots__ = ('_array',)
+
+    def __init__(self, series):
+        self._array = series.array
+
+    def __getitem__(self, pos):
+        value = self._array[pos]
+        # numpy/pandas scalars -> the Python values to_dict('records') gives
+        return value.item() if hasattr(value, 'item') and not isinstance(value, (dict, list)) else value
+
+
+def records_from_df(df) -> list[ProfileRecord]:
+    """One ProfileRecord per DataFrame row - the compact form of to_dict('records').
+
+    Identity fields are copied into the records; other columns are read from the
+    frame's column arrays on access (taken now, so later changes to df don't leak in).
+    """
+    columns = [str(c) for c in df.columns]
+    source = {}
+    slot_values = []
+    for i, key in enumerate(columns):
+        if key in ProfileRecord._FIELD_SET:
+            slot_values.append((key, df.iloc[:, i].tolist()))
+        else:
+            source[key] = _ColumnValues(df.iloc[:, i])
+
+    records = [ProfileRecord(source=source, pos=pos) for pos in range(len(df))]
+    for key, values in slot_values:
+        for record, value in zip(records, values):
+            record[key] = value
+    return records
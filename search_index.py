@@ -0,0 +1,127 @@
+"""
+Search Index for LinkedIn Enricher
+Per-dataset lookup structures for the Filter+ tab.
+
+Filter+ used to rebuild a lowercase text per row (and re-parse list columns) with
+df.apply(axis=1) on every "Apply Filters" click. ProfileSearchIndex builds these once
+per enriched DataFrame and answers each filter with vectorized lookups, so changing
+the keywords or lists and filtering again doesn't touch the per-row data:
+- keyword filters: one lowercase search text per row (str.contains)
+- employer/school filters: an exploded (row, item) index of the list column (isin)
+
+The dashboard caches one index per session, rebuilt when the enriched DataFrame's
+fingerprint changes (see _get_search_index in dashboard.py).
+"""
+
+import json
+
+import pandas as pd
+
+
+def _search_text(value, column: str):
+    """Text a cell contributes to a row's search text (None = skipped)."""
+    if value is None:
+        return None
+    # raw_crustdata is searched as JSON (so nested keys and values both match)
+    if column == 'raw_crustdata' and isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _split_items(value) -> list[str]:
+    """Items of a list column cell (list/tuple or comma-separated string), lowercased."""
+    # Handle None, NaN, empty
+    if value is None:
+        return []
+    try:
+        if pd.isna(value):
+            return []
+    except (ValueError, TypeError):
+        pass  # Handle arrays that can't be checked with isna
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(item).strip().lower() for item in value if item]
+    return [item.strip().lower() for item in str(value).split(',')]
+
+
+class ProfileSearchIndex:
+    """Lazily built search structures over one DataFrame.
+
+    Usage:
+        index = ProfileSearchIndex(enriched_df)
+        mask = index.keyword_mask(['current_title', 'past_positions'], ['backend', 'lead'])
+        df = df[mask.reindex(df.index)]
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._texts = {}
+        self._exploded = {}
+
+    def text(self, columns) -> pd.Series:
+        """Lowercase text per row: the columns' values joined with spaces (cached).
+
+        None cells are skipped; other missing values contribute 'nan', matching
+        what the old per-row join produced.
+        """
+        columns = tuple(c for c in columns if c in self.df.columns)
+        if columns not in self._texts:
+            values = [self.df[c].tolist() for c in columns]
+            texts = []
+            for row in zip(*values) if values else ([] for _ in range(len(self.df))):
+                parts = [_search_text(v, c) for v, c in zip(row, columns)]
+                texts.append(' '.join(p for p in parts if p is not None).lower())
+            self._texts[columns] = pd.Series(texts, index=self.df.index, dtype='str')
+        return self._texts[columns]
+
+    def keyword_mask(self, columns, keywords: list[str], require_all: bool = False,
+                     rows: pd.DataFrame = None) -> pd.Series:
+        """Rows whose search text contains any (or all) of the keywords (substring match).
+
+        Rows with blank text never match. Pass rows (a subset of the indexed frame,
+        e.g. after earlier filters) to get the mask aligned to rows.index.
+        """
+        if rows is not None:
+            if not self.df.index.is_unique:
+                return ProfileSearchIndex(rows).keyword_mask(columns, keywords, require_all)
+            return self.keyword_mask(columns, keywords, require_all).reindex(rows.index)
+        text = self.text(columns)
+        mask = pd.Series(require_all, index=text.index)
+        for kw in keywords:
+            found = text.str.contains(kw, regex=False)
+            mask = (mask & found) if require_all else (mask | found)
+        return mask & (text.str.strip() != '')
+
+    def exploded(self, column: str) -> pd.Series:
+        """One entry per (row, item) of a list column, indexed by row label (cached)."""
+        if column not in self._exploded:
+            labels, items = [], []
+            for label, value in zip(self.df.index, self.df[column].tolist()):
+                for item in _split_items(value):
+                    labels.append(label)
+                    items.append(item)
+            self._exploded[column] = pd.Series(items, index=pd.Index(labels, dtype=self.df.index.dtype), dtype=object)
+        return self._exploded[column]
+
+    def _rows_with(self, exploded: pd.Series, hits, rows: pd.DataFrame) -> pd.Series:
+        index = self.df.index if rows is None else rows.index
+        return pd.Series(index.isin(exploded.index[hits]), index=index)
+
+    def any_item_in(self, column: str, values, rows: pd.DataFrame = None) -> pd.Series:
+        """Rows with at least one item of the list column in values (exact match)."""
+        if rows is not None and not self.df.index.is_unique:
+            return ProfileSearchIndex(rows).any_item_in(column, values)
+        exploded = self.exploded(column)
+        return self._rows_with(exploded, exploded.isin(set(values)).to_numpy(), rows)
+
+    def any_item_matches(self, column: str, predicate, rows: pd.DataFrame = None) -> pd.Series:
+        """Rows with at least one item for which predicate(item) is true.
+
+        The predicate runs once per distinct item across the whole dataset.
+        """
+        if rows is not None and not self.df.index.is_unique:
+            return ProfileSearchIndex(rows).any_item_matches(column, predicate)
+        exploded = self.exploded(column)
+        matching = {item for item in exploded.unique() if predicate(item)}
+        return self._rows_with(exploded, exploded.isin(matching).to_numpy(), rows)
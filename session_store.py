@@ -0,0 +1,271 @@
+"""
+Session Store for LinkedIn Enricher
+Per-user on-disk persistence of Streamlit session data.
+
+Each user gets a directory with one file per session key plus a manifest.json:
+- DataFrames are written as Parquet (columnar, zstd-compressed)
+- Lists are written as Parquet with one JSON-encoded item per row
+- Dicts and plain values are written as compact JSON
+
+Object columns holding lists/dicts (e.g. raw_crustdata, all_employers) are stored as
+JSON strings inside the Parquet file and decoded on load.
+
+Saves are incremental: the manifest records a fingerprint per key and only keys whose
+fingerprint changed are rewritten. Every file (and the manifest) is written to a temp
+file and renamed into place, and data files carry a generation number, so a crash
+mid-save leaves the previous manifest and its files intact.
+"""
+
+import hashlib
+import json
+import math
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 2
+PARQUET_COMPRESSION = 'zstd'
+
+# Fingerprints of nested cells use object identity, which is only meaningful inside
+# one process - prefix them so a restarted server rewrites everything once.
+_PROCESS_TOKEN = f"{os.getpid()}-{int(time.time())}"
+
+
+def _json_default(obj: Any) -> Any:
+    """json.dumps fallback for numpy/pandas scalars and arrays."""
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _dumps(value: Any) -> str:
+    """Compact JSON encoding for session files and JSON-encoded cells.
+
+    NaN is written as a NaN token (json.loads reads it back as float nan), which
+    avoids a recursive clean pass over every nested Crustdata response.
+    """
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=_json_default)
+
+
+def _loads_many(values) -> list:
+    """Decode a sequence of JSON strings (None for nulls) with a single json.loads call."""
+    return json.loads('[' + ','.join(v if isinstance(v, str) else 'null' for v in values) + ']')
+
+
+def fingerprint(value: Any) -> str:
+    """Cheap change-detection fingerprint for a session value.
+
+    - DataFrames: shape, columns, dtypes and a vectorized hash of every column. Cells
+      holding lists/dicts are hashed by identity, so replacing them is detected but
+      mutating a nested dict in place is not.
+    - Lists: length and identity of each item.
+    - Dicts and plain values: hash of their JSON encoding (these are small).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(value, pd.DataFrame):
+        h.update(repr((value.shape, [str(c) for c in value.columns], [str(t) for t in value.dtypes])).encode())
+        for i in range(value.shape[1]):
+            col = value.iloc[:, i]
+            if col.dtype == object:
+                col = col.map(lambda v: id(v) if isinstance(v, (list, dict)) else v)
+            try:
+                h.update(pd.util.hash_pandas_object(col, index=False).values.tobytes())
+            except TypeError:
+                h.update(repr([id(v) for v in col]).encode())
+        return f"{_PROCESS_TOKEN}:{h.hexdigest()}"
+    if isinstance(value, list):
+        h.update(repr((len(value), [id(v) for v in value])).encode())
+        return f"{_PROCESS_TOKEN}:{h.hexdigest()}"
+    h.update(_dumps(value).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _atomic_write(path: Path, write) -> None:
+    """Call write(tmp_path), then rename the temp file over path."""
+    tmp = path.with_name(path.name + '.tmp')
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _json_columns(df: pd.DataFrame) -> list[str]:
+    """Object columns whose values are not all strings (lists, dicts, mixed types)."""
+    cols = []
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        values = df[col].dropna()
+        if not values.map(lambda v: isinstance(v, str)).all():
+            cols.append(col)
+    return cols
+
+
+def _write_dataframe(df: pd.DataFrame, path: Path) -> dict:
+    """Write a DataFrame to Parquet. Returns manifest metadata for the entry."""
+    out = df.reset_index(drop=True)
+    out.columns = [str(c) for c in out.columns]
+    json_cols = _json_columns(out)
+    if json_cols:
+        out = out.copy()
+        for col in json_cols:
+            out[col] = out[col].map(lambda v: None if v is None or (isinstance(v, float) and math.isnan(v)) else _dumps(v))
+    out.to_parquet(path, index=False, compression=PARQUET_COMPRESSION)
+    return {'json_columns': json_cols, 'rows': len(out)}
+
+
+def _read_dataframe(path: Path, entry: dict) -> pd.DataFrame:
+    """Read a DataFrame written by _write_dataframe."""
+    df = pd.read_parquet(path)
+    for col in entry.get('json_columns', []):
+        if col in df.columns:
+            df[col] = pd.Series(_loads_many(df[col]), index=df.index, dtype=object)
+    return df
+
+
+class SessionStore:
+    """Per-user directory of session files with a JSON manifest."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.manifest_path = self.directory / MANIFEST_FILE
+        self.last_written = []
+
+    def exists(self) -> bool:
+        """True if a saved session is present."""
+        return self.manifest_path.exists()
+
+    def save(self, data: dict, force: bool = False, keep: list = None) -> bool:
+        """Save data (key -> value), rewriting only keys that changed since the last save.
+
+        Values that are None are skipped; keys no longer present are dropped unless
+        listed in keep.
+
+        Args:
+            data: Session values to persist
+            force: Rewrite every key even if its fingerprint is unchanged
+            keep: Keys to carry over from the existing manifest untouched (e.g. keys
+                restored lazily that were never read, so there's no value in memory)
+
+        Returns True if the session on disk now matches data.
+        """
+        data = {k: v for k, v in data.items() if v is not None}
+        if not data and not keep:
+            return False
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        manifest = self._read_manifest_safe()
+        previous = manifest.get('keys', {}) if manifest.get('version') == MANIFEST_VERSION else {}
+        generation = manifest.get('generation', 0) + 1
+
+        entries = {key: previous[key] for key in (keep or []) if key in previous and key not in data}
+        if not data and not entries:
+            return False
+        self.last_written = []
+        for key, value in data.items():
+            fp = fingerprint(value)
+            prev = previous.get(key)
+            if (not force and prev and prev.get('fingerprint') == fp
+                    and (self.directory / prev['file']).exists()):
+                entries[key] = prev
+                continue
+            entries[key] = {**self._write_key(key, value, generation), 'fingerprint': fp}
+            self.last_written.append(key)
+
+        if not self.last_written and set(entries) == set(previous):
+            return True
+
+        new_manifest = {'version': MANIFEST_VERSION, 'generation': generation, 'keys': entries}
+        _atomic_write(self.manifest_path, lambda p: p.write_text(json.dumps(new_manifest), encoding='utf-8'))
+        self._remove_orphans(entries)
+        return True
+
+    def load(self) -> dict:
+        """Load every key in the saved session. Returns {} if nothing is saved."""
+        manifest = self.load_manifest()
+        return {key: self._read_key(entry) for key, entry in manifest.get('keys', {}).items()}
+
+    def load_key(self, entry: dict) -> Any:
+        """Load a single key given its manifest entry (see load_manifest)."""
+        return self._read_key(entry)
+
+    def load_manifest(self) -> dict:
+        """Load the manifest only (cheap - no DataFrames are read)."""
+        if not self.manifest_path.exists():
+            return {}
+        return json.loads(self.manifest_path.read_text(encoding='utf-8'))
+
+    def _read_manifest_safe(self) -> dict:
+        try:
+            return self.load_manifest()
+        except (OSError, ValueError) as e:
+            print(f"[Session] Unreadable manifest, rewriting all keys: {e}")
+            return {}
+
+    def clear(self) -> bool:
+        """Delete the saved session directory."""
+        if not self.directory.exists():
+            return False
+        shutil.rmtree(self.directory, ignore_errors=True)
+        return True
+
+    def _write_key(self, key: str, value: Any, generation: int) -> dict:
+        if isinstance(value, pd.DataFrame):
+            filename = f'{key}.{generation}.parquet'
+            try:
+                meta = {}
+                _atomic_write(self.directory / filename, lambda p: meta.update(_write_dataframe(value, p)))
+                return {'type': 'dataframe', 'file': filename, **meta}
+            except Exception as e:
+                # Unusual frames (duplicate column names, exotic dtypes) fall back to JSON records
+                print(f"[Session] Parquet write failed for '{key}', using JSON: {e}")
+                filename = f'{key}.{generation}.json'
+                records = _dumps(value.where(pd.notnull(value), None).to_dict('records'))
+                _atomic_write(self.directory / filename, lambda p: p.write_text(records, encoding='utf-8'))
+                return {'type': 'dataframe_json', 'file': filename, 'rows': len(value)}
+
+        if isinstance(value, list):
+            # Lists (e.g. enriched_results) are one JSON string per item in a compressed Parquet column
+            filename = f'{key}.{generation}.parquet'
+            items = pd.DataFrame({'item': [_dumps(v) for v in value]})
+            _atomic_write(self.directory / filename,
+                          lambda p: items.to_parquet(p, index=False, compression=PARQUET_COMPRESSION))
+            return {'type': 'list', 'file': filename, 'rows': len(value)}
+
+        if isinstance(value, dict):
+            kind = 'dict'
+        else:
+            kind = 'value'
+        filename = f'{key}.{generation}.json'
+        encoded = _dumps(value)
+        _atomic_write(self.directory / filename, lambda p: p.write_text(encoded, encoding='utf-8'))
+        return {'type': kind, 'file': filename}
+
+    def _read_key(self, entry: dict) -> Any:
+        path = self.directory / entry['file']
+        if entry['type'] == 'dataframe':
+            return _read_dataframe(path, entry)
+        if entry['type'] == 'list':
+            return _loads_many(pd.read_parquet(path)['item'])
+        data = json.loads(path.read_text(encoding='utf-8'))
+        if entry['type'] == 'dataframe_json':
+            return pd.DataFrame(data)
+        return data
+
+    def _remove_orphans(self, entries: dict):
+        """Delete files no longer referenced by the manifest (old generations, leftover temp files)."""
+        referenced = {e['file'] for e in entries.values()} | {MANIFEST_FILE}
+        for path in self.directory.iterdir():
+            if path.is_file() and path.name not in referenced:
+                path.unlink(missing_ok=True)
@@ -115,3 +115,53 @@ CREATE TABLE IF NOT EXISTS api_usage_logs (
 
 CREATE INDEX idx_usage_logs_provider ON api_usage_logs(provider);
 CREATE INDEX idx_usage_logs_created_at ON api_usage_logs(created_at);
+
+-- Usage aggregates (grouped server-side so the Usage tab never downloads raw logs)
+CREATE OR REPLACE FUNCTION usage_summary_by_provider(since TIMESTAMPTZ DEFAULT NULL)
+RETURNS TABLE (
+  provider TEXT,
+  requests BIGINT,
+  errors BIGINT,
+  runs BIGINT,
+  credits_used NUMERIC,
+  cost_usd NUMERIC,
+  tokens_input BIGINT,
+  tokens_output BIGINT,
+  profiles_scraped BIGINT
+)
+LANGUAGE sql STABLE AS $$
+  SELECT
+    lower(l.provider) AS provider,
+    SUM(COALESCE(NULLIF(l.request_count, 0), 1))::BIGINT AS requests,
+    COUNT(*) FILTER (WHERE l.status = 'error') AS errors,
+    COUNT(*) AS runs,
+    COALESCE(SUM(l.credits_used), 0) AS credits_used,
+    COALESCE(SUM(l.cost_usd), 0) AS cost_usd,
+    COALESCE(SUM(l.tokens_input), 0)::BIGINT AS tokens_input,
+    COALESCE(SUM(l.tokens_output), 0)::BIGINT AS tokens_output,
+    COALESCE(SUM((l.metadata->>'profiles_scraped')::BIGINT), 0)::BIGINT AS profiles_scraped
+  FROM api_usage_logs l
+  WHERE since IS NULL OR l.created_at >= since
+  GROUP BY lower(l.provider);
+$$;
+
+CREATE OR REPLACE FUNCTION usage_by_day(since TIMESTAMPTZ)
+RETURNS TABLE (
+  day DATE,
+  provider TEXT,
+  runs BIGINT,
+  credits_used NUMERIC,
+  cost_usd NUMERIC
+)
+LANGUAGE sql STABLE AS $$
+  SELECT
+    (l.created_at AT TIME ZONE 'UTC')::DATE AS day,
+    lower(l.provider) AS provider,
+    COUNT(*) AS runs,
+    COALESCE(SUM(l.credits_used), 0) AS credits_used,
+    COALESCE(SUM(l.cost_usd), 0) AS cost_usd
+  FROM api_usage_logs l
+  WHERE l.created_at >= since
+  GROUP BY 1, 2
+  ORDER BY 1;
+$$;
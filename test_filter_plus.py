@@ -0,0 +1,48 @@
+"""Filter+ tab renders its review section after filters remove rows. Run: python test_filter_plus.py"""
+import shutil
+from pathlib import Path
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+DASHBOARD = str(Path(__file__).parent / 'dashboard.py')
+TEST_USER = '_test_filter_plus'
+
+
+def _enriched_df():
+    return pd.DataFrame([
+        {'first_name': 'Dana', 'last_name': 'Levi', 'current_title': 'Backend Engineer',
+         'current_company': 'Wix', 'past_positions': 'Backend Engineer at Wix', 'skills': 'python, go',
+         'linkedin_url': 'https://www.linkedin.com/in/dana-levi'},
+        {'first_name': 'Noa', 'last_name': 'Cohen', 'current_title': 'Software Intern',
+         'current_company': 'Monday.com', 'past_positions': 'Intern at Monday.com', 'skills': 'java',
+         'linkedin_url': 'https://www.linkedin.com/in/noa-cohen'},
+        {'first_name': 'Omer', 'last_name': 'Katz', 'current_title': 'Frontend Developer',
+         'current_company': 'Fiverr', 'past_positions': 'Frontend Developer at Fiverr', 'skills': 'react',
+         'linkedin_url': 'https://www.linkedin.com/in/omer-katz'},
+    ])
+
+
+def test_filter_plus_review_after_exclusion():
+    at = AppTest.from_file(DASHBOARD, default_timeout=120)
+    at.session_state['username'] = TEST_USER
+    at.session_state['enriched_df'] = _enriched_df()
+    try:
+        at.run()
+        at.text_input(key='f2_exclude_kw').input('intern')
+        at.button(key='apply_filters_enriched').click()
+        at.run()
+
+        assert not at.exception, [e.value for e in at.exception]
+        assert len(at.session_state['passed_candidates_df']) == 2
+        assert at.session_state['f2_filter_stats']['removed_by'] == {'Excluded Title Keywords': 1}
+        review = at.selectbox(key='f2_review_filter')
+        assert review.options == ['Excluded Title Keywords']
+        assert any('1** profiles removed by: Excluded Title Keywords' in w.value for w in at.warning)
+    finally:
+        shutil.rmtree(Path(__file__).parent / '.sessions' / TEST_USER, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    test_filter_plus_review_after_exclusion()
+    print("PASSED")